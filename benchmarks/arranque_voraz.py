@@ -0,0 +1,47 @@
+"""Compara CBC con y sin arranque en caliente desde la solución voraz.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.arranque_voraz --pacientes 30 50
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.resolutores import construir_instancias
+from optimizacion.horarios import generar_horarios
+from optimizacion.resolutores import resolver
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pacientes", type=int, nargs="+", default=[30, 50])
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    horarios = generar_horarios(8, 16, 15)
+
+    print(f"{'pacientes':>9} {'modelo':>13} {'voraz':>9} {'voraz (s)':>9} {'sin arranque (s)':>16} {'con arranque (s)':>16} {'optimo':>9}")
+    for num_pacientes in args.pacientes:
+        for nombre, construir in construir_instancias(num_pacientes, horarios, args.semilla).items():
+            modelo = construir()
+
+            inicio = time.perf_counter()
+            voraz = modelo.solucion_voraz()
+            t_voraz = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            sin_arranque = resolver(modelo, "cbc", arranque_voraz=False)
+            t_sin_arranque = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            con_arranque = resolver(modelo, "cbc", arranque_voraz=True)
+            t_con_arranque = time.perf_counter() - inicio
+
+            assert abs(sin_arranque["objetivo"] - con_arranque["objetivo"]) < 1e-6
+            print(f"{num_pacientes:>9} {nombre:>13} {float(np.dot(modelo.objetivo, voraz)):>9.2f} {t_voraz:>9.3f} "
+                  f"{t_sin_arranque:>16.3f} {t_con_arranque:>16.3f} {con_arranque['objetivo']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Tiempo de armado y serialización del diagrama de Gantt según la cantidad de turnos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.gantt --turnos 50 200 1000 2000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+import plotly.express as px
+import plotly.figure_factory as ff
+
+from interfaz.gantt import COLORES_PRIORIDAD, figura_gantt_rapida
+from optimizacion.horarios import formatear_minutos
+
+
+def generar_turnos(num_turnos, num_lugares, semilla):
+    """Turnos de 30 minutos entre las 08:00 y las 16:00, con el formato de df_gantt"""
+    rng = random.Random(semilla)
+    inicios = [rng.randrange(480, 930, 15) for _ in range(num_turnos)]
+    df = pd.DataFrame({
+        "Resource": [f"Lugar {rng.randrange(num_lugares) + 1}" for _ in range(num_turnos)],
+        "Nombre_Paciente": [f"Paciente {i+1}" for i in range(num_turnos)],
+        "Prioridad": [rng.choice(list(COLORES_PRIORIDAD)) for _ in range(num_turnos)],
+        "Hora_Inicio": [formatear_minutos(m) for m in inicios],
+        "Hora_Fin": [formatear_minutos(m + 30) for m in inicios],
+    })
+    df["Task"] = df["Nombre_Paciente"] + " (P: " + df["Prioridad"] + ")"
+    df["Start"] = pd.to_datetime("2024-01-01 " + df["Hora_Inicio"])
+    df["Finish"] = pd.to_datetime("2024-01-01 " + df["Hora_Fin"])
+    return df
+
+def medir(armar):
+    """Segundos de armado de la figura y de su serialización a JSON (lo que envía st.plotly_chart)"""
+    inicio = time.perf_counter()
+    fig = armar()
+    armado = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    fig.to_json()
+    return armado, time.perf_counter() - inicio, len(fig.data)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turnos", type=int, nargs="+", default=[50, 200, 1000, 2000])
+    parser.add_argument("--lugares", type=int, default=30)
+    parser.add_argument("--max-create-gantt", type=int, default=1000,
+                        help="no medir ff.create_gantt con más turnos que este valor")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    variantes = {
+        # Color por turno, como intentaban las páginas antes de este cambio: una traza por turno
+        "create_gantt": lambda df: ff.create_gantt(df, colors={t: COLORES_PRIORIDAD[p] for t, p in zip(df["Task"], df["Prioridad"])},
+                                                   index_col="Task", group_tasks=True),
+        "timeline": lambda df: px.timeline(df, x_start="Start", x_end="Finish", y="Resource", color="Prioridad",
+                                           color_discrete_map=COLORES_PRIORIDAD),
+        "una_traza": figura_gantt_rapida,
+    }
+
+    print(f"{'turnos':>7} {'variante':>12} {'trazas':>7} {'armado (s)':>10} {'json (s)':>9}")
+    for num_turnos in args.turnos:
+        df = generar_turnos(num_turnos, args.lugares, args.semilla)
+        for nombre, armar in variantes.items():
+            if nombre == "create_gantt" and num_turnos > args.max_create_gantt:
+                continue
+            armado, serializacion, trazas = medir(lambda: armar(df))
+            print(f"{num_turnos:>7} {nombre:>12} {trazas:>7} {armado:>10.3f} {serializacion:>9.3f}")
+
+if __name__ == "__main__":
+    main()
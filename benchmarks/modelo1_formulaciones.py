@@ -0,0 +1,84 @@
+"""Compara las formulaciones del modelo 1 y la ruta rápida por ordenamiento.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.modelo1_formulaciones --pacientes 10 20 30
+"""
+import argparse
+import random
+import time
+
+from optimizacion.catalogos import servicios_predefinidos
+from optimizacion.horarios import generar_horarios
+from optimizacion.modelo1 import FORMULACIONES, construir_modelo, optimizar_por_orden
+from optimizacion.pacientes import VALORES_PRIORIDAD
+from optimizacion.resolutores import resolver
+
+
+def generar_pacientes(num_pacientes, servicios, semilla):
+    """Genera pacientes aleatorios que requieren alguno de los servicios dados"""
+    rng = random.Random(semilla)
+    nombres_servicios = sorted(set(s["nombre"] for s in servicios))
+    return [{
+        "nombre": f"Paciente {i+1}",
+        "servicio_requerido": rng.choice(nombres_servicios),
+        "prioridad": rng.choice(["Alta", "Media", "Baja"]),
+        "distancia": rng.randint(0, 100)
+    } for i in range(num_pacientes)]
+
+def medir(servicios, pacientes, horarios, formulacion, resolutor="cbc"):
+    """Mide tiempos de construcción y resolución de una formulación"""
+    inicio = time.perf_counter()
+    modelo = construir_modelo(servicios, pacientes, horarios, formulacion)
+    t_construccion = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    solucion = resolver(modelo, resolutor)
+    t_resolucion = time.perf_counter() - inicio
+
+    return {
+        "filas": modelo.num_filas,
+        "construccion": t_construccion,
+        "resolucion": t_resolucion,
+        "estado": solucion["estado"],
+        "objetivo": solucion["objetivo"],
+    }
+
+def medir_ruta_rapida(servicios, pacientes, horarios):
+    """Mide el tiempo de la ruta rápida por ordenamiento"""
+    inicio = time.perf_counter()
+    resultado = optimizar_por_orden(servicios, pacientes, horarios)
+    t_resolucion = time.perf_counter() - inicio
+
+    objetivo = sum(VALORES_PRIORIDAD[fila["Prioridad"]] - 0.01 * fila["Distancia"] for _, fila in resultado.iterrows())
+    return {
+        "filas": 0,
+        "construccion": 0.0,
+        "resolucion": t_resolucion,
+        "estado": "Optimal",
+        "objetivo": objetivo,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pacientes", type=int, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--paso", type=int, default=15, help="paso de la grilla en minutos")
+    args = parser.parse_args()
+
+    servicios = servicios_predefinidos
+    horarios = generar_horarios(8, 16, args.paso)
+
+    print(f"{'pacientes':>9} {'formulacion':>11} {'filas':>9} {'construir (s)':>13} {'resolver (s)':>12} {'objetivo':>9}")
+    for num_pacientes in args.pacientes:
+        pacientes = generar_pacientes(num_pacientes, servicios, args.semilla)
+        for formulacion in FORMULACIONES:
+            r = medir(servicios, pacientes, horarios, formulacion)
+            print(f"{num_pacientes:>9} {formulacion:>11} {r['filas']:>9} {r['construccion']:>13.3f} "
+                  f"{r['resolucion']:>12.3f} {r['objetivo']:>9.2f}  {r['estado']}")
+        r = medir_ruta_rapida(servicios, pacientes, horarios)
+        print(f"{num_pacientes:>9} {'orden':>11} {r['filas']:>9} {r['construccion']:>13.3f} "
+              f"{r['resolucion']:>12.3f} {r['objetivo']:>9.2f}  {r['estado']}")
+
+
+if __name__ == "__main__":
+    main()
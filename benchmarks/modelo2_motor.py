@@ -0,0 +1,67 @@
+"""Compara los motores de la página 2: tiempo y peso de los pacientes asignados.
+
+La equivalencia del motor por huecos libres con la búsqueda original minuto a minuto se
+comprueba en tests/test_modelo2.py.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.modelo2_motor --pacientes 100 1000 3000 --especialistas 200 --consultorios 100
+"""
+import argparse
+import random
+import time
+
+from optimizacion.modelo2 import asignar_turnos, crear_consultorios
+
+
+def generar_instancia(num_especialistas, num_pacientes, num_especialidades, semilla):
+    """Genera especialistas con jornadas parciales y pacientes aleatorios"""
+    rng = random.Random(semilla)
+    especialidades = [f"Especialidad {i+1}" for i in range(num_especialidades)]
+    especialistas = []
+    for _ in range(num_especialistas):
+        inicio = rng.randrange(0, 240, 15)
+        especialistas.append({
+            'especialidad': rng.choice(especialidades),
+            'disponibilidad': [(inicio, rng.randrange(inicio + 60, 481, 15))],
+            'ocupado': [],
+            'duracion': rng.choice([15, 30, 45, 60]),
+        })
+    pacientes = [{
+        'prioridad': rng.randint(1, 3),
+        'distancia': rng.randint(0, 100),
+        'especialidad': rng.choice(especialidades),
+        'datos': f"Paciente {i+1}",
+    } for i in range(num_pacientes)]
+    return especialistas, pacientes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pacientes", type=int, nargs="+", default=[100, 1000, 3000, 10000])
+    parser.add_argument("--especialistas", type=int, default=200)
+    parser.add_argument("--especialidades", type=int, default=20)
+    parser.add_argument("--consultorios", type=int, default=100)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'pacientes':>9} {'asignados':>9} {'peso':>6} {'huecos (s)':>10}  "
+          f"{'asignados':>9} {'peso':>6} {'arrepentimiento (s)':>19}")
+    for num_pacientes in args.pacientes:
+        especialistas, pacientes = generar_instancia(args.especialistas, num_pacientes, args.especialidades, args.semilla)
+
+        consultorios = crear_consultorios(args.consultorios)
+
+        inicio = time.perf_counter()
+        asignaciones, _ = asignar_turnos(especialistas, pacientes, consultorios)
+        t_huecos = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        por_arrepentimiento, _ = asignar_turnos(especialistas, pacientes, consultorios, motor="arrepentimiento")
+        t_arrepentimiento = time.perf_counter() - inicio
+
+        # El peso suma las prioridades (3, 2, 1) de los pacientes con turno
+        print(f"{num_pacientes:>9} {len(asignaciones):>9} {sum(a['paciente']['prioridad'] for a in asignaciones):>6} "
+              f"{t_huecos:>10.3f}  {len(por_arrepentimiento):>9} "
+              f"{sum(a['paciente']['prioridad'] for a in por_arrepentimiento):>6} {t_arrepentimiento:>19.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compara las formulaciones del modelo 3.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.modelo3_formulaciones --pacientes 5 10 --consultorios 2
+"""
+import argparse
+import random
+import time
+
+from optimizacion.horarios import generar_horarios
+from optimizacion.modelo3 import FORMULACIONES, construir_modelo
+from optimizacion.resolutores import resolver
+
+
+def generar_instancia(num_especialistas, num_pacientes, horarios, semilla):
+    """Genera especialistas y pacientes aleatorios para el modelo 3"""
+    rng = random.Random(semilla)
+    especialistas = []
+    for e in range(num_especialistas):
+        # Bloque continuo de horas disponibles, como en la selección por checkboxes de la página
+        desde = rng.randint(8, 12)
+        hasta = rng.randint(desde + 1, 16)
+        especialistas.append({
+            "especialidad": f"Especialidad {e+1}",
+            "tiempo_atencion": rng.choice([15, 30, 45]),
+            "horarios_disponibles": [h for h in horarios if desde <= int(h[:2]) < hasta]
+        })
+    pacientes = [{
+        "nombre": f"Paciente {i+1}",
+        "prioridad": rng.choice(["Alta", "Media", "Baja"]),
+        "distancia": rng.randint(0, 100)
+    } for i in range(num_pacientes)]
+    return especialistas, pacientes
+
+def medir(especialistas, pacientes, consultorios, horarios, formulacion, resolutor="cbc"):
+    """Mide tiempos de construcción y resolución de una formulación"""
+    inicio = time.perf_counter()
+    modelo = construir_modelo(especialistas, pacientes, consultorios, horarios, formulacion)
+    t_construccion = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    solucion = resolver(modelo, resolutor)
+    t_resolucion = time.perf_counter() - inicio
+
+    return {
+        "filas": modelo.num_filas,
+        "construccion": t_construccion,
+        "resolucion": t_resolucion,
+        "estado": solucion["estado"],
+        "objetivo": solucion["objetivo"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pacientes", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--especialistas", type=int, default=3)
+    parser.add_argument("--consultorios", type=int, default=2)
+    parser.add_argument("--formulaciones", nargs="+", default=list(FORMULACIONES), choices=FORMULACIONES)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--paso", type=int, default=15, help="paso de la grilla en minutos")
+    args = parser.parse_args()
+
+    horarios = generar_horarios(8, 16, args.paso)
+
+    print(f"{'pacientes':>9} {'formulacion':>11} {'filas':>9} {'construir (s)':>13} {'resolver (s)':>12} {'objetivo':>9}")
+    for num_pacientes in args.pacientes:
+        especialistas, pacientes = generar_instancia(args.especialistas, num_pacientes, horarios, args.semilla)
+        for formulacion in args.formulaciones:
+            r = medir(especialistas, pacientes, args.consultorios, horarios, formulacion)
+            print(f"{num_pacientes:>9} {formulacion:>11} {r['filas']:>9} {r['construccion']:>13.3f} "
+                  f"{r['resolucion']:>12.3f} {r['objetivo']:>9.2f}  {r['estado']}")
+
+
+if __name__ == "__main__":
+    main()
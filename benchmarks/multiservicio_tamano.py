@@ -0,0 +1,64 @@
+"""Tamaño del modelo multiservicio (páginas 4 y 5) con cada formulación.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.multiservicio_tamano --pacientes 50 --max-servicios 5
+"""
+import argparse
+import random
+import time
+
+from optimizacion.catalogos import servicios_igehm
+from optimizacion.horarios import generar_horarios
+from optimizacion.multiservicio import FORMULACIONES, construir_modelo
+from optimizacion.rendimiento import tamano_modelo
+from optimizacion.resolutores import RESOLUTORES, resolver
+
+
+def generar_pacientes(num_pacientes, servicios, max_servicios, semilla):
+    """Genera pacientes aleatorios que requieren entre 1 y max_servicios servicios"""
+    rng = random.Random(semilla)
+    nombres_servicios = sorted(set(s["nombre"] for s in servicios))
+    return [{
+        "id": i,
+        "nombre": f"Paciente {i+1}",
+        "servicios_requeridos": rng.sample(nombres_servicios, rng.randint(1, max_servicios)),
+        "prioridad": rng.choice(["Alta", "Media", "Baja"]),
+        "distancia": rng.randint(0, 100)
+    } for i in range(num_pacientes)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pacientes", type=int, default=50)
+    parser.add_argument("--max-servicios", type=int, default=5)
+    parser.add_argument("--formulaciones", nargs="+", default=list(FORMULACIONES), choices=FORMULACIONES)
+    parser.add_argument("--resolver", action="store_true", help="también resolver cada modelo")
+    parser.add_argument("--resolutor", default="cbc", choices=list(RESOLUTORES))
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--paso", type=int, default=15, help="paso de la grilla en minutos")
+    args = parser.parse_args()
+
+    servicios = servicios_igehm
+    horarios = generar_horarios(8, 16, args.paso)
+    pacientes = generar_pacientes(args.pacientes, servicios, args.max_servicios, args.semilla)
+
+    print(f"{len(servicios)} servicios, {len(pacientes)} pacientes, "
+          f"{sum(len(p['servicios_requeridos']) for p in pacientes)} servicios requeridos")
+    print(f"{'formulacion':>11} {'filas':>9} {'columnas':>9} {'no_ceros':>10} {'construir (s)':>13} {'resolver (s)':>12}")
+    for formulacion in args.formulaciones:
+        inicio = time.perf_counter()
+        modelo = construir_modelo(servicios, pacientes, horarios, formulacion)
+        t_construccion = time.perf_counter() - inicio
+        tamano = tamano_modelo(modelo)
+
+        resolucion = ""
+        if args.resolver:
+            inicio = time.perf_counter()
+            solucion = resolver(modelo, args.resolutor)
+            resolucion = f"{time.perf_counter() - inicio:>12.3f}  {solucion['estado']} {solucion['objetivo']:.2f}"
+
+        print(f"{formulacion:>11} {tamano['filas']:>9} {tamano['columnas']:>9} {tamano['no_ceros']:>10} "
+              f"{t_construccion:>13.3f} {resolucion}")
+
+
+if __name__ == "__main__":
+    main()
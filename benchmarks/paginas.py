@@ -0,0 +1,57 @@
+"""Tiempo de carga de cada página de la aplicación, en frío (proceso nuevo) y en caliente (reruns).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.paginas --reruns 5
+    python -m benchmarks.paginas --paginas views/modelo1.py views/kpi.py
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# Páginas registradas en main.py
+PAGINAS = ["views/nosotros.py", "views/modelo1.py", "views/modelo2.py", "views/modelo3.py",
+           "views/modelo4.py", "views/modelo5.py", "views/kpi.py"]
+
+# Se ejecuta en un intérprete nuevo por página: la primera ejecución paga las importaciones de la
+# página (carga en frío) y las siguientes las encuentran en sys.modules, como un rerun de Streamlit
+_MEDICION = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+pagina, reruns = sys.argv[1], int(sys.argv[2])
+modulos = len(sys.modules)
+at = AppTest.from_file(pagina, default_timeout=120)
+inicio = time.perf_counter()
+at.run()
+frio = time.perf_counter() - inicio
+calientes = []
+for _ in range(reruns):
+    inicio = time.perf_counter()
+    at.run()
+    calientes.append(time.perf_counter() - inicio)
+print(json.dumps({"frio": frio, "caliente": min(calientes), "modulos": len(sys.modules) - modulos,
+                  "excepciones": len(at.exception)}))
+"""
+
+
+def medir_pagina(pagina, reruns):
+    """Segundos de la primera ejecución y del mejor rerun de la página, y módulos que importó"""
+    salida = subprocess.run([sys.executable, "-c", _MEDICION, pagina, str(reruns)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paginas", nargs="+", default=PAGINAS)
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'página':<20} {'frío (s)':>9} {'caliente (s)':>13} {'módulos':>8}")
+    for pagina in args.paginas:
+        medicion = medir_pagina(pagina, args.reruns)
+        aviso = f"  ({medicion['excepciones']} excepciones)" if medicion["excepciones"] else ""
+        print(f"{pagina:<20} {medicion['frio']:>9.3f} {medicion['caliente']:>13.3f} {medicion['modulos']:>8}{aviso}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compara los resolutores CBC (PuLP) y HiGHS (SciPy) sobre los modelos 1, 3 y multiservicio.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.resolutores --pacientes 10 30 50
+"""
+import argparse
+import time
+
+from benchmarks.modelo1_formulaciones import generar_pacientes as generar_pacientes_modelo1
+from benchmarks.modelo3_formulaciones import generar_instancia as generar_instancia_modelo3
+from benchmarks.multiservicio_tamano import generar_pacientes as generar_pacientes_multiservicio
+from optimizacion import modelo1, modelo3, multiservicio
+from optimizacion.catalogos import servicios_igehm, servicios_predefinidos
+from optimizacion.horarios import generar_horarios
+from optimizacion.resolutores import RESOLUTORES, resolver
+
+
+def construir_instancias(num_pacientes, horarios, semilla):
+    """Construye un ModeloLineal de cada página para la misma cantidad de pacientes"""
+    pacientes1 = generar_pacientes_modelo1(num_pacientes, servicios_predefinidos, semilla)
+    especialistas3, pacientes3 = generar_instancia_modelo3(3, num_pacientes, horarios, semilla)
+    pacientes4 = generar_pacientes_multiservicio(num_pacientes, servicios_igehm, 3, semilla)
+    return {
+        "modelo1": lambda: modelo1.construir_modelo(servicios_predefinidos, pacientes1, horarios),
+        "modelo3": lambda: modelo3.construir_modelo(especialistas3, pacientes3, 2, horarios),
+        "multiservicio": lambda: multiservicio.construir_modelo(servicios_igehm, pacientes4, horarios),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pacientes", type=int, nargs="+", default=[10, 30, 50])
+    parser.add_argument("--resolutores", nargs="+", default=list(RESOLUTORES), choices=list(RESOLUTORES))
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    horarios = generar_horarios(8, 16, 15)
+
+    print(f"{'pacientes':>9} {'modelo':>13} {'resolutor':>9} {'construir (s)':>13} {'resolver (s)':>12} {'objetivo':>9}")
+    for num_pacientes in args.pacientes:
+        for nombre, construir in construir_instancias(num_pacientes, horarios, args.semilla).items():
+            inicio = time.perf_counter()
+            modelo = construir()
+            t_construccion = time.perf_counter() - inicio
+
+            for resolutor in args.resolutores:
+                inicio = time.perf_counter()
+                solucion = resolver(modelo, resolutor)
+                t_resolucion = time.perf_counter() - inicio
+                print(f"{num_pacientes:>9} {nombre:>13} {resolutor:>9} {t_construccion:>13.3f} "
+                      f"{t_resolucion:>12.3f} {solucion['objetivo']:>9.2f}  {solucion['estado']}")
+
+
+if __name__ == "__main__":
+    main()
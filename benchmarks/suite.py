@@ -0,0 +1,179 @@
+"""Suite de rendimiento de todos los modelos sobre instancias sintéticas de distintos tamaños.
+
+Mide, para cada modelo y cantidad de pacientes, la construcción del modelo, la resolución (y sus
+subfases), la extracción de la programación y el armado del diagrama de Gantt, junto con el tamaño del
+modelo, y agrega una línea JSON por corrida al archivo de salida junto con el commit, para comparar versiones.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.suite
+    python -m benchmarks.suite --modelos modelo1 modelo4 --pacientes 10 100 --resolutor highs
+    python -m benchmarks.suite --salida /tmp/suite.jsonl --limite-tiempo 30
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+
+# figura_gantt importa plotly.figure_factory recién al dibujar el primer diagrama chico; se importa aquí
+# para que esa carga única no se mida como tiempo de dibujo
+import plotly.figure_factory  # noqa: F401
+
+from interfaz.gantt import figura_gantt
+from optimizacion import modelo1, modelo2, modelo3, multiservicio
+from optimizacion.catalogos import servicios_igehm, servicios_predefinidos
+from optimizacion.horarios import PASOS_GRILLA, generar_horarios, horarios_de_servicios
+from optimizacion.instancias import DISTRIBUCIONES_DISTANCIA, especialistas_modelo3, generar_pacientes, instancia_modelo2
+from optimizacion.resolutores import NOMBRES_RESOLUTORES
+
+MODELOS = ("modelo1", "modelo2", "modelo3", "modelo4", "modelo5")
+
+# Servicios de cada página; el modelo 3 toma sus especialistas del catálogo de la página 1
+CATALOGOS = {"modelo1": servicios_predefinidos, "modelo2": servicios_predefinidos, "modelo3": servicios_predefinidos,
+             "modelo4": servicios_predefinidos, "modelo5": servicios_igehm}
+
+SALIDA = os.path.join("benchmarks", "resultados", "suite.jsonl")
+
+
+def _ejecutar_modelo1(pacientes, args):
+    servicios = CATALOGOS["modelo1"]
+    resultado = modelo1.optimizar_turnos(servicios, pacientes, horarios_de_servicios(servicios, args.paso), **_opciones(args))
+    return resultado, lambda: resultado["Lugar_Atencion"] + " - " + resultado["Servicio"]
+
+def _ejecutar_modelo2(pacientes, args):
+    especialistas, pacientes_modelo2 = instancia_modelo2(CATALOGOS["modelo2"], pacientes)
+    tiempos = {}
+    inicio = time.perf_counter()
+    asignaciones, _ = modelo2.asignar_turnos(especialistas, pacientes_modelo2, modelo2.crear_consultorios(args.consultorios),
+                                             motor=args.motor)
+    tiempos["asignacion"] = time.perf_counter() - inicio
+    # La página 2 no dibuja un diagrama de Gantt
+    return {"turnos": len(asignaciones), "tiempos": tiempos}, None
+
+def _ejecutar_modelo3(pacientes, args):
+    horarios = generar_horarios(8, 16, args.paso)
+    especialistas = especialistas_modelo3(CATALOGOS["modelo3"], horarios)
+    resultado = modelo3.optimizar_turnos(especialistas, pacientes, args.consultorios, horarios, **_opciones(args), **_limites(args))
+    return resultado, lambda: "Consultorio " + resultado["Consultorio"].astype(str) + " - " + resultado["Especialidad"]
+
+def _ejecutar_multiservicio(servicios):
+    def ejecutar(pacientes, args):
+        resultado = multiservicio.optimizar_turnos(servicios, pacientes, horarios_de_servicios(servicios, args.paso),
+                                                   **_opciones(args), **_limites(args))
+        return resultado, lambda: resultado["Lugar_Atencion"] + " - " + resultado["Servicio"]
+    return ejecutar
+
+EJECUTORES = {
+    "modelo1": _ejecutar_modelo1,
+    "modelo2": _ejecutar_modelo2,
+    "modelo3": _ejecutar_modelo3,
+    "modelo4": _ejecutar_multiservicio(CATALOGOS["modelo4"]),
+    "modelo5": _ejecutar_multiservicio(CATALOGOS["modelo5"]),
+}
+
+
+def _opciones(args):
+    return {"resolutor": args.resolutor, "limite_tiempo": args.limite_tiempo}
+
+def _limites(args):
+    """Con --sin-limites los modelos 3, 4 y 5 construyen siempre el modelo pedido, sin estimar su tamaño"""
+    return {"limites": None} if args.sin_limites else {}
+
+def version_codigo():
+    """Commit del árbol medido (con -dirty si tiene cambios sin confirmar), o None fuera de git"""
+    try:
+        salida = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return salida.stdout.strip()
+
+def medir(modelo, pacientes, args):
+    """Corre un modelo sobre los pacientes y devuelve el registro de la corrida"""
+    registro = {"modelo": modelo, "pacientes": len(pacientes)}
+    inicio = time.perf_counter()
+    try:
+        resultado, recurso = EJECUTORES[modelo](pacientes, args)
+    except Exception as e:
+        registro.update(estado="error", error=f"{type(e).__name__}: {e}")
+        return registro
+    total = time.perf_counter() - inicio
+
+    if isinstance(resultado, dict):
+        registro.update(estado="heuristica", turnos=resultado["turnos"], tiempos=resultado["tiempos"])
+    elif resultado is None:
+        registro.update(estado="sin_solucion", turnos=0, tiempos={})
+    else:
+        solucion = resultado.attrs.get("solucion", {})
+        registro.update(estado=solucion.get("estado"), objetivo=solucion.get("objetivo"), gap=solucion.get("gap"),
+                        turnos=len(resultado), tiempos=dict(resultado.attrs.get("tiempos", {})),
+                        tiempos_resolucion=resultado.attrs.get("tiempos_resolucion"), tamano=resultado.attrs.get("tamano"),
+                        estimacion=resultado.attrs.get("estimacion"))
+        if recurso is not None and not resultado.empty:
+            # Armado del diagrama y serialización a JSON, que es lo que envía st.plotly_chart
+            inicio = time.perf_counter()
+            fig, _ = figura_gantt(resultado, recurso())
+            fig.to_json()
+            registro["tiempos"]["gantt"] = time.perf_counter() - inicio
+    registro["tiempos"]["optimizacion"] = total
+    return registro
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modelos", nargs="+", default=list(MODELOS), choices=MODELOS)
+    parser.add_argument("--pacientes", type=int, nargs="+", default=[10, 50, 200, 500, 1000, 2000])
+    parser.add_argument("--resolutor", default="cbc", choices=list(NOMBRES_RESOLUTORES))
+    parser.add_argument("--limite-tiempo", type=float, default=60, help="segundos por resolución")
+    parser.add_argument("--paso", type=int, default=15, choices=PASOS_GRILLA, help="paso de la grilla en minutos")
+    parser.add_argument("--consultorios", type=int, default=2, help="consultorios de los modelos 2 y 3")
+    parser.add_argument("--motor", default="primer_turno", choices=list(modelo2.NOMBRES_MOTORES), help="heurística del modelo 2")
+    parser.add_argument("--max-servicios", type=int, default=3, help="servicios por paciente en los modelos 4 y 5")
+    parser.add_argument("--distancia", default="lognormal", choices=list(DISTRIBUCIONES_DISTANCIA))
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--sin-limites", action="store_true", help="resolver siempre el modelo lineal, sin la heurística")
+    parser.add_argument("--salida", default=SALIDA, help="archivo JSON Lines al que se agregan los resultados")
+    args = parser.parse_args()
+
+    # Datos comunes a todas las corridas, para comparar commits y máquinas
+    contexto = {
+        "commit": version_codigo(),
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resolutor": args.resolutor,
+        "limite_tiempo": args.limite_tiempo,
+        "paso": args.paso,
+        "semilla": args.semilla,
+        "sin_limites": args.sin_limites,
+    }
+
+    os.makedirs(os.path.dirname(args.salida) or ".", exist_ok=True)
+    print("Tiempos en segundos")
+    print(f"{'pacientes':>9} {'modelo':>8} {'estado':>12} {'turnos':>7} {'construir':>10} {'resolver':>9} "
+          f"{'extraer':>8} {'gantt':>7} {'optimizar':>10}")
+    with open(args.salida, "a", encoding="utf-8") as salida:
+        for num_pacientes in args.pacientes:
+            for modelo in args.modelos:
+                # Los modelos 1, 2 y 3 usan un servicio por paciente; los modelos 4 y 5, varios
+                servicios_por_paciente = (1, args.max_servicios) if modelo in ("modelo4", "modelo5") else (1, 1)
+                pacientes = generar_pacientes(num_pacientes, CATALOGOS[modelo], args.semilla,
+                                              distribucion_distancia=args.distancia,
+                                              servicios_por_paciente=servicios_por_paciente)
+                registro = {**contexto, **medir(modelo, pacientes, args)}
+                salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                salida.flush()
+
+                tiempos = registro.get("tiempos", {})
+                columnas = [tiempos.get("construccion", tiempos.get("ordenamiento")),
+                            tiempos.get("resolucion", tiempos.get("asignacion", tiempos.get("heuristica"))),
+                            tiempos.get("extraccion"), tiempos.get("gantt"), tiempos.get("optimizacion")]
+                celdas = [f"{t:.3f}" if t is not None else "-" for t in columnas]
+                print(f"{num_pacientes:>9} {modelo:>8} {registro['estado']:>12} {registro.get('turnos', '-'):>7} "
+                      f"{celdas[0]:>10} {celdas[1]:>9} {celdas[2]:>8} {celdas[3]:>7} {celdas[4]:>10}"
+                      + (f"  {registro['error']}" if "error" in registro else ""))
+
+    print(f"Resultados agregados a {args.salida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Componentes de Streamlit compartidos por las páginas de optimización."""
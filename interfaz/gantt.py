@@ -0,0 +1,129 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from interfaz.resultados import derivado
+
+# Diagrama de Gantt de los turnos asignados, compartido por las páginas de resultados
+
+# Colores según prioridad
+COLORES_PRIORIDAD = {"Alta": "rgb(242, 72, 34)", "Media": "rgb(242, 183, 5)", "Baja": "rgb(45, 135, 187)"}
+
+# Desde esta cantidad de turnos se dibuja una sola traza de barras: ff.create_gantt arma una figura
+# que crece con cada turno y tarda varios segundos en programaciones de cientos de turnos
+UMBRAL_GANTT_RAPIDO = 200
+
+TITULO_GANTT = "Programación de Turnos Médicos"
+
+# Escala de colores discreta para los códigos de prioridad -1 (desconocida, en gris), 0, 1 y 2:
+# cada color ocupa una franja de igual ancho de [0, 1]
+_COLORES_CODIGO = ["gray", *COLORES_PRIORIDAD.values()]
+_ESCALA_PRIORIDAD = [[limite / len(_COLORES_CODIGO), color]
+                     for i, color in enumerate(_COLORES_CODIGO) for limite in (i, i + 1)]
+
+
+def _ejes_horarios(fig, df_gantt):
+    """Marcas del eje x cada una hora, desde la hora en punto anterior al primer turno hasta la posterior al último"""
+    fig.update_xaxes(
+        tickformat="%H:%M",
+        tickvals=pd.date_range(
+            start=df_gantt["Start"].min().floor("h"),
+            end=df_gantt["Finish"].max().ceil("h"),
+            freq="1h"
+        )
+    )
+
+def figura_gantt_rapida(df_gantt):
+    """Gantt de una sola traza de barras horizontales, con color por prioridad calculado por columna"""
+    # Cada barra empieza en Start (base) y mide la duración del turno en milisegundos sobre el eje de fechas
+    duracion = (df_gantt["Finish"] - df_gantt["Start"]).dt.total_seconds().to_numpy() * 1000
+    fig = go.Figure(go.Bar(
+        y=df_gantt["Resource"].to_numpy(),
+        x=duracion,
+        base=df_gantt["Start"].dt.strftime("%Y-%m-%d %H:%M").to_numpy(),
+        orientation="h",
+        # Códigos numéricos de prioridad sobre una escala de colores discreta: plotly no valida color por color
+        marker=dict(color=pd.Categorical(df_gantt["Prioridad"], categories=list(COLORES_PRIORIDAD)).codes,
+                    colorscale=_ESCALA_PRIORIDAD, cmin=-1, cmax=len(COLORES_PRIORIDAD) - 1),
+        customdata=np.column_stack([df_gantt["Nombre_Paciente"].astype(str), df_gantt["Prioridad"].astype(str),
+                                    df_gantt["Hora_Inicio"], df_gantt["Hora_Fin"]]),
+        hovertemplate="%{customdata[0]} (P: %{customdata[1]})<br>%{customdata[2]} - %{customdata[3]}<br>%{y}<extra></extra>",
+        showlegend=False
+    ))
+
+    # Leyenda de prioridades con trazas vacías, sin repetir los datos
+    for prioridad, color in COLORES_PRIORIDAD.items():
+        fig.add_trace(go.Bar(x=[None], y=[None], orientation="h", marker_color=color, name=prioridad))
+
+    fig.update_layout(title=TITULO_GANTT, barmode="overlay", xaxis_type="date", legend_title_text="Prioridad",
+                      height=max(450, 22 * df_gantt["Resource"].nunique()))
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+def figura_gantt(resultado, recurso):
+    """Figura del diagrama de Gantt de los turnos y mensaje de error si hubo que usar la alternativa"""
+    # recurso indica la fila del diagrama de cada turno
+    df_gantt = resultado.copy()
+    # Las tres vistas (figura_gantt_rapida, ff.create_gantt y px.timeline) muestran una fila por recurso;
+    # el paciente y su prioridad aparecen al pasar el cursor sobre cada turno
+    df_gantt["Resource"] = recurso
+    df_gantt["Task"] = df_gantt["Resource"]
+    df_gantt["Description"] = df_gantt["Nombre_Paciente"] + " (P: " + df_gantt["Prioridad"] + ")"
+
+    # Convertir hora inicio y fin a datetime para el gráfico
+    fecha_base = datetime.today().date()
+    df_gantt["Start"] = pd.to_datetime(fecha_base.strftime("%Y-%m-%d") + " " + df_gantt["Hora_Inicio"])
+    df_gantt["Finish"] = pd.to_datetime(fecha_base.strftime("%Y-%m-%d") + " " + df_gantt["Hora_Fin"])
+
+    if len(df_gantt) >= UMBRAL_GANTT_RAPIDO:
+        fig = figura_gantt_rapida(df_gantt)
+        _ejes_horarios(fig, df_gantt)
+        return fig, None
+
+    # plotly.figure_factory tarda casi un segundo en importarse: se carga recién al dibujar
+    # un diagrama chico, y no al abrir las páginas
+    import plotly.express as px
+    import plotly.figure_factory as ff
+
+    try:
+        # Crear el diagrama de Gantt, una fila por recurso y color según prioridad
+        fig = ff.create_gantt(
+            df_gantt,
+            colors=COLORES_PRIORIDAD,
+            index_col="Prioridad",
+            group_tasks=True,
+            show_colorbar=True,
+            showgrid_x=True,
+            title=TITULO_GANTT
+        )
+        error = None
+    except Exception as e:
+        # Visualización alternativa sin usar ff.create_gantt
+        fig = px.timeline(
+            df_gantt,
+            x_start="Start",
+            x_end="Finish",
+            y="Resource",
+            color="Prioridad",
+            hover_name="Nombre_Paciente",
+            color_discrete_map=COLORES_PRIORIDAD,
+            title=TITULO_GANTT
+        )
+        fig.update_yaxes(autorange="reversed")
+        error = str(e)
+
+    # Actualizar el diseño para mostrar horas en el eje x
+    _ejes_horarios(fig, df_gantt)
+    return fig, error
+
+@st.fragment
+def mostrar_gantt(trabajo, recurso):
+    """Muestra el diagrama de Gantt del resultado del trabajo, armado una sola vez por resultado"""
+    fig, error = derivado(trabajo, "gantt", lambda: figura_gantt(trabajo["resultado"], recurso))
+    if error is not None:
+        st.error(f"Error al crear el diagrama de Gantt: {error}")
+        st.info("Mostrando visualización alternativa...")
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,12 @@
+import streamlit as st
+
+from optimizacion.horarios import PASOS_GRILLA
+
+
+def seleccionar_paso():
+    """Muestra en la barra lateral la elección del paso de la grilla horaria, en minutos"""
+    return st.sidebar.selectbox(
+        "Paso de la grilla (minutos)", options=list(PASOS_GRILLA), index=list(PASOS_GRILLA).index(15),
+        help="Los turnos empiezan en múltiplos de este paso. Un paso menor aprovecha mejor los servicios "
+             "cuya duración no es múltiplo de 15 minutos, a costa de un modelo más grande."
+    )
@@ -0,0 +1,34 @@
+import io
+
+import streamlit as st
+
+from optimizacion.archivos import leer_arrow, pacientes_multiservicio
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _leer_pacientes(contenido, nombre, servicios_disponibles):
+    """Lee y valida el archivo una sola vez por contenido, no en cada rerun de la página"""
+    return pacientes_multiservicio(leer_arrow(io.BytesIO(contenido), nombre), servicios_disponibles)
+
+def importar_pacientes(archivo, servicios):
+    """Valida un archivo de pacientes subido con st.file_uploader y devuelve la tabla de pacientes válidos"""
+    # Devuelve None si el archivo no se puede leer; los errores por fila se informan y esas filas se omiten
+    try:
+        pacientes, errores, avisos = _leer_pacientes(archivo.getvalue(), archivo.name,
+                                                     tuple(sorted(set(s["nombre"] for s in servicios))))
+    except (ValueError, OSError) as e:
+        st.error(f"No se pudo leer el archivo de pacientes: {e}")
+        return None
+
+    for error in errores:
+        st.error(f"Filas omitidas: {error}")
+    for aviso in avisos:
+        st.warning(aviso)
+
+    with st.expander(f"Pacientes importados ({len(pacientes)})", expanded=False):
+        # Vista previa acotada: el archivo completo puede tener miles de filas
+        vista = pacientes.head(200).assign(servicios_requeridos=lambda df: df["servicios_requeridos"].str.join(", "))
+        st.dataframe(vista, use_container_width=True, hide_index=True)
+        if len(pacientes) > len(vista):
+            st.caption(f"Se muestran los primeros {len(vista)} pacientes.")
+    return pacientes
@@ -0,0 +1,68 @@
+import os
+
+import streamlit as st
+
+from optimizacion.cache import cache_soluciones
+from optimizacion.resolutores import NOMBRES_RESOLUTORES
+
+
+def opciones_resolutor():
+    """Muestra en la barra lateral la elección y los parámetros del resolutor"""
+    st.sidebar.subheader("Motor de Resolución")
+    resolutor = st.sidebar.selectbox("Resolutor", options=list(NOMBRES_RESOLUTORES), format_func=NOMBRES_RESOLUTORES.get)
+    limite_tiempo = st.sidebar.number_input(
+        "Tiempo límite (segundos)", min_value=1, max_value=3600, value=60,
+        help="Al alcanzarlo se devuelve la mejor programación encontrada hasta el momento. "
+             "HiGHS puede excederlo unos segundos; si no responde a tiempo se descarta su avance "
+             "y se devuelve la programación voraz."
+    )
+    gap_relativo = st.sidebar.number_input(
+        "Brecha de optimalidad aceptada (%)", min_value=0.0, max_value=50.0, value=0.0, step=0.5,
+        help="El resolutor se detiene cuando la solución está a esta distancia del óptimo. 0 usa el valor por defecto."
+    )
+    hilos = st.sidebar.number_input(
+        "Hilos", min_value=1, max_value=os.cpu_count() or 1, value=1,
+        help="Cantidad de hilos del resolutor (solo CBC)."
+    )
+
+    _mostrar_cache()
+
+    return {
+        "resolutor": resolutor,
+        "limite_tiempo": limite_tiempo,
+        "gap_relativo": gap_relativo / 100 if gap_relativo > 0 else None,
+        "hilos": hilos,
+    }
+
+def _mostrar_cache():
+    """Muestra en la barra lateral los contadores y la ocupación de la caché de soluciones"""
+    estadisticas = cache_soluciones.estadisticas()
+    aciertos = estadisticas["aciertos_memoria"] + estadisticas["aciertos_disco"]
+    with st.sidebar.expander("Caché de soluciones", expanded=False):
+        st.caption(f"Aciertos: {aciertos} (memoria {estadisticas['aciertos_memoria']}, "
+                   f"disco {estadisticas['aciertos_disco']}) · Fallos: {estadisticas['fallos']}")
+        st.caption(f"Memoria: {estadisticas['entradas_memoria']} resultados, {estadisticas['bytes_memoria'] / 2**20:.1f} MB · "
+                   f"Disco: {estadisticas['entradas_disco']} resultados, {estadisticas['bytes_disco'] / 2**20:.1f} MB")
+        if st.button("Vaciar caché", key="vaciar_cache_soluciones"):
+            cache_soluciones.vaciar()
+            st.rerun()
+
+def mostrar_estado_solucion(resultado):
+    """Informa si la programación es óptima o qué tan lejos del óptimo puede estar, y si se cambió de motor"""
+    solucion = resultado.attrs.get("solucion")
+    if solucion is None or (solucion["estado"] == "optimo" and not solucion["gap"]):
+        st.success("¡Optimización completada con éxito!")
+    elif solucion["estado"] == "optimo":
+        st.success(f"¡Optimización completada con éxito! La programación está a lo sumo a {solucion['gap']:.2%} "
+                   f"del óptimo (brecha aceptada).")
+    elif solucion["estado"] == "heuristica":
+        st.success(f"Programación obtenida con una heurística voraz: está a lo sumo a {solucion['gap']:.2%} del óptimo "
+                   f"(valor {solucion['objetivo']:.2f}, cota superior {solucion['cota']:.2f}).")
+    else:
+        st.warning(f"Se alcanzó el tiempo límite: se muestra la mejor programación encontrada, que está a lo sumo "
+                   f"a {solucion['gap']:.2%} del óptimo (valor {solucion['objetivo']:.2f}, cota superior {solucion['cota']:.2f}).")
+
+    # Motivo del cambio de formulación o de motor por el tamaño estimado del modelo
+    motivo = (resultado.attrs.get("estimacion") or {}).get("motivo")
+    if motivo:
+        st.info(motivo)
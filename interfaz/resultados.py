@@ -0,0 +1,104 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from optimizacion.rendimiento import medir, registrar
+
+# Secciones de resultados compartidas por las páginas. El registro del trabajo vive en
+# st.session_state, por lo que la programación y todo lo que se deriva de ella (gráficos, CSV)
+# sobrevive a los reruns: interactuar con la página no vuelve a resolver ni a rearmar los gráficos.
+
+# Etiquetas de las fases medidas: las del modelo (DataFrame.attrs["tiempos"]), las subfases de la
+# resolución (attrs["tiempos_resolucion"]) y las secciones de resultados (derivados del trabajo)
+NOMBRES_FASES = {
+    "construccion": "Construcción del modelo",
+    "resolucion": "Resolución",
+    "extraccion": "Extracción de la programación",
+    "estimacion": "Estimación del tamaño",
+    "ordenamiento": "Ordenamiento (sin resolutor)",
+    "heuristica": "Heurística voraz (sin resolutor)",
+    "asignacion": "Asignación heurística",
+    "arranque_voraz": "Solución inicial voraz",
+    "importacion": "Carga del resolutor",
+    "traduccion": "Traducción al resolutor",
+    "resolutor": "Ejecución del resolutor",
+    "lectura": "Lectura de la solución",
+    "cota": "Cota superior",
+    "analisis": "Análisis por paciente",
+    "gantt": "Diagrama de Gantt",
+    "estadisticas": "Gráficos de estadísticas",
+    "csv": "CSV de descarga",
+}
+
+ETAPAS = {"tiempos": "Optimización", "tiempos_resolucion": "Resolución", "tiempos_interfaz": "Resultados"}
+
+
+def derivado(trabajo, clave, construir):
+    """Objeto derivado del resultado, calculado la primera vez y guardado en el registro del trabajo"""
+    # Un nuevo trabajo reemplaza el registro completo, así que los derivados nunca quedan desactualizados
+    derivados = trabajo.setdefault("derivados", {})
+    if clave not in derivados:
+        with medir(trabajo.setdefault("tiempos_interfaz", {}), clave):
+            derivados[clave] = construir()
+    return derivados[clave]
+
+@st.fragment
+def mostrar_descarga(trabajo, nombre_archivo="turnos_medicos.csv"):
+    """Botón de descarga de la programación; al pulsarlo solo se vuelve a ejecutar este fragmento"""
+    csv = derivado(trabajo, "csv", lambda: trabajo["resultado"].to_csv(index=False))
+    st.download_button(
+        label="Descargar Programación (CSV)",
+        data=csv,
+        file_name=nombre_archivo,
+        mime="text/csv"
+    )
+
+def _registro_rendimiento(trabajo):
+    """Fases, tamaño del modelo y datos de la corrida para el panel y el log de rendimiento"""
+    resultado = trabajo["resultado"]
+    return {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "pagina": trabajo.get("clave"),
+        "resolutor": trabajo.get("resolutor"),
+        "desde_cache": trabajo.get("desde_cache", False),
+        "turnos": len(resultado),
+        "solucion": resultado.attrs.get("solucion"),
+        "tamano": resultado.attrs.get("tamano"),
+        "estimacion": resultado.attrs.get("estimacion"),
+        "tiempos": resultado.attrs.get("tiempos", {}),
+        "tiempos_resolucion": resultado.attrs.get("tiempos_resolucion", {}),
+        "tiempos_interfaz": trabajo.get("tiempos_interfaz", {}),
+    }
+
+def mostrar_rendimiento(trabajo):
+    """Panel "Rendimiento" con los tiempos por fase y el tamaño del modelo, estimado y real; la primera vez los agrega al log"""
+    # Se llama al final de la página, cuando las secciones de resultados ya armaron sus derivados
+    registro = trabajo.get("rendimiento")
+    if registro is None:
+        registro = trabajo["rendimiento"] = _registro_rendimiento(trabajo)
+        try:
+            registrar(registro)
+        except OSError:
+            pass
+
+    with st.expander("Rendimiento", expanded=False):
+        tamano = registro["tamano"]
+        if tamano is not None:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Variables", f"{tamano['columnas']:,}")
+            col2.metric("Restricciones", f"{tamano['filas']:,}")
+            col3.metric("No ceros", f"{tamano['no_ceros']:,}")
+        else:
+            st.caption("Programación obtenida sin modelo de programación lineal.")
+        # Tamaños estimados antes de construir, de la formulación pedida y de las alternativas evaluadas
+        estimacion = registro.get("estimacion") or {}
+        for formulacion, estimado in estimacion.get("tamanos", {}).items():
+            st.caption(f"Estimación previa ({formulacion}): {estimado['columnas']:,} variables, {estimado['filas']:,} "
+                       f"restricciones, {estimado['no_ceros']:,} no ceros, {estimado['memoria_mb']:,.1f} MB.")
+
+        fases = [{"Etapa": etapa, "Fase": NOMBRES_FASES.get(fase, fase), "Segundos": round(segundos, 4)}
+                 for clave, etapa in ETAPAS.items() for fase, segundos in registro[clave].items()]
+        st.dataframe(pd.DataFrame(fases, columns=["Etapa", "Fase", "Segundos"]), hide_index=True, use_container_width=True)
+        if registro["desde_cache"]:
+            st.caption("Resultado recuperado de la caché: los tiempos de optimización son los de la corrida original.")
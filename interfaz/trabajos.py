@@ -0,0 +1,109 @@
+import time
+
+import streamlit as st
+
+from optimizacion import trabajos
+from optimizacion.cache import cache_soluciones, clave_optimizacion
+
+# Intervalo en segundos con el que se consulta el estado de un trabajo en curso
+INTERVALO_SEGUIMIENTO = 1.0
+
+
+def _clave_estado(clave):
+    return f"trabajo_{clave}"
+
+def lanzar_trabajo(clave, funcion, *args, contexto=None, **kwargs):
+    """Envía la optimización al pool compartido y registra el trabajo en st.session_state"""
+    # contexto guarda los datos de entrada que la página necesita para mostrar el resultado,
+    # ya que el usuario puede seguir editando mientras se resuelve
+    anterior = st.session_state.get(_clave_estado(clave))
+    if anterior is not None and anterior["estado"] in ("en_cola", "en_ejecucion"):
+        trabajos.cancelar(anterior["id"])
+
+    trabajo = {
+        "id": None,
+        "clave": clave,
+        "resolutor": kwargs.get("resolutor"),
+        "estado": "en_cola",
+        "enviado": time.time(),
+        "inicio": None,
+        "limite_tiempo": kwargs.get("limite_tiempo"),
+        "contexto": contexto or {},
+        "clave_cache": clave_optimizacion(funcion, *args, **kwargs),
+        "desde_cache": False,
+        "resultado": None,
+        "error": None,
+    }
+
+    # Una entrada idéntica a una ya resuelta no vuelve a pasar por el resolutor
+    resultado = cache_soluciones.obtener(trabajo["clave_cache"])
+    if resultado is not None:
+        trabajo.update(estado="terminado", resultado=resultado, desde_cache=True)
+    else:
+        trabajo["id"] = trabajos.enviar(funcion, *args, **kwargs)
+    st.session_state[_clave_estado(clave)] = trabajo
+
+def _actualizar(trabajo):
+    """Sincroniza el registro de la sesión con el estado del trabajo en el pool"""
+    estado = trabajos.estado(trabajo["id"])
+    if estado == "en_ejecucion" and trabajo["inicio"] is None:
+        trabajo["inicio"] = time.time()
+    elif estado == "terminado":
+        trabajo["resultado"] = trabajos.resultado(trabajo["id"])
+        # Solo se guardan programaciones: None puede deberse a agotar el tiempo sin incumbente
+        if trabajo["resultado"] is not None:
+            try:
+                cache_soluciones.guardar(trabajo["clave_cache"], trabajo["resultado"])
+            except OSError:
+                pass
+    elif estado == "error":
+        try:
+            trabajos.resultado(trabajo["id"])
+        except Exception as e:
+            trabajo["error"] = str(e) or type(e).__name__
+    elif estado in ("cancelado", "desconocido"):
+        trabajo["error"] = "La optimización fue cancelada o se perdió al reiniciar el servidor."
+        estado = "error"
+    trabajo["estado"] = estado
+
+@st.fragment(run_every=INTERVALO_SEGUIMIENTO)
+def _seguimiento(clave):
+    """Muestra el progreso del trabajo y relanza la página completa cuando termina"""
+    trabajo = st.session_state[_clave_estado(clave)]
+    _actualizar(trabajo)
+    if trabajo["estado"] not in ("en_cola", "en_ejecucion"):
+        st.rerun()
+
+    if trabajo["estado"] == "en_cola":
+        st.info(f"Optimización en cola ({trabajos.posicion_en_cola(trabajo['id'])} trabajos por delante)...")
+    else:
+        # Sin información interna del resolutor, el avance se estima con el tiempo límite configurado
+        transcurrido = time.time() - trabajo["inicio"]
+        if trabajo["limite_tiempo"]:
+            st.progress(min(transcurrido / trabajo["limite_tiempo"], 0.99),
+                        text=f"Optimizando asignación de turnos... {transcurrido:.0f} s de {trabajo['limite_tiempo']} s como máximo")
+        else:
+            st.info(f"Optimizando asignación de turnos... {transcurrido:.0f} s")
+
+    if st.button("Cancelar optimización", key=f"cancelar_{clave}"):
+        trabajos.cancelar(trabajo["id"])
+        del st.session_state[_clave_estado(clave)]
+        st.rerun()
+
+def mostrar_trabajo(clave):
+    """Muestra el estado del último trabajo de la página y devuelve su registro si ya terminó"""
+    trabajo = st.session_state.get(_clave_estado(clave))
+    if trabajo is None:
+        return None
+
+    if trabajo["estado"] in ("en_cola", "en_ejecucion"):
+        _seguimiento(clave)
+        return None
+
+    if trabajo["estado"] == "error":
+        st.error(f"La optimización falló: {trabajo['error']}")
+        return None
+
+    if trabajo["desde_cache"]:
+        st.caption("Resultado recuperado de la caché de soluciones (la entrada no cambió desde una optimización anterior).")
+    return trabajo
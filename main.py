@@ -1,5 +1,7 @@
 import streamlit as st
 
+from optimizacion import trabajos
+
 
 # --- PAGE SETUP ---
 about_page = st.Page(
@@ -62,6 +64,10 @@ pg = st.navigation(
 
 
 # --- SHARED ON ALL PAGES ---
+# Los procesos de optimización arrancan en segundo plano con la primera visita, sin esperar al primer trabajo.
+# Con spawn cada proceso vuelve a ejecutar este script como __mp_main__, y no debe crear otro pool
+if __name__ == "__main__":
+    trabajos.precalentar()
 st.logo("assets/codingisfun_logo.png")
 st.sidebar.markdown("Made with ❤️ by [Rfeb](https://www.linkedin.com/in/rodrigo-bogado-a64b4925b/)")
 
@@ -0,0 +1 @@
+"""Modelos de optimización de turnos independientes de la interfaz de Streamlit."""
@@ -0,0 +1,233 @@
+"""Ejecuta un modelo de asignación de turnos sobre archivos, sin la interfaz de Streamlit.
+
+Uso (desde la raíz del repositorio):
+    python -m optimizacion modelo1 --pacientes pacientes.csv --salida turnos.parquet
+    python -m optimizacion modelo3 --especialistas especialistas.csv --pacientes pacientes.parquet --consultorios 4 --salida turnos.csv
+    python -m optimizacion modelo2 --especialistas especialistas.csv --pacientes pacientes.csv --motor arrepentimiento --salida turnos.csv
+
+Columnas esperadas (CSV o Parquet):
+    servicios (modelos 1, 4 y 5; opcional):  nombre, hora_inicio, hora_fin, lugar, tiempo_atencion
+    pacientes del modelo 1:                  nombre, servicio_requerido, prioridad, distancia
+    pacientes de los modelos 4 y 5:          nombre, servicios_requeridos (lista o texto separado por ";"), prioridad, distancia
+    especialistas del modelo 3:              especialidad, tiempo_atencion, hora_inicio, hora_fin
+    pacientes del modelo 3:                  nombre, prioridad, distancia
+    especialistas del modelo 2:              especialidad, duracion, hora_inicio, hora_fin
+    pacientes del modelo 2:                  especialidad, prioridad, distancia (y nombre, opcional)
+La prioridad es "Alta", "Media" o "Baja" y las horas tienen el formato HH:MM.
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from optimizacion import modelo1, modelo2, modelo3, multiservicio
+from optimizacion.archivos import escribir_tabla, formato_de, leer_tabla, pacientes_multiservicio, validar_columnas
+from optimizacion.catalogos import servicios_igehm, servicios_predefinidos
+from optimizacion.horarios import PASOS_GRILLA, convertir_hora_a_minutos, formatear_minutos, generar_horarios, horarios_de_servicios
+from optimizacion.resolutores import NOMBRES_RESOLUTORES
+
+MODELOS = ("modelo1", "modelo2", "modelo3", "modelo4", "modelo5")
+
+# Servicios usados por cada página cuando no se indica un archivo
+CATALOGOS = {"modelo1": servicios_predefinidos, "modelo4": servicios_predefinidos, "modelo5": servicios_igehm}
+
+# Prioridades numéricas de la página 2
+PRIORIDADES_MODELO2 = {"Alta": 3, "Media": 2, "Baja": 1}
+
+
+def _hora(valor):
+    """Normaliza una hora leída de un archivo al formato HH:MM"""
+    return formatear_minutos(convertir_hora_a_minutos(valor))
+
+def _servicios(args):
+    """Servicios del archivo indicado o, si no hay, el catálogo de la página"""
+    if args.servicios is None:
+        return CATALOGOS[args.modelo]
+    df = leer_tabla(args.servicios)
+    validar_columnas(df, ["nombre", "hora_inicio", "hora_fin", "lugar", "tiempo_atencion"], "servicios")
+    return [{
+        "nombre": str(fila.nombre),
+        "hora_inicio": _hora(fila.hora_inicio),
+        "hora_fin": _hora(fila.hora_fin),
+        "lugar": str(fila.lugar),
+        "tiempo_atencion": int(fila.tiempo_atencion),
+    } for fila in df.itertuples(index=False)]
+
+def _validar_prioridades(pacientes_df):
+    """Lanza ValueError si alguna prioridad no es Alta, Media o Baja"""
+    invalidas = sorted(set(pacientes_df["prioridad"].astype(str)) - set(PRIORIDADES_MODELO2))
+    if invalidas:
+        raise ValueError(f"Prioridades inválidas en pacientes: {', '.join(invalidas)} (se esperaba Alta, Media o Baja)")
+
+def _ejecutar_modelo1(args, pacientes_df):
+    servicios = _servicios(args)
+    validar_columnas(pacientes_df, ["nombre", "servicio_requerido", "prioridad", "distancia"], "pacientes")
+    _validar_prioridades(pacientes_df)
+    return modelo1.optimizar_turnos(servicios, pacientes_df, horarios_de_servicios(servicios, args.paso), **_opciones(args))
+
+def _ejecutar_multiservicio(args, pacientes_df):
+    servicios = _servicios(args)
+    validar_columnas(pacientes_df, ["nombre", "servicios_requeridos", "prioridad", "distancia"], "pacientes")
+    _validar_prioridades(pacientes_df)
+
+    # Igual que en las páginas 4 y 5: se descartan los servicios que no se ofrecen
+    # y los pacientes que no requieren ninguno de los disponibles
+    pacientes, errores, avisos = pacientes_multiservicio(pacientes_df, set(s["nombre"] for s in servicios))
+    for mensaje in errores + avisos:
+        print(f"Aviso: {mensaje}", file=sys.stderr)
+    if pacientes.empty:
+        raise ValueError("No hay pacientes que requieran los servicios disponibles.")
+    return multiservicio.optimizar_turnos(servicios, pacientes, horarios_de_servicios(servicios, args.paso),
+                                          **_opciones(args), **_limites(args))
+
+def _ejecutar_modelo3(args, pacientes_df):
+    especialistas_df = _leer_especialistas(args, ["especialidad", "tiempo_atencion", "hora_inicio", "hora_fin"])
+    validar_columnas(pacientes_df, ["nombre", "prioridad", "distancia"], "pacientes")
+    _validar_prioridades(pacientes_df)
+
+    # Como en la página 3, los turnos empiezan en la grilla de 08:00 a 16:00 dentro del horario de cada especialista
+    horarios = generar_horarios(8, 16, args.paso)
+    especialistas = []
+    for fila in especialistas_df.itertuples(index=False):
+        desde, hasta = convertir_hora_a_minutos(fila.hora_inicio), convertir_hora_a_minutos(fila.hora_fin)
+        especialistas.append({
+            "especialidad": str(fila.especialidad),
+            "tiempo_atencion": int(fila.tiempo_atencion),
+            "horarios_disponibles": [h for h in horarios if desde <= convertir_hora_a_minutos(h) < hasta],
+        })
+    return modelo3.optimizar_turnos(especialistas, pacientes_df, args.consultorios, horarios, **_opciones(args), **_limites(args))
+
+def _ejecutar_modelo2(args, pacientes_df):
+    especialistas_df = _leer_especialistas(args, ["especialidad", "duracion", "hora_inicio", "hora_fin"])
+    validar_columnas(pacientes_df, ["especialidad", "prioridad", "distancia"], "pacientes")
+    _validar_prioridades(pacientes_df)
+
+    # La página 2 mide los minutos desde las 08:00
+    apertura = 8 * 60
+    especialistas = [{
+        "id": i + 1,
+        "especialidad": str(fila.especialidad),
+        "disponibilidad": [(convertir_hora_a_minutos(fila.hora_inicio) - apertura, convertir_hora_a_minutos(fila.hora_fin) - apertura)],
+        "ocupado": [],
+        "duracion": int(fila.duracion),
+    } for i, fila in enumerate(especialistas_df.itertuples(index=False))]
+    nombres = pacientes_df["nombre"] if "nombre" in pacientes_df.columns else [f"Paciente {i+1}" for i in range(len(pacientes_df))]
+    pacientes = [{
+        "prioridad": PRIORIDADES_MODELO2[fila.prioridad],
+        "distancia": fila.distancia,
+        "especialidad": str(fila.especialidad),
+        "datos": str(nombre),
+    } for nombre, fila in zip(nombres, pacientes_df.itertuples(index=False))]
+
+    asignaciones, _ = modelo2.asignar_turnos(especialistas, pacientes, modelo2.crear_consultorios(args.consultorios), motor=args.motor)
+    return pd.DataFrame([{
+        "Paciente": a["paciente"]["datos"],
+        "Especialidad": a["paciente"]["especialidad"],
+        "Especialista": f"Especialista {especialistas[a['especialista']]['id']}",
+        "Consultorio": a["consultorio"] + 1,
+        "Inicio": formatear_minutos(apertura + a["inicio"]),
+        "Fin": formatear_minutos(apertura + a["fin"]),
+    } for a in asignaciones], columns=["Paciente", "Especialidad", "Especialista", "Consultorio", "Inicio", "Fin"])
+
+def _leer_especialistas(args, columnas):
+    if args.especialistas is None:
+        raise ValueError(f"{args.modelo} requiere --especialistas")
+    df = leer_tabla(args.especialistas)
+    validar_columnas(df, columnas, "especialistas")
+    return df
+
+def _opciones(args):
+    """Parámetros del resolutor para los modelos de programación lineal entera"""
+    return {
+        "resolutor": args.resolutor,
+        "limite_tiempo": args.limite_tiempo,
+        "gap_relativo": args.gap_relativo,
+        "hilos": args.hilos,
+    }
+
+def _limites(args):
+    """Límites de tamaño de los modelos 3, 4 y 5: con --sin-limites se construye siempre el modelo pedido"""
+    return {"limites": None} if args.sin_limites else {}
+
+EJECUTORES = {
+    "modelo1": _ejecutar_modelo1,
+    "modelo2": _ejecutar_modelo2,
+    "modelo3": _ejecutar_modelo3,
+    "modelo4": _ejecutar_multiservicio,
+    "modelo5": _ejecutar_multiservicio,
+}
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog="python -m optimizacion", description=__doc__.splitlines()[0],
+                                     epilog="\n".join(__doc__.splitlines()[2:]), formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modelo", choices=MODELOS)
+    parser.add_argument("--pacientes", required=True, help="archivo CSV o Parquet de pacientes")
+    parser.add_argument("--servicios", help="archivo de servicios (modelos 1, 4 y 5; por defecto el catálogo de la página)")
+    parser.add_argument("--especialistas", help="archivo de especialistas (modelos 2 y 3)")
+    parser.add_argument("--consultorios", type=int, default=2, help="cantidad de consultorios (modelos 2 y 3)")
+    parser.add_argument("--salida", required=True, help="archivo CSV o Parquet con los turnos asignados")
+    parser.add_argument("--paso", type=int, default=15, choices=PASOS_GRILLA, help="paso de la grilla en minutos")
+    parser.add_argument("--resolutor", default="cbc", choices=list(NOMBRES_RESOLUTORES))
+    parser.add_argument("--limite-tiempo", type=float, default=None, help="segundos")
+    parser.add_argument("--gap-relativo", type=float, default=None, help="por ejemplo 0.01 para 1%%")
+    parser.add_argument("--hilos", type=int, default=None)
+    parser.add_argument("--motor", default="primer_turno", choices=list(modelo2.NOMBRES_MOTORES), help="heurística del modelo 2")
+    parser.add_argument("--sin-limites", action="store_true",
+                        help="no cambiar de formulación ni usar la heurística aunque el modelo estimado sea muy grande (modelos 3, 4 y 5)")
+    args = parser.parse_args(argumentos)
+
+    tiempos = {}
+    try:
+        # El formato de salida se valida antes de optimizar para no perder una corrida larga
+        formato_de(args.salida)
+
+        inicio = time.perf_counter()
+        pacientes_df = leer_tabla(args.pacientes)
+        tiempos["lectura"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        resultado = EJECUTORES[args.modelo](args, pacientes_df)
+        tiempos["optimizacion"] = time.perf_counter() - inicio
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if resultado is None:
+        print("No se encontró una solución con los parámetros indicados.", file=sys.stderr)
+        return 1
+
+    inicio = time.perf_counter()
+    escribir_tabla(resultado, args.salida)
+    tiempos["escritura"] = time.perf_counter() - inicio
+
+    print(f"{len(resultado)} turnos asignados de {len(pacientes_df)} pacientes -> {args.salida}")
+    solucion = resultado.attrs.get("solucion")
+    if solucion is not None:
+        print(f"estado: {solucion['estado']}, objetivo: {solucion['objetivo']:.2f}, brecha: {solucion['gap'] or 0:.2%}")
+    estimacion = resultado.attrs.get("estimacion")
+    if estimacion is not None:
+        for formulacion, estimado in estimacion["tamanos"].items():
+            print(f"estimado ({formulacion}): {estimado['columnas']} variables, {estimado['filas']} restricciones, "
+                  f"{estimado['no_ceros']} no ceros, {estimado['memoria_mb']} MB")
+        if estimacion["motivo"]:
+            print(estimacion["motivo"])
+    tamano = resultado.attrs.get("tamano")
+    if tamano is not None:
+        print(f"modelo: {tamano['columnas']} variables, {tamano['filas']} restricciones, {tamano['no_ceros']} no ceros")
+    # Las fases internas del modelo (construcción, resolución, extracción) se muestran dentro de la optimización,
+    # y las del resolutor (traducción, ejecución, lectura) dentro de la resolución
+    for fase, segundos in tiempos.items():
+        print(f"{fase:>18}: {segundos:.3f} s")
+        if fase == "optimizacion":
+            for subfase, segundos_subfase in resultado.attrs.get("tiempos", {}).items():
+                print(f"{'- ' + subfase:>18}: {segundos_subfase:.3f} s")
+                if subfase == "resolucion":
+                    for paso, segundos_paso in resultado.attrs.get("tiempos_resolucion", {}).items():
+                        print(f"{'-- ' + paso:>18}: {segundos_paso:.3f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
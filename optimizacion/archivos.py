@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Lectura y escritura de tablas de entrada y salida (servicios, especialistas, pacientes y turnos).
+# Las columnas usan los mismos nombres que las claves de los diccionarios de los modelos.
+
+FORMATOS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".xlsx": "excel", ".xls": "excel"}
+
+# Formatos que se pueden escribir (la salida a Excel no se ofrece)
+FORMATOS_SALIDA = ("csv", "parquet")
+
+PRIORIDADES = ("Alta", "Media", "Baja")
+
+COLUMNAS_PACIENTES_MULTISERVICIO = ["nombre", "servicios_requeridos", "prioridad", "distancia"]
+
+
+def formato_de(ruta):
+    """Formato de una tabla según la extensión del archivo"""
+    extension = os.path.splitext(str(ruta))[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {extension or ruta!r} (se esperaba CSV, Excel o Parquet)")
+    return FORMATOS[extension]
+
+def leer_arrow(origen, nombre=None):
+    """Lee una tabla CSV, Excel o Parquet (ruta o archivo abierto) como pyarrow.Table"""
+    # nombre indica la extensión cuando origen es un archivo en memoria (por ejemplo, de st.file_uploader)
+    formato = formato_de(nombre or origen)
+    if formato == "parquet":
+        return pq.read_table(origen)
+    if formato == "csv":
+        return pa_csv.read_csv(origen)
+    try:
+        df = pd.read_excel(origen)
+    except ImportError:
+        raise ValueError("Para leer archivos Excel se necesita el paquete openpyxl") from None
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def leer_tabla(origen, nombre=None):
+    """Lee una tabla CSV, Excel o Parquet con pyarrow y la devuelve como DataFrame"""
+    return leer_arrow(origen, nombre).to_pandas()
+
+def escribir_tabla(df, ruta):
+    """Escribe un DataFrame como CSV o Parquet según la extensión"""
+    formato = formato_de(ruta)
+    if formato not in FORMATOS_SALIDA:
+        raise ValueError(f"No se puede escribir en formato {formato} (se esperaba CSV o Parquet)")
+    if formato == "parquet":
+        df.to_parquet(ruta, index=False)
+    else:
+        df.to_csv(ruta, index=False)
+
+def validar_columnas(df, requeridas, nombre="tabla"):
+    """Lanza ValueError si faltan columnas requeridas"""
+    columnas = df.column_names if isinstance(df, pa.Table) else df.columns
+    faltantes = [c for c in requeridas if c not in columnas]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en {nombre}: {', '.join(faltantes)}")
+
+def _filas(mascara, limite=10):
+    """Números de fila (desde 1) marcados en una máscara, abreviados para los mensajes"""
+    filas = (np.flatnonzero(mascara) + 1).tolist()
+    return ", ".join(map(str, filas[:limite])) + (f" y {len(filas) - limite} más" if len(filas) > limite else "")
+
+def pacientes_multiservicio(tabla, servicios_disponibles=None):
+    """Valida pacientes de los modelos 4 y 5 en bloque y devuelve (DataFrame de pacientes, errores, avisos)"""
+    # servicios_requeridos puede ser una lista (Parquet) o texto separado por ";" (CSV y Excel).
+    # Las filas con errores se descartan; los servicios que no se ofrecen se quitan con un aviso,
+    # como hacen las páginas. El DataFrame tiene las columnas id, nombre, servicios_requeridos
+    # (lista), prioridad y distancia, y es la entrada columnar de multiservicio.optimizar_turnos
+    if isinstance(tabla, pd.DataFrame):
+        tabla = pa.Table.from_pandas(tabla, preserve_index=False)
+    validar_columnas(tabla, COLUMNAS_PACIENTES_MULTISERVICIO, "pacientes")
+    errores, avisos = [], []
+    num_filas = tabla.num_rows
+
+    # Servicios requeridos: se separan y limpian en Arrow y quedan en formato largo (fila, servicio)
+    requeridos = tabla.column("servicios_requeridos").combine_chunks()
+    if pa.types.is_null(requeridos.type):
+        requeridos = pa.array([[]] * num_filas, type=pa.list_(pa.string()))
+    elif pa.types.is_string(requeridos.type) or pa.types.is_large_string(requeridos.type):
+        requeridos = pc.split_pattern(pc.fill_null(requeridos, ""), ";")
+    elif not (pa.types.is_list(requeridos.type) or pa.types.is_large_list(requeridos.type)):
+        raise ValueError("La columna servicios_requeridos debe ser una lista o texto separado por \";\"")
+    filas_servicio = pc.list_parent_indices(requeridos).to_numpy()
+    nombres_servicio = pc.utf8_trim_whitespace(pc.cast(pc.list_flatten(requeridos), pa.string()))
+    largo = pc.greater(pc.utf8_length(nombres_servicio), 0).to_numpy(zero_copy_only=False)
+    largo &= ~np.asarray(pc.is_null(nombres_servicio).to_numpy(zero_copy_only=False), dtype=bool)
+    servicios_largo = pd.DataFrame({"fila": filas_servicio[largo],
+                                    "servicio": nombres_servicio.to_numpy(zero_copy_only=False)[largo]})
+
+    if servicios_disponibles is not None:
+        ofrecido = servicios_largo["servicio"].isin(set(servicios_disponibles)).to_numpy()
+        if not ofrecido.all():
+            desconocidos = sorted(servicios_largo.loc[~ofrecido, "servicio"].unique())
+            avisos.append(f"Se ignoran servicios que no se ofrecen: {', '.join(desconocidos[:10])}"
+                          + (f" y {len(desconocidos) - 10} más" if len(desconocidos) > 10 else ""))
+        servicios_largo = servicios_largo[ofrecido]
+
+    # Validaciones vectorizadas por columna
+    prioridad = pd.Series(pc.utf8_trim_whitespace(pc.cast(tabla.column("prioridad"), pa.string())).to_pandas())
+    distancia = pd.to_numeric(pd.Series(tabla.column("distancia").to_pandas()), errors="coerce")
+    nombre = pd.Series(pc.cast(tabla.column("nombre"), pa.string()).to_pandas())
+    cantidad_servicios = np.bincount(servicios_largo["fila"].to_numpy(dtype=np.int64), minlength=num_filas)
+
+    invalida = np.zeros(num_filas, dtype=bool)
+    for mascara, mensaje in [
+        ((nombre.isna() | nombre.str.strip().eq("")).to_numpy(), "sin nombre"),
+        (~prioridad.isin(PRIORIDADES).to_numpy(), "con prioridad distinta de Alta, Media o Baja"),
+        ((distancia.isna() | (distancia < 0)).to_numpy(), "con distancia vacía, negativa o no numérica"),
+        (cantidad_servicios == 0, "sin servicios requeridos disponibles"),
+    ]:
+        if mascara.any():
+            errores.append(f"{int(mascara.sum())} filas {mensaje} (filas {_filas(mascara)})")
+            invalida |= mascara
+
+    validas = np.flatnonzero(~invalida)
+    distancias = distancia.to_numpy()[validas]
+    if len(distancias) and np.all(np.mod(distancias, 1) == 0):
+        distancias = distancias.astype(np.int64)
+    # Las filas del formato largo están ordenadas: las listas se rearman en Arrow a partir de los desplazamientos
+    desplazamientos = np.concatenate(([0], np.cumsum(cantidad_servicios))).astype(np.int32)
+    servicios_por_fila = pa.ListArray.from_arrays(pa.array(desplazamientos),
+                                                  pa.array(servicios_largo["servicio"].to_numpy(), type=pa.string()))
+    pacientes = pd.DataFrame({
+        "id": validas,
+        "nombre": nombre.to_numpy()[validas],
+        "servicios_requeridos": pd.Series(servicios_por_fila.take(pa.array(validas)).to_pylist(), dtype=object).to_numpy(),
+        "prioridad": prioridad.to_numpy()[validas],
+        "distancia": distancias,
+    })
+    return pacientes, errores, avisos
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Cambiar este número invalida todas las entradas guardadas (por ejemplo, si cambia el formato del resultado)
+VERSION_CACHE = 3
+
+# Directorio del almacén en disco, relativo al directorio desde el que se lanza la aplicación
+DIRECTORIO_CACHE = os.environ.get("SMARTSHIFTS_DIRECTORIO_CACHE", os.path.join(".cache", "soluciones"))
+
+
+def _canonico(valor):
+    """Normaliza recursivamente la entrada para que el hash no dependa de tipos de NumPy/pandas"""
+    if isinstance(valor, pd.DataFrame):
+        # Entrada columnar (por ejemplo, pacientes importados de un archivo): los modelos leen las columnas
+        # por nombre, así que su orden no forma parte de la clave
+        return {"datos": _canonico(valor.to_dict("list"))}
+    if isinstance(valor, (np.ndarray, pd.Series)):
+        return _canonico(valor.tolist())
+    if isinstance(valor, dict):
+        return {str(k): _canonico(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_canonico(v) for v in valor]
+    if isinstance(valor, (set, frozenset)):
+        return sorted(_canonico(v) for v in valor)
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    # 10 y 10.0 (por ejemplo, una distancia editada en st.data_editor) representan la misma entrada
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+def clave_optimizacion(funcion, *args, **kwargs):
+    """Hash SHA-256 de la entrada canonizada de una llamada a optimizar_turnos"""
+    # Las listas conservan su orden (los índices de servicios y pacientes aparecen en el resultado);
+    # las claves de los diccionarios se ordenan
+    entrada = {
+        "version": VERSION_CACHE,
+        "funcion": f"{funcion.__module__}.{funcion.__qualname__}",
+        "args": _canonico(args),
+        "kwargs": _canonico(kwargs),
+    }
+    texto = json.dumps(entrada, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+class CacheSoluciones:
+    """Caché de resultados en dos niveles (memoria y Parquet en disco) con desalojo LRU por tamaño"""
+
+    def __init__(self, directorio=DIRECTORIO_CACHE, max_bytes_memoria=64 * 2**20, max_bytes_disco=512 * 2**20):
+        self.directorio = directorio
+        self.max_bytes_memoria = max_bytes_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self.aciertos_memoria = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self._memoria = OrderedDict()  # clave -> (DataFrame, bytes), del menos al más reciente
+        self._bytes_memoria = 0
+        self._disco = None             # clave -> bytes, se carga del directorio al primer uso
+        self._bytes_disco = 0
+        self._bloqueo = threading.RLock()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f"{clave}.parquet")
+
+    def _cargar_indice_disco(self):
+        """Recorre el directorio una vez, ordenando las entradas por último acceso (mtime)"""
+        if self._disco is not None:
+            return
+        entradas = []
+        if os.path.isdir(self.directorio):
+            for nombre in os.listdir(self.directorio):
+                if nombre.endswith(".parquet"):
+                    info = os.stat(os.path.join(self.directorio, nombre))
+                    entradas.append((info.st_mtime, nombre[:-len(".parquet")], info.st_size))
+        self._disco = OrderedDict((clave, tamano) for _, clave, tamano in sorted(entradas))
+        self._bytes_disco = sum(self._disco.values())
+
+    def _guardar_en_memoria(self, clave, resultado):
+        tamano = int(resultado.memory_usage(index=True, deep=True).sum())
+        if tamano > self.max_bytes_memoria:
+            return
+        if clave in self._memoria:
+            self._bytes_memoria -= self._memoria.pop(clave)[1]
+        self._memoria[clave] = (resultado, tamano)
+        self._bytes_memoria += tamano
+        while self._bytes_memoria > self.max_bytes_memoria:
+            _, (_, liberado) = self._memoria.popitem(last=False)
+            self._bytes_memoria -= liberado
+
+    def obtener(self, clave):
+        """Devuelve una copia del resultado guardado para la clave, o None si no está"""
+        with self._bloqueo:
+            if clave in self._memoria:
+                self._memoria.move_to_end(clave)
+                self.aciertos_memoria += 1
+                return self._memoria[clave][0].copy()
+
+            self._cargar_indice_disco()
+            if clave in self._disco:
+                try:
+                    resultado = pd.read_parquet(self._ruta(clave))
+                    os.utime(self._ruta(clave))
+                except (OSError, ValueError):
+                    # El archivo fue borrado o está dañado; se descarta la entrada
+                    self._bytes_disco -= self._disco.pop(clave)
+                else:
+                    self._disco.move_to_end(clave)
+                    self.aciertos_disco += 1
+                    self._guardar_en_memoria(clave, resultado)
+                    return resultado.copy()
+
+            self.fallos += 1
+            return None
+
+    def guardar(self, clave, resultado):
+        """Guarda un resultado en ambos niveles, desalojando las entradas usadas hace más tiempo"""
+        with self._bloqueo:
+            self._guardar_en_memoria(clave, resultado.copy())
+
+            self._cargar_indice_disco()
+            os.makedirs(self.directorio, exist_ok=True)
+            ruta = self._ruta(clave)
+            # Escritura atómica: otra sesión nunca lee un archivo a medio escribir
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            resultado.to_parquet(temporal, index=False)
+            os.replace(temporal, ruta)
+
+            if clave in self._disco:
+                self._bytes_disco -= self._disco.pop(clave)
+            self._disco[clave] = os.path.getsize(ruta)
+            self._bytes_disco += self._disco[clave]
+            while self._bytes_disco > self.max_bytes_disco and len(self._disco) > 1:
+                antigua, tamano = self._disco.popitem(last=False)
+                self._bytes_disco -= tamano
+                try:
+                    os.remove(self._ruta(antigua))
+                except OSError:
+                    pass
+
+    def vaciar(self):
+        """Elimina todas las entradas de ambos niveles"""
+        with self._bloqueo:
+            self._cargar_indice_disco()
+            for clave in self._disco:
+                try:
+                    os.remove(self._ruta(clave))
+                except OSError:
+                    pass
+            self._memoria.clear()
+            self._disco.clear()
+            self._bytes_memoria = self._bytes_disco = 0
+
+    def estadisticas(self):
+        """Contadores de aciertos y fallos y ocupación de cada nivel"""
+        with self._bloqueo:
+            self._cargar_indice_disco()
+            return {
+                "aciertos_memoria": self.aciertos_memoria,
+                "aciertos_disco": self.aciertos_disco,
+                "fallos": self.fallos,
+                "entradas_memoria": len(self._memoria),
+                "bytes_memoria": self._bytes_memoria,
+                "entradas_disco": len(self._disco),
+                "bytes_disco": self._bytes_disco,
+            }
+
+
+# Instancia compartida por todas las sesiones del servidor
+cache_soluciones = CacheSoluciones()
@@ -0,0 +1,22 @@
+# Catálogo de servicios predefinidos de los modelos 1 y 4
+servicios_predefinidos = [
+    {"nombre": "Clínica Médica", "hora_inicio": "12:00", "hora_fin": "14:30", "lugar": "N7", "tiempo_atencion": 30},
+    {"nombre": "Neurología", "hora_inicio": "09:00", "hora_fin": "10:00", "lugar": "N7", "tiempo_atencion": 30},
+    {"nombre": "Neurología", "hora_inicio": "13:30", "hora_fin": "13:50", "lugar": "N7", "tiempo_atencion": 20},
+    {"nombre": "Reumatología", "hora_inicio": "09:00", "hora_fin": "11:00", "lugar": "N7", "tiempo_atencion": 30},
+    {"nombre": "Traumatología", "hora_inicio": "08:00", "hora_fin": "10:30", "lugar": "N7", "tiempo_atencion": 30},
+    {"nombre": "Cardiología", "hora_inicio": "10:00", "hora_fin": "12:00", "lugar": "N1", "tiempo_atencion": 30},
+    {"nombre": "Cuidados Paliativos", "hora_inicio": "12:30", "hora_fin": "15:00", "lugar": "N3", "tiempo_atencion": 30},
+    {"nombre": "Oftalmología", "hora_inicio": "11:00", "hora_fin": "13:30", "lugar": "N5", "tiempo_atencion": 30},
+    {"nombre": "Rehabilitación", "hora_inicio": "08:00", "hora_fin": "10:30", "lugar": "N6", "tiempo_atencion": 30},
+    {"nombre": "Salud Mental", "hora_inicio": "12:30", "hora_fin": "15:00", "lugar": "N8", "tiempo_atencion": 30}
+]
+
+# Catálogo de servicios IGeHM del modelo 5
+servicios_igehm = servicios_predefinidos + [
+    {"nombre": "Neumologia", "hora_inicio": "10:00", "hora_fin":"11:00","lugar": "Hdia", "tiempo_atencion":30},
+    {"nombre": "IGeHM-TS", "hora_inicio": "8:00", "hora_fin": "15:00","lugar": "N7", "tiempo_atencion":30},
+    {"nombre": "Gastroenterologia", "hora_inicio":"8:00", "hora_fin":"9:30","lugar":"Hdia2","tiempo_atencion":30},
+    {"nombre": "IGeHM-SM", "hora_inicio":"12:00","hora_fin":"17:00","lugar":"N8","tiempo_atencion":30},
+    {"nombre": "IGeHM-MA", "hora_inicio":"7:00","hora_fin":"13:00","lugar":"N8","tiempo_atencion":30}
+]
@@ -0,0 +1,67 @@
+import numpy as np
+
+# Estimación del tamaño de los modelos antes de construirlos. Cada modelo calcula filas, columnas y
+# no ceros de una formulación a partir de las cardinalidades de los mismos bucles de construir_modelo,
+# sin crear variables ni restricciones. Si el modelo pedido supera los límites se prueba la formulación
+# agregada y, si tampoco entra, se recurre a la heurística del modelo, que no construye el modelo lineal.
+
+# Límites por defecto: por encima de ellos la construcción y la traducción al resolutor ocupan
+# demasiada memoria y el resolutor no llega a una solución en tiempos razonables
+LIMITES_MODELO = {"columnas": 300_000, "no_ceros": 3_000_000, "memoria_mb": 1024}
+
+# Memoria del ModeloLineal y de su traducción a PuLP por elemento, medida con tracemalloc
+# (ajuste por mínimos cuadrados, redondeado hacia arriba)
+BYTES_POR_COLUMNA = 600
+BYTES_POR_FILA = 1000
+BYTES_POR_NO_CERO = 100
+
+MOTOR_HEURISTICO = "heuristica"
+
+# Etiquetas de las magnitudes limitadas, para explicar el cambio de motor
+NOMBRES_MAGNITUDES = {"columnas": "variables", "no_ceros": "coeficientes no nulos", "memoria_mb": "MB de memoria"}
+
+
+def estimar_memoria(tamano):
+    """Memoria en MB que ocupan el modelo y su traducción al resolutor, según filas, columnas y no ceros"""
+    total = (BYTES_POR_COLUMNA * tamano["columnas"] + BYTES_POR_FILA * tamano["filas"]
+             + BYTES_POR_NO_CERO * tamano["no_ceros"])
+    return round(total / 2**20, 1)
+
+def excesos(tamano, limites):
+    """Magnitudes del tamaño estimado que superan su límite"""
+    return [magnitud for magnitud, limite in limites.items() if tamano[magnitud] > limite]
+
+def describir_excesos(tamano, limites):
+    """Texto con las magnitudes excedidas, por ejemplo "1,200,000 variables (límite 300,000)\""""
+    return ", ".join(f"{tamano[m]:,} {NOMBRES_MAGNITUDES[m]} (límite {limites[m]:,})" for m in excesos(tamano, limites))
+
+def elegir_motor(estimar, formulacion, limites=LIMITES_MODELO):
+    """Formulación a construir, o la heurística, según el tamaño estimado de cada alternativa"""
+    # estimar(formulacion) devuelve filas, columnas y no ceros. Con limites=None se usa siempre la formulación
+    # pedida. Devuelve un diccionario con la formulación pedida, el motor elegido, los tamaños estimados
+    # (con la memoria) y el motivo del cambio de motor (None si no hubo cambio)
+    estimacion = {"formulacion": formulacion, "motor": formulacion, "tamanos": {}, "motivo": None}
+    if limites is None:
+        return estimacion
+
+    for alternativa in dict.fromkeys([formulacion, "agregada"]):
+        tamano = estimar(alternativa)
+        tamano["memoria_mb"] = estimar_memoria(tamano)
+        estimacion["tamanos"][alternativa] = tamano
+        if not excesos(tamano, limites):
+            estimacion["motor"] = alternativa
+            break
+    else:
+        estimacion["motor"] = MOTOR_HEURISTICO
+
+    if estimacion["motor"] != formulacion:
+        destino = ("una heurística voraz, sin construir el modelo lineal" if estimacion["motor"] == MOTOR_HEURISTICO
+                   else f"la formulación {estimacion['motor']}")
+        estimacion["motivo"] = (f"El modelo con la formulación {formulacion} tendría "
+                                f"{describir_excesos(estimacion['tamanos'][formulacion], limites)}: se usó {destino}.")
+    return estimacion
+
+def cota_por_capacidad(pesos, capacidad):
+    """Suma de los capacidad mayores pesos positivos: cota del valor de llenar esa cantidad de turnos"""
+    pesos = np.sort(np.asarray(pesos, dtype=float))[::-1]
+    return float(pesos[:capacidad][pesos[:capacidad] > 0].sum())
@@ -0,0 +1,142 @@
+import numpy as np
+
+# Los modelos trabajan con minutos enteros desde las 00:00 e índices de slot;
+# el formato "HH:MM" solo se usa al recibir datos de la interfaz y al mostrar resultados.
+
+# Pasos de grilla ofrecidos en la interfaz, en minutos
+PASOS_GRILLA = (5, 10, 15)
+
+
+def convertir_hora_a_minutos(hora):
+    """Convierte una hora ("HH:MM", "H:MM", "HH:MM:SS", datetime.time o minutos) a minutos desde las 00:00"""
+    if isinstance(hora, (int, np.integer)):
+        return int(hora)
+    if hasattr(hora, "hour"):
+        return hora.hour * 60 + hora.minute
+
+    partes = str(hora).strip().split(":")
+    try:
+        horas, minutos = int(partes[0]), int(partes[1])
+    except (IndexError, ValueError):
+        raise ValueError(f"Hora inválida: {hora!r}") from None
+    if not (0 <= horas <= 24 and 0 <= minutos < 60):
+        raise ValueError(f"Hora inválida: {hora!r}")
+    return horas * 60 + minutos
+
+def formatear_minutos(minutos):
+    """Convierte minutos desde las 00:00 al formato HH:MM (escalar o arreglo)"""
+    if np.ndim(minutos) == 0:
+        return f"{int(minutos) // 60:02d}:{int(minutos) % 60:02d}"
+    minutos = np.asarray(minutos, dtype=np.int64)
+    horas = np.char.zfill((minutos // 60).astype(str), 2)
+    return np.char.add(np.char.add(horas, ":"), np.char.zfill((minutos % 60).astype(str), 2)).tolist()
+
+
+class GrillaHoraria:
+    """Slots de duración fija, representados por su minuto de inicio desde las 00:00"""
+
+    def __init__(self, minutos, paso=None):
+        self.minutos = np.asarray(minutos, dtype=np.int64)
+        pasos = np.unique(np.diff(self.minutos))
+        if len(pasos) > 1 or (len(pasos) == 1 and pasos[0] <= 0):
+            raise ValueError("Los horarios deben estar ordenados y equiespaciados")
+        self.paso = int(pasos[0]) if len(pasos) else (paso or 15)
+
+    @classmethod
+    def desde_minutos(cls, minuto_inicio, minuto_fin, paso=15):
+        """Grilla desde minuto_inicio hasta minuto_fin inclusive, cada paso minutos"""
+        return cls(np.arange(minuto_inicio, minuto_fin + 1, paso), paso)
+
+    @classmethod
+    def desde_horas(cls, hora_inicio=8, hora_fin=16, paso=15):
+        """Grilla desde hora_inicio hasta hora_fin inclusive, cada paso minutos"""
+        return cls.desde_minutos(hora_inicio * 60, hora_fin * 60, paso)
+
+    @classmethod
+    def desde_horarios(cls, horarios):
+        """Grilla a partir de una lista de horas en texto, normalizando formatos como "8:00\""""
+        return cls([convertir_hora_a_minutos(h) for h in horarios])
+
+    @property
+    def num_slots(self):
+        return len(self.minutos)
+
+    def indice(self, hora):
+        """Índice del slot que empieza a la hora dada, o -1 si no pertenece a la grilla (O(1))"""
+        desplazamiento = convertir_hora_a_minutos(hora) - int(self.minutos[0]) if self.num_slots else -1
+        if desplazamiento < 0 or desplazamiento % self.paso:
+            return -1
+        t = desplazamiento // self.paso
+        return t if t < self.num_slots else -1
+
+    def disponibles(self, horas):
+        """Máscara booleana de los slots cuya hora de inicio figura en horas"""
+        mascara = np.zeros(self.num_slots, dtype=bool)
+        indices = np.array([self.indice(h) for h in horas], dtype=np.int64)
+        mascara[indices[indices >= 0]] = True
+        return mascara
+
+    def slots_necesarios(self, duracion):
+        """Cantidad de slots que ocupa un turno de duracion minutos (redondeando hacia arriba)"""
+        # Un turno de 20 minutos en una grilla de 15 ocupa 2 slots: el siguiente turno empieza en el minuto 30
+        return max(1, -(-duracion // self.paso))
+
+    def indices_de_inicio(self, inicio, fin, duracion):
+        """Índices de los slots en los que un turno de duracion minutos entra completo entre inicio y fin"""
+        minutos_inicio = convertir_hora_a_minutos(inicio)
+        ultimo_inicio = convertir_hora_a_minutos(fin) - duracion
+        return np.flatnonzero((self.minutos >= minutos_inicio) & (self.minutos <= ultimo_inicio))
+
+    def inicios_disponibles(self, mascara, duracion):
+        """Índices t tales que los slots t .. t+k-1 del turno están todos disponibles en la máscara"""
+        k = self.slots_necesarios(duracion)
+        if k > self.num_slots:
+            return np.zeros(0, dtype=np.int64)
+        acumulado = np.concatenate(([0], np.cumsum(mascara, dtype=np.int64)))
+        return np.flatnonzero(acumulado[k:] - acumulado[:-k] == k)
+
+    def turnos_activos(self, indices, duracion):
+        """Cantidad de turnos de duracion minutos, con inicio en los slots indicados, en curso en cada slot"""
+        inicios = np.zeros(self.num_slots, dtype=np.int64)
+        np.add.at(inicios, np.asarray(indices, dtype=np.int64), 1)
+        return np.convolve(inicios, np.ones(self.slots_necesarios(duracion), dtype=np.int64))[:self.num_slots]
+
+    def turnos_disjuntos(self, indices, duracion):
+        """Inicios de un máximo de turnos sin superposición, empaquetados desde el primer inicio"""
+        k = self.slots_necesarios(duracion)
+        elegidos = []
+        proximo_libre = 0
+        for t in sorted(np.asarray(indices).tolist()):
+            if t >= proximo_libre:
+                elegidos.append(t)
+                proximo_libre = t + k
+        return elegidos
+
+    def etiquetas(self, indices=None):
+        """Horas de inicio de los slots (todos o los indicados) en formato HH:MM"""
+        return formatear_minutos(self.minutos if indices is None else self.minutos[indices])
+
+
+def formulacion_recomendada(grilla):
+    """Formulación por defecto de los modelos según el paso de la grilla"""
+    # Con pasos finos cada turno ocupa muchos slots y las filas de cobertura se llenan de no ceros;
+    # la formulación agregada usa 2 no ceros por turno y por fila sin importar la duración
+    return "agregada" if grilla.paso < 15 else "cobertura"
+
+def como_grilla(horarios):
+    """Acepta una GrillaHoraria o una lista de horas en texto y devuelve la grilla"""
+    return horarios if isinstance(horarios, GrillaHoraria) else GrillaHoraria.desde_horarios(horarios)
+
+def generar_horarios(hora_inicio=8, hora_fin=16, intervalo_minutos=15):
+    """Genera una lista de horarios posibles en el formato HH:MM"""
+    return GrillaHoraria.desde_horas(hora_inicio, hora_fin, intervalo_minutos).etiquetas()
+
+def horarios_de_servicios(servicios, intervalo_minutos=15):
+    """Horarios en formato HH:MM que cubren desde el primer inicio hasta el último fin de los servicios"""
+    if not servicios:
+        return generar_horarios(intervalo_minutos=intervalo_minutos)
+    inicio = min(convertir_hora_a_minutos(s["hora_inicio"]) for s in servicios)
+    fin = max(convertir_hora_a_minutos(s["hora_fin"]) for s in servicios)
+    # La grilla se alinea a la hora en punto para que los horarios de todos los servicios caigan en ella
+    inicio -= inicio % 60
+    return GrillaHoraria.desde_minutos(inicio, fin, intervalo_minutos).etiquetas()
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from optimizacion.catalogos import servicios_predefinidos
+from optimizacion.horarios import convertir_hora_a_minutos
+from optimizacion.modelo2 import JORNADA
+
+# Instancias sintéticas de un día de atención, reproducibles con una semilla, para medir el rendimiento
+# de los modelos sin cargar pacientes a mano. Los servicios salen de los catálogos de las páginas y los
+# pacientes se generan como tabla, con las columnas que esperan los modelos 1, 3, 4 y 5.
+
+# Proporción de pacientes de cada prioridad
+MEZCLA_PRIORIDADES = {"Alta": 0.2, "Media": 0.5, "Baja": 0.3}
+
+# Distribuciones de la distancia en km: cada una recibe el generador, la cantidad y la escala (la mediana)
+DISTRIBUCIONES_DISTANCIA = {
+    # La mayoría vive cerca y unos pocos a decenas de km
+    "lognormal": lambda rng, n, escala: rng.lognormal(np.log(escala), 0.8, n),
+    "exponencial": lambda rng, n, escala: rng.exponential(escala / np.log(2), n),
+    "uniforme": lambda rng, n, escala: rng.uniform(0, 2 * escala, n),
+}
+
+DISTANCIA_MAXIMA = 200
+
+NOMBRES = ["María", "José", "Ana", "Juan", "Carmen", "Luis", "Laura", "Carlos", "Rosa", "Jorge",
+           "Lucía", "Miguel", "Elena", "Pedro", "Sofía", "Diego", "Marta", "Pablo", "Silvia", "Raúl"]
+APELLIDOS = ["González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez", "Pérez", "García", "Sánchez",
+             "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez", "Flores", "Benítez", "Acosta", "Medina"]
+
+
+def capacidad_servicios(servicios):
+    """Turnos que ofrece cada servicio en el día, sumando los horarios con el mismo nombre"""
+    capacidad = {}
+    for servicio in servicios:
+        minutos = convertir_hora_a_minutos(servicio["hora_fin"]) - convertir_hora_a_minutos(servicio["hora_inicio"])
+        capacidad[servicio["nombre"]] = capacidad.get(servicio["nombre"], 0) + max(minutos // servicio["tiempo_atencion"], 0)
+    return capacidad
+
+def generar_pacientes(num_pacientes, servicios=servicios_predefinidos, semilla=0, mezcla_prioridades=MEZCLA_PRIORIDADES,
+                      distribucion_distancia="lognormal", distancia_mediana=8, servicios_por_paciente=(1, 1)):
+    """Pacientes de un día como DataFrame con las columnas de los modelos 1, 3, 4 y 5"""
+    # Cada paciente pide entre servicios_por_paciente[0] y [1] servicios distintos; los servicios con más
+    # turnos en el día son los más pedidos. servicio_requerido (modelo 1) es el primero de la lista
+    if distribucion_distancia not in DISTRIBUCIONES_DISTANCIA:
+        raise ValueError(f"Distribución de distancia desconocida: {distribucion_distancia}")
+    rng = np.random.default_rng(semilla)
+
+    capacidad = capacidad_servicios(servicios)
+    nombres_servicios = np.array(list(capacidad), dtype=object)
+    demanda = np.array(list(capacidad.values()), dtype=float) + 1
+    minimo, maximo = servicios_por_paciente
+    maximo = min(maximo, len(nombres_servicios))
+    minimo = min(minimo, maximo)
+
+    # Orden aleatorio ponderado por capacidad (claves de Efraimidis-Spirakis): los primeros k servicios
+    # de cada fila son una muestra sin reemplazo
+    claves = rng.random((num_pacientes, len(nombres_servicios))) ** (1 / demanda)
+    orden = np.argsort(-claves, axis=1)
+    cantidades = rng.integers(minimo, maximo + 1, num_pacientes)
+    servicios_requeridos = [nombres_servicios[fila[:k]].tolist() for fila, k in zip(orden, cantidades)]
+
+    prioridades = np.array(list(mezcla_prioridades), dtype=object)
+    probabilidades = np.array(list(mezcla_prioridades.values()), dtype=float)
+    distancia = DISTRIBUCIONES_DISTANCIA[distribucion_distancia](rng, num_pacientes, distancia_mediana)
+
+    return pd.DataFrame({
+        "id": np.arange(num_pacientes),
+        "nombre": [f"{NOMBRES[n]} {APELLIDOS[a]} {APELLIDOS[b]}"
+                   for n, a, b in rng.integers(0, [len(NOMBRES), len(APELLIDOS), len(APELLIDOS)], (num_pacientes, 3))],
+        "servicio_requerido": [requeridos[0] if requeridos else None for requeridos in servicios_requeridos],
+        "servicios_requeridos": servicios_requeridos,
+        "prioridad": prioridades[rng.choice(len(prioridades), num_pacientes, p=probabilidades / probabilidades.sum())],
+        "distancia": np.clip(np.rint(distancia), 0, DISTANCIA_MAXIMA).astype(np.int64),
+    })
+
+def especialistas_modelo3(servicios, horarios):
+    """Un especialista del modelo 3 por horario del catálogo, con los slots de la grilla dentro de ese horario"""
+    minutos = [convertir_hora_a_minutos(h) for h in horarios]
+    especialistas = []
+    for servicio in servicios:
+        desde, hasta = convertir_hora_a_minutos(servicio["hora_inicio"]), convertir_hora_a_minutos(servicio["hora_fin"])
+        especialistas.append({
+            "especialidad": servicio["nombre"],
+            "tiempo_atencion": servicio["tiempo_atencion"],
+            "horarios_disponibles": [h for h, m in zip(horarios, minutos) if desde <= m < hasta],
+        })
+    return especialistas
+
+def instancia_modelo2(servicios, pacientes):
+    """Especialistas y pacientes con el formato de la página 2, a partir del catálogo y de generar_pacientes"""
+    # La página 2 mide los minutos desde las 08:00 y usa prioridades numéricas
+    apertura = 8 * 60
+    especialistas = [{
+        "id": i + 1,
+        "especialidad": servicio["nombre"],
+        "disponibilidad": [(max(convertir_hora_a_minutos(servicio["hora_inicio"]) - apertura, JORNADA[0]),
+                            min(convertir_hora_a_minutos(servicio["hora_fin"]) - apertura, JORNADA[1]))],
+        "ocupado": [],
+        "duracion": servicio["tiempo_atencion"],
+    } for i, servicio in enumerate(servicios)]
+    valores = {"Alta": 3, "Media": 2, "Baja": 1}
+    pacientes_modelo2 = [{
+        "prioridad": valores[fila.prioridad],
+        "distancia": fila.distancia,
+        "especialidad": fila.servicio_requerido,
+        "datos": fila.nombre,
+    } for fila in pacientes.itertuples(index=False)]
+    return especialistas, pacientes_modelo2
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+from optimizacion.horarios import como_grilla, formatear_minutos, formulacion_recomendada
+from optimizacion.modelo_lineal import ModeloLineal
+from optimizacion.pacientes import filas_por_valor, pesos_pacientes, tabla_pacientes
+from optimizacion.rendimiento import medir, tamano_modelo
+from optimizacion.resolutores import resolver, resumen_solucion
+
+# Formulaciones disponibles para evitar superposiciones dentro de un servicio:
+# - "cobertura": a lo sumo un turno del servicio activo en cada slot, O(S·H) filas con O(k·P) no ceros cada una
+# - "agregada": igual que "cobertura" pero sobre inicios acumulados, O(S·H) filas con 2 no ceros cada una
+#   más una igualdad por slot con inicios; el tamaño crece linealmente con la cantidad de slots
+# - "pares": una fila por cada par de pacientes y slots solapados, O(S·H·k·P²) filas
+FORMULACIONES = ("cobertura", "agregada", "pares")
+
+COLUMNAS_PACIENTES = ["nombre", "servicio_requerido", "prioridad", "distancia"]
+
+
+def construir_modelo(servicios, pacientes, horarios_disponibles, formulacion="cobertura"):
+    """Construye el ModeloLineal del problema sin resolverlo"""
+    if formulacion not in FORMULACIONES:
+        raise ValueError(f"Formulación desconocida: {formulacion}")
+
+    # Crear el problema de optimización
+    modelo = ModeloLineal("Optimizacion_Turnos_Medicos")
+
+    # Solo se consideran los slots en los que el turno completo entra en el horario del servicio
+    grilla = como_grilla(horarios_disponibles)
+    inicios = [grilla.indices_de_inicio(servicio["hora_inicio"], servicio["hora_fin"], servicio["tiempo_atencion"]).tolist()
+               for servicio in servicios]
+
+    # Función objetivo: maximizar la suma de prioridades atendidas y minimizar las distancias.
+    # Los pesos se calculan una vez por paciente sobre la tabla
+    pacientes = tabla_pacientes(pacientes, COLUMNAS_PACIENTES)
+    pesos = pesos_pacientes(pacientes)
+
+    # Pacientes que requieren cada servicio, agrupados por código categórico
+    filas_por_servicio = filas_por_valor(pacientes["servicio_requerido"], [servicio["nombre"] for servicio in servicios])
+
+    # Crear variables de decisión: x[s, p, t] = 1 si el servicio s atiende al paciente p desde el slot t,
+    # solo para los servicios que coinciden con el requerido por el paciente
+    turnos_por_paciente = {}
+    turnos_por_inicio = {}
+    for s in range(len(servicios)):
+        filas = filas_por_servicio[servicios[s]["nombre"]]
+        if len(filas) == 0 or not inicios[s]:
+            continue
+        # Bloque de variables del servicio, paciente por paciente: índices[i, k] es x[s, filas[i], inicios[s][k]]
+        indices = modelo.agregar_variables([(s, p, t) for p in filas.tolist() for t in inicios[s]],
+                                           np.repeat(pesos[filas], len(inicios[s]))).reshape(len(filas), len(inicios[s]))
+        for p, turnos in zip(filas.tolist(), indices.tolist()):
+            turnos_por_paciente.setdefault(p, []).extend(turnos)
+        for t, turnos in zip(inicios[s], indices.T.tolist()):
+            turnos_por_inicio.setdefault((s, t), []).extend(turnos)
+
+    # Restricciones
+
+    # 1. Un paciente solo puede ser atendido una vez
+    for turnos in turnos_por_paciente.values():
+        modelo.agregar_fila(turnos)
+
+    # 2. Un servicio solo puede atender a un paciente a la vez, considerando el tiempo de atención
+    if formulacion == "cobertura":
+        _agregar_cobertura(modelo, turnos_por_inicio, servicios, grilla)
+    elif formulacion == "agregada":
+        _agregar_agregada(modelo, turnos_por_inicio, servicios, grilla)
+    else:
+        _agregar_pares(modelo, turnos_por_inicio, servicios, grilla)
+
+    return modelo
+
+def _agregar_cobertura(modelo, turnos_por_inicio, servicios, grilla):
+    """A lo sumo un turno del servicio s activo en cada slot de la grilla"""
+    for s in range(len(servicios)):
+        slots_necesarios = grilla.slots_necesarios(servicios[s]["tiempo_atencion"])
+
+        for t in range(grilla.num_slots):
+            # Un turno que empieza en h sigue activo en t si h está entre t-slots_necesarios+1 y t
+            modelo.agregar_fila([j
+                                 for h in range(max(0, t - slots_necesarios + 1), t + 1)
+                                 for j in turnos_por_inicio.get((s, h), [])])
+
+def _agregar_agregada(modelo, turnos_por_inicio, servicios, grilla):
+    """A lo sumo un turno del servicio s activo en cada slot, contando inicios acumulados"""
+    for s in range(len(servicios)):
+        # z[s, t] = turnos del servicio s que empezaron hasta t; los activos en t son z[s, t] - z[s, t-k]
+        inicios_por_slot = {t: turnos_por_inicio[(s, t)] for t in range(grilla.num_slots) if (s, t) in turnos_por_inicio}
+        acumulado = modelo.agregar_acumulado(("inicios", s), inicios_por_slot, grilla.num_slots)
+        modelo.agregar_ocupacion([(acumulado, grilla.slots_necesarios(servicios[s]["tiempo_atencion"]))], grilla.num_slots)
+
+def _agregar_pares(modelo, turnos_por_inicio, servicios, grilla):
+    """Formulación original por pares de pacientes, conservada para comparar resultados"""
+    # Un servicio solo puede atender a un paciente en un horario específico
+    for turnos in turnos_por_inicio.values():
+        modelo.agregar_fila(turnos)
+
+    # Considerar tiempo de atención (evitar superposiciones)
+    for s in range(len(servicios)):
+        tiempo_atencion = servicios[s]["tiempo_atencion"]  # en minutos
+        slots_necesarios = grilla.slots_necesarios(tiempo_atencion)
+
+        for h in range(grilla.num_slots):
+            # Para cada horario asignado, bloquear los siguientes 'slots_necesarios-1' slots
+            for overlap in range(1, slots_necesarios):
+                if h + overlap < grilla.num_slots:
+                    h_overlap = h + overlap
+                    # Si se asigna un turno en h, no puede haber otro en h_overlap para el mismo servicio
+                    for j in turnos_por_inicio.get((s, h), []):
+                        for j_overlap in turnos_por_inicio.get((s, h_overlap), []):
+                            modelo.agregar_fila([j, j_overlap])
+
+def es_instancia_simple(servicios, pacientes):
+    """Indica si cada paciente requiere un único servicio, caso que admite la ruta rápida"""
+    return all(isinstance(servicio, str) for servicio in tabla_pacientes(pacientes, COLUMNAS_PACIENTES)["servicio_requerido"])
+
+def optimizar_por_orden(servicios, pacientes, horarios_disponibles):
+    """Resuelve de forma exacta una instancia simple ordenando pacientes, sin MIP"""
+    # Cada servicio es un recurso independiente con turnos de duración fija, por lo que el
+    # óptimo consiste en llenar la capacidad de cada servicio con sus pacientes de mayor peso
+    # Turnos disjuntos de cada servicio, empaquetados desde el primer inicio válido
+    grilla = como_grilla(horarios_disponibles)
+    turnos_por_nombre = {}
+    for s in range(len(servicios)):
+        slots_necesarios = grilla.slots_necesarios(servicios[s]["tiempo_atencion"])
+        proximo_libre = 0
+        for t in grilla.indices_de_inicio(servicios[s]["hora_inicio"], servicios[s]["hora_fin"], servicios[s]["tiempo_atencion"]).tolist():
+            if t >= proximo_libre:
+                turnos_por_nombre.setdefault(servicios[s]["nombre"], []).append((t, s))
+                proximo_libre = t + slots_necesarios
+
+    # Pacientes de cada servicio ordenados por peso, descartando los de peso negativo
+    pacientes = tabla_pacientes(pacientes, COLUMNAS_PACIENTES)
+    pesos = pesos_pacientes(pacientes)
+    orden = np.argsort(-pesos, kind="stable")
+    orden = orden[pesos[orden] >= 0]
+    pacientes_por_nombre = {nombre: orden[filas].tolist() for nombre, filas in
+                            filas_por_valor(pacientes["servicio_requerido"].to_numpy()[orden], list(turnos_por_nombre)).items()}
+
+    asignaciones = []
+    for nombre, turnos in turnos_por_nombre.items():
+        for (t, s), p in zip(sorted(turnos), pacientes_por_nombre.get(nombre, [])):
+            asignaciones.append((s, p, t))
+
+    # Mismo orden de filas que la extracción del MIP
+    resultado = _armar_resultado(servicios, pacientes, sorted(asignaciones), grilla)
+    objetivo = float(sum(pesos[p] for _, p, _ in asignaciones))
+    resultado.attrs["solucion"] = {"estado": "optimo", "objetivo": objetivo, "cota": objetivo, "gap": 0.0}
+    return resultado
+
+def _armar_resultado(servicios, pacientes, asignaciones, grilla):
+    """Convierte una lista de (s, p, t) en el DataFrame de turnos asignados, columna por columna"""
+    if not asignaciones:
+        return pd.DataFrame()
+    s, p, t = (np.array(columna) for columna in zip(*asignaciones))
+    pacientes = tabla_pacientes(pacientes, COLUMNAS_PACIENTES)
+    minuto_inicio = grilla.minutos[t]
+    tiempos = np.array([servicio["tiempo_atencion"] for servicio in servicios], dtype=np.int64)
+    nombres = np.array([servicio["nombre"] for servicio in servicios], dtype=object)
+    lugares = np.array([servicio["lugar"] for servicio in servicios], dtype=object)
+    return pd.DataFrame({
+        "ID_Servicio": s,
+        "Servicio": nombres[s],
+        "ID_Paciente": p,
+        "Nombre_Paciente": pacientes["nombre"].to_numpy()[p],
+        "Prioridad": pacientes["prioridad"].to_numpy()[p],
+        "Distancia": pacientes["distancia"].to_numpy()[p],
+        "Lugar_Atencion": lugares[s],
+        "Hora_Inicio": formatear_minutos(minuto_inicio),
+        # Calcular hora de fin según tiempo de atención
+        "Hora_Fin": formatear_minutos(minuto_inicio + tiempos[s]),
+    })
+
+def optimizar_turnos(servicios, pacientes, horarios_disponibles, formulacion=None, ruta_rapida=True, resolutor="cbc", **opciones_resolutor):
+    """Optimiza la asignación de turnos utilizando Programación Lineal Entera"""
+    grilla = como_grilla(horarios_disponibles)
+    formulacion = formulacion or formulacion_recomendada(grilla)
+
+    # Las instancias simples se resuelven por ordenamiento; el MIP queda como alternativa general
+    if ruta_rapida and es_instancia_simple(servicios, pacientes):
+        tiempos = {}
+        with medir(tiempos, "ordenamiento"):
+            resultado = optimizar_por_orden(servicios, pacientes, grilla)
+        resultado.attrs["tiempos"] = tiempos
+        return resultado
+
+    tiempos = {}
+    with medir(tiempos, "construccion"):
+        modelo = construir_modelo(servicios, pacientes, grilla, formulacion)
+
+    # Resolver el problema
+    with medir(tiempos, "resolucion"):
+        solucion = resolver(modelo, resolutor, **opciones_resolutor)
+
+    # Verificar si se encontró una solución; al alcanzar el límite de tiempo se usa el mejor incumbente
+    if solucion["estado"] not in ("optimo", "factible"):
+        return None
+
+    # Extraer la solución: solo las variables activas, en una pasada sobre el vector de valores
+    with medir(tiempos, "extraccion"):
+        resultado = _armar_resultado(servicios, pacientes, modelo.claves_activas(solucion["valores"]), grilla)
+    resultado.attrs["solucion"] = resumen_solucion(solucion)
+    resultado.attrs["tiempos"] = tiempos
+    # Subfases de la resolución (traducción, resolutor, lectura) y tamaño del modelo resuelto
+    resultado.attrs["tiempos_resolucion"] = solucion["tiempos"]
+    resultado.attrs["tamano"] = tamano_modelo(modelo)
+    return resultado
@@ -0,0 +1,239 @@
+import heapq
+from bisect import bisect_right
+from collections import deque
+
+# Motor de la página 2: asignación voraz de pacientes (por prioridad y distancia) al primer
+# especialista de su especialidad con lugar, en el primer minuto con algún consultorio libre.
+# Los tiempos son minutos enteros relativos a la apertura (0 = 08:00).
+
+NUM_CONSULTORIOS = 2
+JORNADA = (0, 480)  # 08:00 - 16:00
+
+
+class HuecosLibres:
+    """Intervalos libres [inicio, fin) de un recurso, ordenados y disjuntos, con búsquedas por bisección"""
+
+    def __init__(self, intervalos=((float("-inf"), float("inf")),)):
+        intervalos = sorted((inicio, fin) for inicio, fin in intervalos if inicio < fin)
+        self.inicios = [inicio for inicio, _ in intervalos]
+        self.fines = [fin for _, fin in intervalos]
+
+    def primer_inicio(self, desde, hasta, duracion):
+        """Menor t >= desde con [t, t + duracion) libre y t + duracion <= hasta, o None"""
+        # Se parte del hueco que contiene a desde (o el siguiente) y se salta de hueco en hueco
+        i = bisect_right(self.inicios, desde) - 1
+        if i < 0 or self.fines[i] <= desde:
+            i += 1
+        while i < len(self.inicios):
+            t = max(self.inicios[i], desde)
+            if t + duracion > hasta:
+                return None
+            if self.fines[i] - t >= duracion:
+                return t
+            i += 1
+        return None
+
+    def esta_libre(self, inicio, fin):
+        """Indica si [inicio, fin) está contenido en un único hueco libre"""
+        i = bisect_right(self.inicios, inicio) - 1
+        return i >= 0 and self.fines[i] >= fin
+
+    def reservar(self, inicio, fin):
+        """Marca [inicio, fin) como ocupado; debe estar libre"""
+        i = bisect_right(self.inicios, inicio) - 1
+        hueco_inicio, hueco_fin = self.inicios[i], self.fines[i]
+        del self.inicios[i], self.fines[i]
+        # Se conservan los restos no vacíos del hueco a cada lado de la reserva
+        if fin < hueco_fin:
+            self.inicios.insert(i, fin)
+            self.fines.insert(i, hueco_fin)
+        if hueco_inicio < inicio:
+            self.inicios.insert(i, hueco_inicio)
+            self.fines.insert(i, inicio)
+
+
+def _primer_turno(agenda, consultorios, desde, hasta, duracion):
+    """Primer minuto en [desde, hasta - duracion] con el especialista y algún consultorio libres"""
+    # Devuelve (minuto, índice del consultorio de menor índice libre en ese minuto) o None.
+    # Se alternan las búsquedas: cada una avanza t hasta el próximo hueco del otro recurso
+    t = agenda.primer_inicio(desde, hasta, duracion)
+    while t is not None:
+        # Caso habitual: algún consultorio ya está libre en t
+        for c, consultorio in enumerate(consultorios):
+            if consultorio.esta_libre(t, t + duracion):
+                return t, c
+        candidatos = [c.primer_inicio(t, hasta, duracion) for c in consultorios]
+        t_consultorio = min((c for c in candidatos if c is not None), default=None)
+        if t_consultorio is None:
+            return None
+        if agenda.esta_libre(t_consultorio, t_consultorio + duracion):
+            return t_consultorio, candidatos.index(t_consultorio)
+        t = agenda.primer_inicio(t_consultorio, hasta, duracion)
+    return None
+
+def crear_consultorios(cantidad=NUM_CONSULTORIOS, inicio=JORNADA[0], fin=JORNADA[1]):
+    """Consultorios con el mismo horario de atención, con el formato de los especialistas"""
+    return [{'disponibilidad': [(inicio, fin)], 'ocupado': []} for _ in range(cantidad)]
+
+def _agenda(recurso, libre=((float("-inf"), float("inf")),)):
+    """Huecos libres de un especialista o consultorio, descontando sus reservas previas en 'ocupado'"""
+    agenda = HuecosLibres(libre)
+    for inicio, fin in sorted(recurso.get('ocupado', [])):
+        agenda.reservar(inicio, fin)
+    return agenda
+
+def _preparar(especialistas, consultorios):
+    """Agendas de especialistas y consultorios e índice especialidad -> especialistas en orden de registro"""
+    # Los especialistas quedan acotados por sus ventanas de disponibilidad al buscar; los consultorios,
+    # por su horario de atención
+    consultorios = crear_consultorios() if consultorios is None else consultorios
+    agendas = [_agenda(especialista) for especialista in especialistas]
+    agendas_consultorios = [_agenda(consultorio, consultorio['disponibilidad']) for consultorio in consultorios]
+    por_especialidad = {}
+    for e, especialista in enumerate(especialistas):
+        por_especialidad.setdefault(especialista['especialidad'], []).append(e)
+    return agendas, agendas_consultorios, por_especialidad
+
+def asignar_primer_turno(especialistas, pacientes, consultorios=None):
+    """Asigna a cada paciente el primer turno libre de un especialista de su especialidad"""
+    # Cada paciente, en orden de prioridad y distancia, recibe el primer especialista (en orden de
+    # registro) que tenga algún turno, en su minuto más temprano y en el consultorio libre de menor índice.
+    # Las reservas previas en 'ocupado' se respetan y no se modifican
+    agendas, consultorios, por_especialidad = _preparar(especialistas, consultorios)
+    # Las reservas solo se agregan, así que el primer turno posible de cada ventana de disponibilidad
+    # nunca retrocede: la búsqueda siguiente parte de él (None si la ventana ya no admite turnos)
+    proximo = [[inicio for inicio, _ in especialista['disponibilidad']] for especialista in especialistas]
+
+    asignaciones = []
+    no_asignados = []
+    for paciente in sorted(pacientes, key=lambda x: (-x['prioridad'], x['distancia'])):
+        turno = None
+        for e in por_especialidad.get(paciente['especialidad'], []):
+            especialista = especialistas[e]
+            duracion = especialista['duracion']
+            for v, (_, disp_fin) in enumerate(especialista['disponibilidad']):
+                if proximo[e][v] is None:
+                    continue
+                encontrado = _primer_turno(agendas[e], consultorios, proximo[e][v], disp_fin, duracion)
+                proximo[e][v] = None if encontrado is None else encontrado[0]
+                if encontrado is not None:
+                    turno = (e, *encontrado, duracion)
+                    break
+            if turno is not None:
+                break
+
+        if turno is None:
+            no_asignados.append(paciente)
+            continue
+
+        e, inicio, c, duracion = turno
+        agendas[e].reservar(inicio, inicio + duracion)
+        consultorios[c].reservar(inicio, inicio + duracion)
+        asignaciones.append({
+            'paciente': paciente,
+            'especialista': e,
+            'consultorio': c,
+            'inicio': inicio,
+            'fin': inicio + duracion,
+        })
+
+    return asignaciones, no_asignados
+
+
+def _mejor_opcion(agenda, consultorios, especialista, proximo):
+    """Turno libre de menor fin del especialista entre sus ventanas: (fin, inicio, consultorio) o None"""
+    mejor = None
+    for v, (_, disp_fin) in enumerate(especialista['disponibilidad']):
+        if proximo[v] is None:
+            continue
+        encontrado = _primer_turno(agenda, consultorios, proximo[v], disp_fin, especialista['duracion'])
+        proximo[v] = None if encontrado is None else encontrado[0]
+        if encontrado is not None:
+            opcion = (encontrado[0] + especialista['duracion'], *encontrado)
+            mejor = opcion if mejor is None else min(mejor, opcion)
+    return mejor
+
+def asignar_por_arrepentimiento(especialistas, pacientes, consultorios=None):
+    """Asigna turnos por inserción con arrepentimiento: primero donde postergar cuesta más"""
+    # El costo de insertar un paciente en un especialista es el fin de su primer turno libre, que solo
+    # depende del especialista; por eso la mejor y la segunda mejor opción son comunes a toda la
+    # especialidad. El montículo guarda una entrada por especialidad con su paciente más prioritario y
+    # su arrepentimiento (segunda opción - primera, infinito si queda una sola); cada reserva solo
+    # recalcula las opciones que pisa y las entradas viejas se descartan al salir (versión)
+    agendas, consultorios, por_especialidad = _preparar(especialistas, consultorios)
+    proximo = [[inicio for inicio, _ in especialista['disponibilidad']] for especialista in especialistas]
+
+    en_espera = {}
+    for paciente in sorted(pacientes, key=lambda x: (-x['prioridad'], x['distancia'])):
+        en_espera.setdefault(paciente['especialidad'], deque()).append(paciente)
+
+    opciones = [_mejor_opcion(agendas[e], consultorios, especialistas[e], proximo[e]) for e in range(len(especialistas))]
+    por_consultorio = [set() for _ in consultorios]
+    for e, opcion in enumerate(opciones):
+        if opcion is not None:
+            por_consultorio[opcion[2]].add(e)
+
+    version = {especialidad: 0 for especialidad in en_espera}
+    monticulo = []
+
+    def encolar(especialidad):
+        """Registra la entrada vigente de la especialidad en el montículo"""
+        version[especialidad] += 1
+        candidatas = sorted((opciones[e], e) for e in por_especialidad.get(especialidad, [])
+                            if opciones[e] is not None)
+        if not candidatas or not en_espera[especialidad]:
+            return
+        arrepentimiento = candidatas[1][0][0] - candidatas[0][0][0] if len(candidatas) > 1 else float("inf")
+        primero = en_espera[especialidad][0]
+        heapq.heappush(monticulo, (-primero['prioridad'], -arrepentimiento, primero['distancia'],
+                                   version[especialidad], especialidad, candidatas[0][1]))
+
+    for especialidad in en_espera:
+        encolar(especialidad)
+
+    asignaciones = []
+    while monticulo:
+        *_, numero, especialidad, e = heapq.heappop(monticulo)
+        if numero != version[especialidad]:
+            continue
+
+        paciente = en_espera[especialidad].popleft()
+        fin, inicio, c = opciones[e]
+        agendas[e].reservar(inicio, fin)
+        consultorios[c].reservar(inicio, fin)
+        asignaciones.append({'paciente': paciente, 'especialista': e, 'consultorio': c, 'inicio': inicio, 'fin': fin})
+
+        # Solo se recalculan las opciones del especialista usado y las que se superponen en el consultorio
+        tocados = {e} | {j for j in por_consultorio[c] if opciones[j][1] < fin and inicio < opciones[j][0]}
+        for j in tocados:
+            por_consultorio[opciones[j][2]].discard(j)
+            opciones[j] = _mejor_opcion(agendas[j], consultorios, especialistas[j], proximo[j])
+            if opciones[j] is not None:
+                por_consultorio[opciones[j][2]].add(j)
+        for especialidad_tocada in {especialistas[j]['especialidad'] for j in tocados} | {especialidad}:
+            if especialidad_tocada in en_espera:
+                encolar(especialidad_tocada)
+
+    asignados = {id(a['paciente']) for a in asignaciones}
+    no_asignados = [p for p in sorted(pacientes, key=lambda x: (-x['prioridad'], x['distancia'])) if id(p) not in asignados]
+    return asignaciones, no_asignados
+
+
+MOTORES = {
+    "primer_turno": asignar_primer_turno,
+    "arrepentimiento": asignar_por_arrepentimiento,
+}
+
+NOMBRES_MOTORES = {
+    "primer_turno": "Primer turno libre",
+    "arrepentimiento": "Inserción por arrepentimiento",
+}
+
+
+def asignar_turnos(especialistas, pacientes, consultorios=None, motor="primer_turno"):
+    """Asigna turnos con el motor elegido; devuelve (asignaciones, pacientes no asignados)"""
+    # consultorios es una lista de {'disponibilidad': [(inicio, fin)], 'ocupado': [...]};
+    # por defecto, NUM_CONSULTORIOS consultorios abiertos toda la jornada
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor}")
+    return MOTORES[motor](especialistas, pacientes, consultorios)
@@ -0,0 +1,310 @@
+import numpy as np
+import pandas as pd
+
+from optimizacion.estimacion import LIMITES_MODELO, MOTOR_HEURISTICO, cota_por_capacidad, elegir_motor
+from optimizacion.horarios import como_grilla, formatear_minutos, formulacion_recomendada
+from optimizacion.modelo_lineal import ModeloLineal
+from optimizacion.pacientes import pesos_pacientes, tabla_pacientes
+from optimizacion.rendimiento import medir, tamano_modelo
+from optimizacion.resolutores import calcular_gap, resolver, resumen_solucion
+
+# Formulaciones disponibles para evitar choques de especialistas y consultorios:
+# - "cobertura": filas "activo en el slot t" por especialista y por consultorio, O((E+C)·H) filas
+# - "agregada": las mismas filas sobre inicios acumulados, con pocos no ceros por fila; el tamaño
+#   crece linealmente con la cantidad de slots
+# - "pares": una fila por especialista, slot, paciente, consultorio y segundo paciente
+FORMULACIONES = ("cobertura", "agregada", "pares")
+
+COLUMNAS_PACIENTES = ["nombre", "prioridad", "distancia"]
+
+
+def construir_modelo(especialistas, pacientes, consultorios, horarios_disponibles, formulacion="cobertura"):
+    """Construye el ModeloLineal del problema sin resolverlo"""
+    if formulacion not in FORMULACIONES:
+        raise ValueError(f"Formulación desconocida: {formulacion}")
+
+    # Crear el problema de optimización
+    modelo = ModeloLineal("Optimizacion_Turnos_Medicos")
+
+    # Solo se consideran los slots en los que el especialista está disponible durante todo el turno
+    grilla = como_grilla(horarios_disponibles)
+    inicios = [indices.tolist() for indices in _inicios_especialistas(especialistas, grilla)]
+
+    # Función objetivo: maximizar la suma de prioridades atendidas y minimizar las distancias.
+    # Los pesos se calculan una vez por paciente sobre la tabla
+    pesos = pesos_pacientes(tabla_pacientes(pacientes, COLUMNAS_PACIENTES))
+
+    # Crear variables de decisión: x[e, p, c, t] = 1 si el especialista e atiende al paciente p en el consultorio c desde el slot t
+    turnos_por_paciente = {}
+    turnos_por_inicio = {}
+    for e in range(len(especialistas)):
+        # Bloque de variables del especialista: índices[p, c, k] es x[e, p, c, inicios[e][k]]
+        forma = (len(pesos), consultorios, len(inicios[e]))
+        if 0 in forma:
+            continue
+        indices = modelo.agregar_variables([(e, p, c, t) for p in range(forma[0]) for c in range(consultorios) for t in inicios[e]],
+                                           np.repeat(pesos, consultorios * forma[2])).reshape(forma)
+        for p, turnos in enumerate(indices.reshape(forma[0], -1).tolist()):
+            turnos_por_paciente.setdefault(p, []).extend(turnos)
+        consultorio = np.tile(np.arange(consultorios), forma[0]).tolist()
+        for k, t in enumerate(inicios[e]):
+            turnos_por_inicio.setdefault((e, t), []).extend(zip(consultorio, indices[:, :, k].ravel().tolist()))
+
+    # Restricciones
+
+    # 1. Un paciente solo puede ser atendido una vez
+    for turnos in turnos_por_paciente.values():
+        modelo.agregar_fila(turnos)
+
+    # 2. Un especialista y un consultorio solo pueden tener una atención a la vez
+    if formulacion == "cobertura":
+        _agregar_cobertura(modelo, turnos_por_inicio, especialistas, consultorios, grilla)
+    elif formulacion == "agregada":
+        _agregar_agregada(modelo, turnos_por_inicio, especialistas, consultorios, grilla)
+    else:
+        _agregar_pares(modelo, turnos_por_inicio, especialistas, consultorios, grilla)
+
+    return modelo
+
+def _agregar_cobertura(modelo, turnos_por_inicio, especialistas, consultorios, grilla):
+    """A lo sumo un turno activo por especialista y por consultorio en cada slot"""
+    for t in range(grilla.num_slots):
+        turnos_por_consultorio = {}
+
+        # Especialista e ocupado en el slot t, en cualquier consultorio
+        for e in range(len(especialistas)):
+            slots_necesarios = grilla.slots_necesarios(especialistas[e]["tiempo_atencion"])
+            terminos = []
+            for h in range(max(0, t - slots_necesarios + 1), t + 1):
+                for c, j in turnos_por_inicio.get((e, h), []):
+                    terminos.append(j)
+                    turnos_por_consultorio.setdefault(c, []).append(j)
+            modelo.agregar_fila(terminos)
+
+        # Consultorio c ocupado en el slot t, con cualquier especialista
+        for c in range(consultorios):
+            modelo.agregar_fila(turnos_por_consultorio.get(c, []))
+
+def _agregar_agregada(modelo, turnos_por_inicio, especialistas, consultorios, grilla):
+    """A lo sumo un turno activo por especialista y por consultorio en cada slot, contando inicios acumulados"""
+    # Inicios de cada consultorio agrupados por duración del turno en slots
+    inicios_por_consultorio = {}
+    for e in range(len(especialistas)):
+        slots_necesarios = grilla.slots_necesarios(especialistas[e]["tiempo_atencion"])
+        inicios_por_slot = {}
+        for t in range(grilla.num_slots):
+            for c, j in turnos_por_inicio.get((e, t), []):
+                inicios_por_slot.setdefault(t, []).append(j)
+                inicios_por_consultorio.setdefault((c, slots_necesarios), {}).setdefault(t, []).append(j)
+
+        # Especialista e ocupado en el slot t, en cualquier consultorio
+        acumulado = modelo.agregar_acumulado(("especialista", e), inicios_por_slot, grilla.num_slots)
+        modelo.agregar_ocupacion([(acumulado, slots_necesarios)], grilla.num_slots)
+
+    # Consultorio c ocupado en el slot t, con cualquier especialista
+    for c in range(consultorios):
+        acumulados = [(modelo.agregar_acumulado(("consultorio", c, k), inicios, grilla.num_slots), k)
+                      for (c2, k), inicios in inicios_por_consultorio.items() if c2 == c]
+        modelo.agregar_ocupacion(acumulados, grilla.num_slots)
+
+def _agregar_pares(modelo, turnos_por_inicio, especialistas, consultorios, grilla):
+    """Formulación original por pares de pacientes, conservada para comparar resultados"""
+    # Un especialista solo puede atender a un paciente en un horario específico
+    for turnos in turnos_por_inicio.values():
+        modelo.agregar_fila([j for c, j in turnos])
+
+    # Un consultorio solo puede tener una atención en un horario específico
+    for c in range(consultorios):
+        for h in range(grilla.num_slots):
+            modelo.agregar_fila([j
+                                 for e in range(len(especialistas))
+                                 for c2, j in turnos_por_inicio.get((e, h), [])
+                                 if c2 == c])
+
+    # Considerar tiempo de atención (evitar superposiciones)
+    for e in range(len(especialistas)):
+        tiempo_atencion = especialistas[e]["tiempo_atencion"]  # en minutos
+        slots_necesarios = grilla.slots_necesarios(tiempo_atencion)
+
+        for h in range(grilla.num_slots):
+            # Para cada horario asignado, bloquear los siguientes 'slots_necesarios-1' slots
+            for overlap in range(1, slots_necesarios):
+                if h + overlap < grilla.num_slots:
+                    h_overlap = h + overlap
+                    # Si se asigna un turno en h, no puede haber otro en h_overlap para el mismo especialista
+                    for c, j in turnos_por_inicio.get((e, h), []):
+                        for c2, j_overlap in turnos_por_inicio.get((e, h_overlap), []):
+                            if c2 == c:
+                                modelo.agregar_fila([j, j_overlap])
+
+def _inicios_especialistas(especialistas, grilla):
+    """Slots en los que cada especialista está disponible durante todo el turno, como en construir_modelo"""
+    return [grilla.inicios_disponibles(grilla.disponibles(especialista["horarios_disponibles"]), especialista["tiempo_atencion"])
+            for especialista in especialistas]
+
+def estimar_tamano(especialistas, pacientes, consultorios, horarios_disponibles, formulacion="cobertura"):
+    """Filas, columnas y no ceros del modelo, calculados sin construirlo (en la agregada, una cota superior)"""
+    if formulacion not in FORMULACIONES:
+        raise ValueError(f"Formulación desconocida: {formulacion}")
+    grilla = como_grilla(horarios_disponibles)
+    inicios = _inicios_especialistas(especialistas, grilla)
+    num_pacientes = len(tabla_pacientes(pacientes, COLUMNAS_PACIENTES))
+    con_turnos = [e for e in range(len(especialistas)) if len(inicios[e])] if num_pacientes and consultorios > 0 else []
+    slots = [grilla.slots_necesarios(especialista["tiempo_atencion"]) for especialista in especialistas]
+    activos = [grilla.turnos_activos(inicios[e], especialistas[e]["tiempo_atencion"]) for e in range(len(especialistas))]
+
+    # Variables: un turno por especialista, paciente, consultorio e inicio posible.
+    # 1. Una fila por paciente con todos sus turnos
+    turnos_por_paciente = consultorios * sum(len(inicios[e]) for e in con_turnos)
+    columnas = num_pacientes * turnos_por_paciente
+    filas = num_pacientes if turnos_por_paciente else 0
+    no_ceros = columnas
+    if not con_turnos:
+        return {"filas": filas, "columnas": columnas, "no_ceros": no_ceros}
+
+    # 2. Filas de especialistas y de consultorios
+    ocupados = sum(int((activos[e] > 0).sum()) for e in con_turnos)
+    if formulacion == "cobertura":
+        # Cada turno aparece en la fila de su especialista y en la de su consultorio en cada slot que ocupa
+        en_curso = np.sum([activos[e] for e in con_turnos], axis=0)
+        filas += ocupados + consultorios * int((en_curso > 0).sum())
+        no_ceros += 2 * num_pacientes * consultorios * int(en_curso.sum())
+    elif formulacion == "agregada":
+        # Acumulados de inicios (una variable y una igualdad por slot con inicios) y filas de ocupación
+        for e in con_turnos:
+            columnas += len(inicios[e])
+            filas += len(inicios[e])
+            no_ceros += (num_pacientes * consultorios + 2) * len(inicios[e]) - 1
+        filas += ocupados
+        no_ceros += 2 * ocupados
+        grupos_activos = np.zeros(grilla.num_slots, dtype=np.int64)
+        for k in {slots[e] for e in con_turnos}:
+            grupo = [e for e in con_turnos if slots[e] == k]
+            union = np.unique(np.concatenate([inicios[e] for e in grupo]))
+            columnas += consultorios * len(union)
+            filas += consultorios * len(union)
+            no_ceros += consultorios * (2 * len(union) - 1) + num_pacientes * consultorios * sum(len(inicios[e]) for e in grupo)
+            grupos_activos += grilla.turnos_activos(union, especialistas[grupo[0]]["tiempo_atencion"]) > 0
+        filas += consultorios * int((grupos_activos > 0).sum())
+        no_ceros += consultorios * 2 * int(grupos_activos.sum())
+    else:
+        # Filas por especialista e inicio, por consultorio e inicio, y por pares solapados en un consultorio
+        iniciados = np.zeros(grilla.num_slots, dtype=bool)
+        for e in con_turnos:
+            iniciados[inicios[e]] = True
+        filas += sum(len(inicios[e]) for e in con_turnos) + consultorios * int(iniciados.sum())
+        no_ceros += 2 * columnas
+        for e in con_turnos:
+            marcados = np.zeros(grilla.num_slots, dtype=bool)
+            marcados[inicios[e]] = True
+            pares = consultorios * num_pacientes ** 2 * sum(int((marcados[:grilla.num_slots - o] & marcados[o:]).sum())
+                                                             for o in range(1, min(slots[e], grilla.num_slots)))
+            filas += pares
+            no_ceros += 2 * pares
+
+    return {"filas": int(filas), "columnas": int(columnas), "no_ceros": int(no_ceros)}
+
+def optimizar_por_heuristica(especialistas, pacientes, consultorios, horarios_disponibles):
+    """Programación voraz sin modelo lineal: se arman turnos sin choques y se asignan a los pacientes de mayor peso"""
+    # Cualquier paciente puede ocupar cualquier turno, así que basta armar muchos turnos compatibles:
+    # en cada slot, cada especialista libre toma el primer consultorio libre. La cota superior llena la
+    # mayor cantidad de turnos posible con los pacientes de mayor peso
+    grilla = como_grilla(horarios_disponibles)
+    inicios = _inicios_especialistas(especialistas, grilla)
+    slots = [grilla.slots_necesarios(especialista["tiempo_atencion"]) for especialista in especialistas]
+    pesos = pesos_pacientes(tabla_pacientes(pacientes, COLUMNAS_PACIENTES))
+
+    libre_especialista = [0] * len(especialistas)
+    libre_consultorio = [0] * max(consultorios, 0)
+    posibles = [set(inicios[e].tolist()) for e in range(len(especialistas))]
+    turnos = []
+    for t in range(grilla.num_slots):
+        for e in range(len(especialistas)):
+            if t not in posibles[e] or libre_especialista[e] > t:
+                continue
+            c = next((c for c in range(len(libre_consultorio)) if libre_consultorio[c] <= t), None)
+            if c is None:
+                break
+            turnos.append((e, c, t))
+            libre_especialista[e] = libre_consultorio[c] = t + slots[e]
+
+    orden = np.argsort(-pesos, kind="stable")
+    orden = orden[pesos[orden] >= 0]
+    asignaciones = [(e, p, c, t) for (e, c, t), p in zip(turnos, orden.tolist())]
+    objetivo = float(sum(pesos[p] for _, p, _, _ in asignaciones))
+    # Turnos posibles: los disjuntos de cada especialista y, en cada consultorio, los disjuntos entre
+    # todos los turnos de la grilla (primero los que terminan antes)
+    capacidad = sum(len(grilla.turnos_disjuntos(inicios[e], especialistas[e]["tiempo_atencion"])) for e in range(len(especialistas)))
+    disjuntos, fin = 0, 0
+    for termina, empieza in sorted((t + slots[e], t) for e in range(len(especialistas)) for t in inicios[e].tolist()):
+        if empieza >= fin:
+            disjuntos, fin = disjuntos + 1, termina
+    cota = max(cota_por_capacidad(pesos, min(capacidad, max(consultorios, 0) * disjuntos)), objetivo)
+
+    # Mismo orden de filas que la extracción del MIP
+    resultado = _armar_resultado(especialistas, pacientes, sorted(asignaciones), grilla)
+    resultado.attrs["solucion"] = {"estado": "heuristica", "objetivo": objetivo, "cota": cota, "gap": calcular_gap(objetivo, cota)}
+    return resultado
+
+def _armar_resultado(especialistas, pacientes, asignaciones, grilla):
+    """Convierte una lista de (e, p, c, t) en el DataFrame de turnos asignados, columna por columna"""
+    if not asignaciones:
+        return pd.DataFrame()
+    e, p, c, t = (np.array(columna) for columna in zip(*asignaciones))
+    pacientes = tabla_pacientes(pacientes, COLUMNAS_PACIENTES)
+    minuto_inicio = grilla.minutos[t]
+    tiempos = np.array([especialista["tiempo_atencion"] for especialista in especialistas], dtype=np.int64)
+    especialidades = np.array([especialista["especialidad"] for especialista in especialistas], dtype=object)
+    return pd.DataFrame({
+        "ID_Especialista": e,
+        "Especialidad": especialidades[e],
+        "ID_Paciente": p,
+        "Nombre_Paciente": pacientes["nombre"].to_numpy()[p],
+        "Prioridad": pacientes["prioridad"].to_numpy()[p],
+        "Distancia": pacientes["distancia"].to_numpy()[p],
+        "Consultorio": c + 1,  # Para mostrar consultorios como 1, 2, etc.
+        "Hora_Inicio": formatear_minutos(minuto_inicio),
+        # Calcular hora de fin según tiempo de atención
+        "Hora_Fin": formatear_minutos(minuto_inicio + tiempos[e]),
+    })
+
+def optimizar_turnos(especialistas, pacientes, consultorios, horarios_disponibles, formulacion=None, resolutor="cbc",
+                     limites=LIMITES_MODELO, **opciones_resolutor):
+    """Optimiza la asignación de turnos utilizando Programación Lineal Entera"""
+    grilla = como_grilla(horarios_disponibles)
+    formulacion = formulacion or formulacion_recomendada(grilla)
+    tiempos = {}
+
+    # El tamaño se estima antes de construir: si supera los límites se usa la formulación agregada o la
+    # heurística, y el motivo queda en attrs["estimacion"]. Con limites=None se construye la formulación pedida
+    with medir(tiempos, "estimacion"):
+        estimacion = elegir_motor(lambda f: estimar_tamano(especialistas, pacientes, consultorios, grilla, f), formulacion, limites)
+    if estimacion["motor"] == MOTOR_HEURISTICO:
+        with medir(tiempos, "heuristica"):
+            resultado = optimizar_por_heuristica(especialistas, pacientes, consultorios, grilla)
+        resultado.attrs["tiempos"] = tiempos
+        resultado.attrs["estimacion"] = estimacion
+        return resultado
+    formulacion = estimacion["motor"]
+
+    with medir(tiempos, "construccion"):
+        modelo = construir_modelo(especialistas, pacientes, consultorios, grilla, formulacion)
+
+    # Resolver el problema
+    with medir(tiempos, "resolucion"):
+        solucion = resolver(modelo, resolutor, **opciones_resolutor)
+
+    # Verificar si se encontró una solución; al alcanzar el límite de tiempo se usa el mejor incumbente
+    if solucion["estado"] not in ("optimo", "factible"):
+        return None
+
+    # Extraer la solución
+    with medir(tiempos, "extraccion"):
+        resultado = _armar_resultado(especialistas, pacientes, modelo.claves_activas(solucion["valores"]), grilla)
+    resultado.attrs["solucion"] = resumen_solucion(solucion)
+    resultado.attrs["tiempos"] = tiempos
+    # Subfases de la resolución (traducción, resolutor, lectura) y tamaño del modelo resuelto
+    resultado.attrs["tiempos_resolucion"] = solucion["tiempos"]
+    resultado.attrs["tamano"] = tamano_modelo(modelo)
+    resultado.attrs["estimacion"] = estimacion
+    return resultado
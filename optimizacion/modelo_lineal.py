@@ -0,0 +1,176 @@
+from itertools import chain
+
+import numpy as np
+
+
+class ModeloLineal:
+    """Problema de maximización con variables binarias (y continuas auxiliares) y restricciones lineales"""
+
+    # Las filas de empaquetamiento suma(x[j]) <= cota guardan None como coeficientes;
+    # las demás guardan sus coeficientes y pueden ser igualdades
+
+    def __init__(self, nombre="Optimizacion_Turnos_Medicos"):
+        self.nombre = nombre
+        self.claves = []        # clave de cada variable, por ejemplo (s, p, t)
+        self.objetivo = []      # coeficiente de cada variable en la función objetivo
+        self.continuas = set()  # índices de las variables continuas no negativas (sin cota superior)
+        self.filas = []         # índices de las variables de cada restricción
+        self.coeficientes = []  # coeficientes de cada restricción (None si son todos 1)
+        self.igualdades = []    # True si la restricción es de igualdad
+        self.cotas = []         # lado derecho de cada restricción
+
+    @property
+    def num_variables(self):
+        return len(self.claves)
+
+    @property
+    def num_filas(self):
+        return len(self.filas)
+
+    @property
+    def num_no_ceros(self):
+        return sum(len(columnas) for columnas in self.filas)
+
+    @property
+    def es_empaquetamiento(self):
+        """Indica si todas las filas son suma(x[j]) <= cota sobre variables binarias"""
+        return not self.continuas and all(c is None for c in self.coeficientes)
+
+    def agregar_variable(self, clave, coeficiente, continua=False):
+        """Agrega una variable binaria (o continua no negativa) y devuelve su índice"""
+        self.claves.append(clave)
+        self.objetivo.append(coeficiente)
+        if continua:
+            self.continuas.add(len(self.claves) - 1)
+        return len(self.claves) - 1
+
+    def agregar_variables(self, claves, coeficientes):
+        """Agrega un bloque de variables binarias y devuelve sus índices como arreglo"""
+        inicio = len(self.claves)
+        self.claves.extend(claves)
+        self.objetivo.extend(np.asarray(coeficientes, dtype=float).tolist())
+        return np.arange(inicio, len(self.claves))
+
+    def agregar_fila(self, columnas, cota=1, coeficientes=None, igualdad=False):
+        """Agrega la restricción suma(a[j] * x[j] for j in columnas) <= cota (o == cota), omitiendo filas vacías"""
+        if columnas:
+            self.filas.append(list(columnas))
+            self.coeficientes.append(None if coeficientes is None else list(coeficientes))
+            self.igualdades.append(igualdad)
+            self.cotas.append(cota)
+
+    def agregar_acumulado(self, clave, inicios_por_slot, num_slots):
+        """Variables z[t] = cantidad de turnos que empiezan hasta el slot t, definidas por igualdades"""
+        # Solo se crea una variable en los slots con inicios; el resto reutiliza la anterior.
+        # Devuelve, para cada slot, el índice de la variable vigente (None si aún no hubo inicios)
+        acumulado = [None] * num_slots
+        actual = None
+        for t in range(num_slots):
+            columnas = inicios_por_slot.get(t)
+            if columnas:
+                z = self.agregar_variable((clave, t), 0.0, continua=True)
+                anterior = [] if actual is None else [actual]
+                # z[t] - z[t-1] - suma(inicios en t) == 0
+                self.agregar_fila([z] + anterior + columnas, cota=0,
+                                  coeficientes=[1] + [-1] * (len(anterior) + len(columnas)), igualdad=True)
+                actual = z
+            acumulado[t] = actual
+        return acumulado
+
+    def agregar_ocupacion(self, acumulados, num_slots, cota=1):
+        """Filas suma_g(z_g[t] - z_g[t-k_g]) <= cota: turnos activos en cada slot con 2 no ceros por grupo"""
+        # acumulados es una lista de (acumulado, k) con k la cantidad de slots de cada turno del grupo.
+        # Se omiten las filas idénticas a la del slot anterior (ningún turno empieza ni termina)
+        anterior = None
+        for t in range(num_slots):
+            terminos = {}
+            for acumulado, k in acumulados:
+                hasta = acumulado[t]
+                desde = acumulado[t - k] if t >= k else None
+                if hasta is not None and hasta != desde:
+                    terminos[hasta] = terminos.get(hasta, 0) + 1
+                    if desde is not None:
+                        terminos[desde] = terminos.get(desde, 0) - 1
+
+            fila = tuple(sorted((j, a) for j, a in terminos.items() if a != 0))
+            if fila and fila != anterior:
+                self.agregar_fila([j for j, _ in fila], cota=cota, coeficientes=[a for _, a in fila])
+            anterior = fila
+
+    def claves_activas(self, valores):
+        """Claves de las variables binarias que valen 1 en una solución, en orden de creación"""
+        # Una sola pasada sobre el vector de la solución; el umbral 0.5 tolera residuos del resolutor
+        activas = np.flatnonzero(np.asarray(valores, dtype=float) > 0.5)
+        return [self.claves[j] for j in activas.tolist() if j not in self.continuas]
+
+    def matriz_csr(self):
+        """Devuelve la matriz de restricciones como arreglos CSR (datos, índices, punteros)"""
+        largos = np.fromiter((len(columnas) for columnas in self.filas), dtype=np.int64, count=self.num_filas)
+        punteros = np.zeros(self.num_filas + 1, dtype=np.int64)
+        np.cumsum(largos, out=punteros[1:])
+        indices = np.fromiter(chain.from_iterable(self.filas), dtype=np.int64, count=punteros[-1])
+        datos = np.fromiter(chain.from_iterable([1] * len(columnas) if coeficientes is None else coeficientes
+                                                for columnas, coeficientes in zip(self.filas, self.coeficientes)),
+                            dtype=float, count=punteros[-1])
+        return datos, indices, punteros
+
+    def cotas_inferiores(self):
+        """Lado izquierdo de cada restricción: la cota en las igualdades y -inf en las desigualdades"""
+        return np.where(self.igualdades, np.asarray(self.cotas, dtype=float), -np.inf)
+
+    def es_factible(self, valores, tolerancia=1e-6):
+        """Indica si un vector de valores cumple las cotas de las variables y todas las restricciones"""
+        valores = np.asarray(valores, dtype=float)
+        if len(valores) != self.num_variables or (valores < -tolerancia).any():
+            return False
+        binarias = np.ones(self.num_variables, dtype=bool)
+        binarias[list(self.continuas)] = False
+        if (valores[binarias] > 1 + tolerancia).any():
+            return False
+        if not self.num_filas:
+            return True
+        # Las filas nunca están vacías, así que cada tramo de la matriz CSR suma una fila
+        datos, indices, punteros = self.matriz_csr()
+        actividad = np.add.reduceat(datos * valores[indices], punteros[:-1])
+        cotas = np.asarray(self.cotas, dtype=float)
+        return bool((actividad <= cotas + tolerancia).all() and (actividad >= self.cotas_inferiores() - tolerancia).all())
+
+    def solucion_voraz(self):
+        """Solución factible por inserción voraz: primero las variables de mayor peso, en orden de creación"""
+        # Solo aplica a modelos de empaquetamiento (coeficientes 1 y cota >= 0): agregar una variable
+        # solo exige que ninguna de sus filas esté llena
+        filas_por_variable = [[] for _ in range(self.num_variables)]
+        for i, columnas in enumerate(self.filas):
+            for j in columnas:
+                filas_por_variable[j].append(i)
+
+        holgura = list(self.cotas)
+        valores = np.zeros(self.num_variables)
+        for j in np.argsort(-np.asarray(self.objetivo, dtype=float), kind="stable"):
+            if self.objetivo[j] < 0:
+                break
+            if all(holgura[i] >= 1 for i in filas_por_variable[j]):
+                valores[j] = 1
+                for i in filas_por_variable[j]:
+                    holgura[i] -= 1
+
+        return valores
+
+    def cota_superior(self):
+        """Cota superior combinatoria del óptimo, válida sin resolver ninguna relajación"""
+        # Cada variable binaria se asigna a la primera fila de empaquetamiento que la contiene; como a lo
+        # sumo cota_i variables de la fila i valen 1, su aporte no supera cota_i veces el mayor peso asignado.
+        # Las demás filas se relajan, lo que mantiene la validez de la cota
+        peso_maximo = [0.0] * self.num_filas
+        asignada = np.zeros(self.num_variables, dtype=bool)
+        asignada[list(self.continuas)] = True
+        for i, columnas in enumerate(self.filas):
+            if self.coeficientes[i] is not None or self.igualdades[i]:
+                continue
+            for j in columnas:
+                if not asignada[j]:
+                    asignada[j] = True
+                    peso_maximo[i] = max(peso_maximo[i], self.objetivo[j])
+
+        libres = sum(max(self.objetivo[j], 0.0) for j in np.flatnonzero(~asignada))
+        return float(sum(cota * peso for cota, peso in zip(self.cotas, peso_maximo)) + libres)
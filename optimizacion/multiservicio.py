@@ -0,0 +1,370 @@
+import numpy as np
+import pandas as pd
+
+from optimizacion.estimacion import MOTOR_HEURISTICO, cota_por_capacidad, elegir_motor
+from optimizacion.horarios import como_grilla, formatear_minutos, formulacion_recomendada
+from optimizacion.modelo_lineal import ModeloLineal
+from optimizacion.pacientes import pesos_pacientes, tabla_pacientes
+from optimizacion.rendimiento import medir, tamano_modelo
+from optimizacion.resolutores import calcular_gap, resolver, resumen_solucion
+
+# Modelo compartido por las páginas 4 y 5: cada paciente puede requerir varios servicios.
+# Formulaciones disponibles para evitar superposiciones:
+# - "cobertura": filas "ocupado en el slot t" por servicio y por paciente, lineales en servicios por paciente
+# - "agregada": las mismas filas sobre inicios acumulados, con pocos no ceros por fila; el tamaño
+#   crece linealmente con la cantidad de slots
+# - "pares": una fila por cada par de turnos solapados (formulación original)
+FORMULACIONES = ("cobertura", "agregada", "pares")
+
+COLUMNAS_PACIENTES = ["id", "nombre", "servicios_requeridos", "prioridad", "distancia"]
+
+# Límites del modelo antes de recurrir a la heurística, más estrictos que estimacion.LIMITES_MODELO (que
+# usa el modelo 3): con muchos servicios por paciente y pasos finos CBC puede no encontrar ninguna
+# programación dentro del tiempo límite (15 servicios y 50 pacientes con paso de 5 minutos suman unas
+# 74.000 variables), aunque el modelo entre en memoria
+LIMITES_MULTISERVICIO = {"columnas": 60_000, "no_ceros": 500_000, "memoria_mb": 512}
+
+
+def construir_modelo(servicios, pacientes_con_servicios, horarios_disponibles, formulacion="cobertura"):
+    """Construye el ModeloLineal del problema sin resolverlo"""
+    if formulacion not in FORMULACIONES:
+        raise ValueError(f"Formulación desconocida: {formulacion}")
+
+    # Crear el problema de optimización
+    modelo = ModeloLineal("Optimizacion_Turnos_Medicos")
+
+    # Solo se consideran los slots en los que el turno completo entra en el horario del servicio
+    grilla = como_grilla(horarios_disponibles)
+    inicios = [grilla.indices_de_inicio(servicio["hora_inicio"], servicio["hora_fin"], servicio["tiempo_atencion"]).tolist()
+               for servicio in servicios]
+
+    # Función objetivo: maximizar la suma de prioridades atendidas y minimizar las distancias.
+    # Los pesos se calculan una vez por paciente sobre la tabla
+    pacientes = tabla_pacientes(pacientes_con_servicios, COLUMNAS_PACIENTES)
+    pesos = pesos_pacientes(pacientes).tolist()
+    ids = pacientes["id"].tolist()
+
+    # Requerimientos en formato largo: posiciones de los pacientes que piden cada servicio, en su orden
+    requeridos = pacientes["servicios_requeridos"].explode().dropna()
+    filas_por_servicio = {nombre: filas.tolist() for nombre, filas in
+                          requeridos.index.to_series().groupby(requeridos.to_numpy(), sort=False)}
+
+    # Crear variables de decisión: x[s, p, serv, t] = 1 si el servicio s atiende al paciente p desde el slot t
+    turnos_por_requerimiento = {}
+    turnos_por_inicio = {}
+    for s in range(len(servicios)):
+        serv_req = servicios[s]["nombre"]
+        for fila in filas_por_servicio.get(serv_req, []):
+            p, peso = ids[fila], pesos[fila]
+            for t in inicios[s]:
+                j = modelo.agregar_variable((s, p, serv_req, t), peso)
+                turnos_por_requerimiento.setdefault((p, serv_req), []).append(j)
+                turnos_por_inicio.setdefault((s, t), []).append((p, j))
+
+    # Restricciones
+
+    # 1. Un paciente solo puede ser atendido una vez por cada servicio requerido
+    for turnos in turnos_por_requerimiento.values():
+        modelo.agregar_fila(turnos)
+
+    # 2. Un servicio atiende a un solo paciente a la vez y un paciente no puede estar en dos lugares al mismo tiempo
+    if formulacion == "cobertura":
+        _agregar_cobertura(modelo, turnos_por_inicio, servicios, grilla)
+    elif formulacion == "agregada":
+        _agregar_agregada(modelo, turnos_por_inicio, servicios, grilla)
+    else:
+        _agregar_pares(modelo, turnos_por_inicio, servicios, grilla)
+
+    return modelo
+
+def _agregar_cobertura(modelo, turnos_por_inicio, servicios, grilla):
+    """A lo sumo un turno activo por servicio y por paciente en cada slot"""
+    for t in range(grilla.num_slots):
+        turnos_por_paciente = {}
+
+        # Servicio s ocupado en el slot t
+        for s in range(len(servicios)):
+            slots_necesarios = grilla.slots_necesarios(servicios[s]["tiempo_atencion"])
+            terminos = []
+            for h in range(max(0, t - slots_necesarios + 1), t + 1):
+                for p, j in turnos_por_inicio.get((s, h), []):
+                    terminos.append(j)
+                    turnos_por_paciente.setdefault(p, {}).setdefault(s, []).append(j)
+            modelo.agregar_fila(terminos)
+
+        # Paciente p ocupado en el slot t, con cualquiera de sus servicios
+        for turnos_por_servicio in turnos_por_paciente.values():
+            # Con un único servicio activo la restricción 1 ya impide superposiciones
+            if len(turnos_por_servicio) < 2:
+                continue
+            modelo.agregar_fila([j
+                                 for turnos in turnos_por_servicio.values()
+                                 for j in turnos])
+
+def _agregar_agregada(modelo, turnos_por_inicio, servicios, grilla):
+    """A lo sumo un turno activo por servicio y por paciente en cada slot, contando inicios acumulados"""
+    # Inicios de cada paciente agrupados por duración del turno en slots
+    inicios_por_paciente = {}
+    servicios_por_paciente = {}
+    for s in range(len(servicios)):
+        slots_necesarios = grilla.slots_necesarios(servicios[s]["tiempo_atencion"])
+        inicios_por_slot = {}
+        for t in range(grilla.num_slots):
+            for p, j in turnos_por_inicio.get((s, t), []):
+                inicios_por_slot.setdefault(t, []).append(j)
+                inicios_por_paciente.setdefault(p, {}).setdefault(slots_necesarios, {}).setdefault(t, []).append(j)
+                servicios_por_paciente.setdefault(p, set()).add(servicios[s]["nombre"])
+
+        # Servicio s ocupado en el slot t
+        acumulado = modelo.agregar_acumulado(("servicio", s), inicios_por_slot, grilla.num_slots)
+        modelo.agregar_ocupacion([(acumulado, slots_necesarios)], grilla.num_slots)
+
+    # Paciente p ocupado en el slot t, con cualquiera de sus servicios
+    for p, inicios_por_duracion in inicios_por_paciente.items():
+        # Con un único servicio requerido la restricción 1 ya impide superposiciones
+        if len(servicios_por_paciente[p]) < 2:
+            continue
+        acumulados = [(modelo.agregar_acumulado(("paciente", p, k), inicios, grilla.num_slots), k)
+                      for k, inicios in inicios_por_duracion.items()]
+        modelo.agregar_ocupacion(acumulados, grilla.num_slots)
+
+def _agregar_pares(modelo, turnos_por_inicio, servicios, grilla):
+    """Formulación original por pares de turnos, conservada para comparar resultados"""
+    # Un servicio solo puede atender a un paciente en un horario específico
+    for turnos in turnos_por_inicio.values():
+        modelo.agregar_fila([j for p, j in turnos])
+
+    # Considerar tiempo de atención (evitar superposiciones)
+    for s in range(len(servicios)):
+        tiempo_atencion = servicios[s]["tiempo_atencion"]  # en minutos
+        slots_necesarios = grilla.slots_necesarios(tiempo_atencion)
+
+        for h in range(grilla.num_slots):
+            # Para cada horario asignado, bloquear los siguientes 'slots_necesarios-1' slots
+            for overlap in range(1, slots_necesarios):
+                if h + overlap < grilla.num_slots:
+                    h_overlap = h + overlap
+                    # Si se asigna un turno en h, no puede haber otro en h_overlap para el mismo servicio
+                    for p1, j in turnos_por_inicio.get((s, h), []):
+                        for p2, j_overlap in turnos_por_inicio.get((s, h_overlap), []):
+                            modelo.agregar_fila([j, j_overlap])
+
+    # Evitar superposiciones de turnos para un mismo paciente (no puede estar en dos lugares al mismo tiempo)
+    for s1 in range(len(servicios)):
+        slots_necesarios1 = grilla.slots_necesarios(servicios[s1]["tiempo_atencion"])
+
+        for h in range(grilla.num_slots):
+            for p, j in turnos_por_inicio.get((s1, h), []):
+                # Comprobar todos los slots que se solaparían
+                for offset in range(slots_necesarios1):
+                    if h + offset < grilla.num_slots:
+                        h_check = h + offset
+
+                        # Para todos los demás servicios del mismo paciente
+                        for s2 in range(len(servicios)):
+                            if s1 != s2:
+                                for p2, j_check in turnos_por_inicio.get((s2, h_check), []):
+                                    if p2 == p:
+                                        modelo.agregar_fila([j, j_check])
+
+def _requerimientos(servicios, pacientes_con_servicios, grilla):
+    """Inicios de cada servicio, tabla de pacientes y servicios requeridos en formato largo, como en construir_modelo"""
+    inicios = [grilla.indices_de_inicio(servicio["hora_inicio"], servicio["hora_fin"], servicio["tiempo_atencion"])
+               for servicio in servicios]
+    pacientes = tabla_pacientes(pacientes_con_servicios, COLUMNAS_PACIENTES)
+    requeridos = pacientes["servicios_requeridos"].explode().dropna()
+    return inicios, pacientes, requeridos
+
+def _solapes(grilla, inicios1, inicios2, desde, hasta):
+    """Pares (h, h + o) con h en inicios1, h + o en inicios2 y desde <= o < hasta"""
+    a = np.zeros(grilla.num_slots, dtype=bool)
+    b = np.zeros(grilla.num_slots, dtype=bool)
+    a[inicios1] = True
+    b[inicios2] = True
+    return sum(int((a[:grilla.num_slots - o] & b[o:]).sum()) for o in range(desde, min(hasta, grilla.num_slots)))
+
+def estimar_tamano(servicios, pacientes_con_servicios, horarios_disponibles, formulacion="cobertura"):
+    """Filas, columnas y no ceros del modelo, calculados sin construirlo (en la agregada, una cota superior)"""
+    if formulacion not in FORMULACIONES:
+        raise ValueError(f"Formulación desconocida: {formulacion}")
+    grilla = como_grilla(horarios_disponibles)
+    inicios, pacientes, requeridos = _requerimientos(servicios, pacientes_con_servicios, grilla)
+    slots = [grilla.slots_necesarios(servicio["tiempo_atencion"]) for servicio in servicios]
+    activos = [grilla.turnos_activos(inicios[s], servicios[s]["tiempo_atencion"]) for s in range(len(servicios))]
+
+    # Variables: un turno por servicio, paciente que lo pide e inicio posible
+    demanda = requeridos.value_counts()
+    n = [int(demanda.get(servicio["nombre"], 0)) for servicio in servicios]
+    con_turnos = [s for s in range(len(servicios)) if n[s] and len(inicios[s])]
+    columnas = sum(n[s] * len(inicios[s]) for s in con_turnos)
+
+    # 1. Una fila por paciente y servicio requerido con turnos posibles
+    nombres_con_turnos = {servicios[s]["nombre"] for s in con_turnos}
+    requerimientos = pd.DataFrame({"p": pacientes["id"].to_numpy()[requeridos.index.to_numpy()], "nombre": requeridos.to_numpy()})
+    filas = len(requerimientos[requerimientos["nombre"].isin(nombres_con_turnos)].drop_duplicates())
+    no_ceros = columnas
+
+    # 2. Filas de cada servicio
+    for s in con_turnos:
+        if formulacion == "cobertura":
+            filas += int((activos[s] > 0).sum())
+            no_ceros += n[s] * int(activos[s].sum())
+        elif formulacion == "agregada":
+            # Acumulado de inicios (una variable y una igualdad por slot con inicios) y filas de ocupación
+            columnas += len(inicios[s])
+            filas += len(inicios[s]) + int((activos[s] > 0).sum())
+            no_ceros += (n[s] + 2) * len(inicios[s]) - 1 + 2 * int((activos[s] > 0).sum())
+        else:
+            filas += len(inicios[s]) + n[s] ** 2 * _solapes(grilla, inicios[s], inicios[s], 1, slots[s])
+            no_ceros += n[s] * len(inicios[s]) + 2 * n[s] ** 2 * _solapes(grilla, inicios[s], inicios[s], 1, slots[s])
+
+    # 3. Filas de cada paciente, iguales para los pacientes que piden el mismo conjunto de servicios
+    conjuntos = requeridos.groupby(level=0).agg(frozenset).value_counts()
+    for nombres, cantidad in conjuntos.items():
+        propios = [s for s in con_turnos if servicios[s]["nombre"] in nombres]
+        if formulacion == "cobertura":
+            if len(propios) < 2:
+                continue
+            matriz = np.array([activos[s] for s in propios])
+            # Con un único servicio activo en el slot la restricción 1 ya impide superposiciones
+            varios = (matriz > 0).sum(axis=0) >= 2
+            filas += cantidad * int(varios.sum())
+            no_ceros += cantidad * int(matriz[:, varios].sum())
+        elif formulacion == "agregada":
+            if len({servicios[s]["nombre"] for s in propios}) < 2:
+                continue
+            grupos_activos = np.zeros(grilla.num_slots, dtype=np.int64)
+            for k in {slots[s] for s in propios}:
+                grupo = [s for s in propios if slots[s] == k]
+                union = np.unique(np.concatenate([inicios[s] for s in grupo]))
+                columnas += cantidad * len(union)
+                filas += cantidad * len(union)
+                no_ceros += cantidad * (2 * len(union) - 1 + sum(len(inicios[s]) for s in grupo))
+                grupos_activos += grilla.turnos_activos(union, servicios[grupo[0]]["tiempo_atencion"]) > 0
+            filas += cantidad * int((grupos_activos > 0).sum())
+            no_ceros += cantidad * 2 * int(grupos_activos.sum())
+        else:
+            pares = sum(_solapes(grilla, inicios[s1], inicios[s2], 0, slots[s1]) for s1 in propios for s2 in propios if s1 != s2)
+            filas += cantidad * pares
+            no_ceros += cantidad * 2 * pares
+
+    return {"filas": int(filas), "columnas": int(columnas), "no_ceros": int(no_ceros)}
+
+def optimizar_por_heuristica(servicios, pacientes_con_servicios, horarios_disponibles):
+    """Programación voraz sin modelo lineal: por peso, cada paciente toma el primer turno libre de cada servicio"""
+    # Un turno es posible si el servicio y el paciente están libres durante todo el turno. La cota superior
+    # llena los turnos disjuntos de cada servicio con los pacientes de mayor peso que lo piden, sin
+    # considerar los choques del paciente
+    grilla = como_grilla(horarios_disponibles)
+    inicios, pacientes, requeridos = _requerimientos(servicios, pacientes_con_servicios, grilla)
+    slots = [grilla.slots_necesarios(servicio["tiempo_atencion"]) for servicio in servicios]
+    pesos = pesos_pacientes(pacientes)
+    ids = pacientes["id"].tolist()
+    servicios_por_nombre = {}
+    for s, servicio in enumerate(servicios):
+        servicios_por_nombre.setdefault(servicio["nombre"], []).append(s)
+
+    # Los turnos que empiezan cerca del último slot pueden terminar fuera de la grilla
+    largo = grilla.num_slots + max(slots, default=0)
+    ocupado_servicio = np.zeros((len(servicios), largo), dtype=bool)
+    nombres_por_fila = requeridos.groupby(level=0).agg(lambda nombres: list(dict.fromkeys(nombres))).to_dict()
+
+    asignaciones = []
+    objetivo = 0.0
+    for fila in np.argsort(-pesos, kind="stable").tolist():
+        if pesos[fila] < 0:
+            break
+        ocupado_paciente = np.zeros(largo, dtype=bool)
+        for nombre in nombres_por_fila.get(fila, []):
+            mejor = None
+            for s in servicios_por_nombre.get(nombre, []):
+                if not len(inicios[s]):
+                    continue
+                acumulado = np.concatenate(([0], np.cumsum(ocupado_servicio[s] | ocupado_paciente)))
+                libres = inicios[s][acumulado[inicios[s] + slots[s]] == acumulado[inicios[s]]]
+                if len(libres) and (mejor is None or libres[0] < mejor[1]):
+                    mejor = (s, int(libres[0]))
+            if mejor is None:
+                continue
+            s, t = mejor
+            ocupado_servicio[s, t:t + slots[s]] = True
+            ocupado_paciente[t:t + slots[s]] = True
+            asignaciones.append((s, ids[fila], nombre, t))
+            objetivo += float(pesos[fila])
+
+    capacidad = {}
+    for s, servicio in enumerate(servicios):
+        capacidad[servicio["nombre"]] = capacidad.get(servicio["nombre"], 0) + len(grilla.turnos_disjuntos(inicios[s], servicio["tiempo_atencion"]))
+    filas_por_nombre = requeridos.index.to_series().groupby(requeridos.to_numpy()).agg(lambda filas: sorted(set(filas)))
+    cota = sum(cota_por_capacidad(pesos[filas], capacidad.get(nombre, 0)) for nombre, filas in filas_por_nombre.items())
+
+    # Turnos ordenados por servicio y, dentro de cada uno, por horario
+    resultado = _armar_resultado(servicios, pacientes_con_servicios, sorted(asignaciones, key=lambda a: (a[0], a[3])), grilla)
+    cota = max(cota, objetivo)
+    resultado.attrs["solucion"] = {"estado": "heuristica", "objetivo": objetivo, "cota": cota, "gap": calcular_gap(objetivo, cota)}
+    return resultado
+
+def _armar_resultado(servicios, pacientes_con_servicios, asignaciones, grilla):
+    """Convierte una lista de (s, p, servicio, t) en el DataFrame de turnos asignados, columna por columna"""
+    if not asignaciones:
+        return pd.DataFrame()
+    s, p, _, t = (np.array(columna) for columna in zip(*asignaciones))
+    pacientes = tabla_pacientes(pacientes_con_servicios, COLUMNAS_PACIENTES)
+    fila = pd.Index(pacientes["id"]).get_indexer(p)
+    minuto_inicio = grilla.minutos[t]
+    tiempos = np.array([servicio["tiempo_atencion"] for servicio in servicios], dtype=np.int64)
+    nombres = np.array([servicio["nombre"] for servicio in servicios], dtype=object)
+    lugares = np.array([servicio["lugar"] for servicio in servicios], dtype=object)
+    return pd.DataFrame({
+        "ID_Servicio": s,
+        "Servicio": nombres[s],
+        "ID_Paciente": p,
+        "Nombre_Paciente": pacientes["nombre"].to_numpy()[fila],
+        "Prioridad": pacientes["prioridad"].to_numpy()[fila],
+        "Distancia": pacientes["distancia"].to_numpy()[fila],
+        "Lugar_Atencion": lugares[s],
+        "Hora_Inicio": formatear_minutos(minuto_inicio),
+        # Calcular hora de fin según tiempo de atención
+        "Hora_Fin": formatear_minutos(minuto_inicio + tiempos[s]),
+    })
+
+def optimizar_turnos(servicios, pacientes_con_servicios, horarios_disponibles, formulacion=None, resolutor="cbc",
+                     limites=LIMITES_MULTISERVICIO, **opciones_resolutor):
+    """Optimiza la asignación de turnos utilizando Programación Lineal Entera"""
+    grilla = como_grilla(horarios_disponibles)
+    formulacion = formulacion or formulacion_recomendada(grilla)
+    tiempos = {}
+
+    # El tamaño se estima antes de construir: si supera los límites se usa la formulación agregada o la
+    # heurística, y el motivo queda en attrs["estimacion"]. Con limites=None se construye la formulación pedida
+    with medir(tiempos, "estimacion"):
+        estimacion = elegir_motor(lambda f: estimar_tamano(servicios, pacientes_con_servicios, grilla, f), formulacion, limites)
+    if estimacion["motor"] == MOTOR_HEURISTICO:
+        with medir(tiempos, "heuristica"):
+            resultado = optimizar_por_heuristica(servicios, pacientes_con_servicios, grilla)
+        resultado.attrs["tiempos"] = tiempos
+        resultado.attrs["estimacion"] = estimacion
+        return resultado
+    formulacion = estimacion["motor"]
+
+    with medir(tiempos, "construccion"):
+        modelo = construir_modelo(servicios, pacientes_con_servicios, grilla, formulacion)
+
+    # Resolver el problema
+    with medir(tiempos, "resolucion"):
+        solucion = resolver(modelo, resolutor, **opciones_resolutor)
+
+    # Verificar si se encontró una solución; al alcanzar el límite de tiempo se usa el mejor incumbente
+    if solucion["estado"] not in ("optimo", "factible"):
+        return None
+
+    # Extraer la solución
+    with medir(tiempos, "extraccion"):
+        resultado = _armar_resultado(servicios, pacientes_con_servicios, modelo.claves_activas(solucion["valores"]), grilla)
+    resultado.attrs["solucion"] = resumen_solucion(solucion)
+    resultado.attrs["tiempos"] = tiempos
+    # Subfases de la resolución (traducción, resolutor, lectura) y tamaño del modelo resuelto
+    resultado.attrs["tiempos_resolucion"] = solucion["tiempos"]
+    resultado.attrs["tamano"] = tamano_modelo(modelo)
+    resultado.attrs["estimacion"] = estimacion
+    return resultado
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+# Pacientes de los modelos de programación lineal como tabla columnar. Los modelos aceptan una lista
+# de diccionarios o un DataFrame (por ejemplo, la salida de st.data_editor con las columnas renombradas)
+# y calculan el peso de cada paciente en la función objetivo una sola vez, como vector.
+
+# Convertir prioridades a valores numéricos
+VALORES_PRIORIDAD = {"Alta": 10, "Media": 5, "Baja": 1}
+
+
+def tabla_pacientes(pacientes, columnas):
+    """Pacientes como DataFrame con las columnas indicadas, a partir de una lista de diccionarios o de una tabla"""
+    if isinstance(pacientes, pd.DataFrame):
+        return pacientes[columnas].reset_index(drop=True)
+    return pd.DataFrame(list(pacientes), columns=columnas)
+
+def pesos_pacientes(tabla):
+    """Valor de atender a cada paciente en la función objetivo: prioridad - 0.01 * distancia"""
+    prioridad = tabla["prioridad"].map(VALORES_PRIORIDAD).to_numpy(dtype=float)
+    distancia = pd.to_numeric(tabla["distancia"], errors="coerce").to_numpy(dtype=float)
+    if np.isnan(prioridad).any():
+        raise ValueError("Todos los pacientes deben tener prioridad Alta, Media o Baja")
+    if np.isnan(distancia).any():
+        raise ValueError("Todos los pacientes deben tener una distancia numérica")
+    return prioridad - 0.01 * distancia
+
+def filas_por_valor(valores, categorias):
+    """Posiciones de las filas con cada valor de categorias, en su orden, a partir de códigos categóricos"""
+    # Devuelve {categoría: arreglo de posiciones}; los valores que no están en categorias se ignoran
+    categorias = pd.unique(pd.Series(list(categorias), dtype=object))
+    codigos = pd.Categorical(valores, categories=categorias).codes
+    orden = np.argsort(codigos, kind="stable")
+    cortes = np.searchsorted(codigos[orden], np.arange(len(categorias) + 1))
+    return {categoria: orden[cortes[i]:cortes[i + 1]] for i, categoria in enumerate(categorias)}
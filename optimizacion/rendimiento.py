@@ -0,0 +1,42 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Registro local de rendimiento: una línea JSON por optimización, para analizarlas después.
+# El directorio es relativo al directorio desde el que se lanza la aplicación
+DIRECTORIO_LOGS = os.environ.get("SMARTSHIFTS_DIRECTORIO_LOGS", "logs")
+ARCHIVO_RENDIMIENTO = "rendimiento.jsonl"
+
+# Las sesiones de Streamlit corren en hilos distintos y escriben en el mismo archivo
+_bloqueo = threading.Lock()
+
+
+def tamano_modelo(modelo):
+    """Devuelve filas, columnas y coeficientes no nulos de un ModeloLineal"""
+    return {
+        "filas": modelo.num_filas,
+        "columnas": modelo.num_variables,
+        "no_ceros": modelo.num_no_ceros,
+    }
+
+@contextmanager
+def medir(tiempos, fase):
+    """Acumula en tiempos[fase] los segundos que tarda el bloque"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        tiempos[fase] = tiempos.get(fase, 0.0) + time.perf_counter() - inicio
+
+def registrar(registro, directorio=None):
+    """Agrega el registro como una línea JSON al log de rendimiento; devuelve la ruta del archivo"""
+    directorio = directorio or DIRECTORIO_LOGS
+    ruta = os.path.join(directorio, ARCHIVO_RENDIMIENTO)
+    linea = json.dumps(registro, ensure_ascii=False, default=str) + "\n"
+    with _bloqueo:
+        os.makedirs(directorio, exist_ok=True)
+        with open(ruta, "a", encoding="utf-8") as archivo:
+            archivo.write(linea)
+    return ruta
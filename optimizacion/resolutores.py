@@ -0,0 +1,272 @@
+import multiprocessing
+import os
+import re
+import tempfile
+
+import numpy as np
+
+from optimizacion.modelo_lineal import ModeloLineal
+from optimizacion.rendimiento import medir
+
+# Cada resolutor recibe un ModeloLineal y devuelve un diccionario con:
+# - "estado": "optimo", "factible" (incumbente sin optimalidad probada), "infactible" o "sin_solucion"
+# - "valores": arreglo con el valor de cada variable (None si no hay solución)
+# - "objetivo": valor de la función objetivo (None si no hay solución)
+# - "cota": cota superior del óptimo conocida al terminar (None si no hay solución)
+# - "gap": brecha relativa entre objetivo y cota (0 si la solución es óptima)
+# El parámetro inicial es una solución factible opcional para arrancar en caliente.
+# limite_tiempo (segundos), gap_relativo e hilos son opcionales; None deja el valor del resolutor.
+# resolver() agrega "tiempos": segundos de cada subfase (importación del resolutor, traducción a su formato,
+# ejecución, lectura de los valores y, si corresponden, arranque voraz y cota).
+
+# Segundos que se esperan a HiGHS más allá del tiempo límite: cubren el arranque del proceso que lo
+# ejecuta y el envío del resultado
+MARGEN_LIMITE_HIGHS = 2
+
+# Cota que CBC escribe en su registro al detenerse ("Upper bound" al maximizar)
+_PATRON_COTA_CBC = re.compile(r"^(?:Upper|Lower) bound:\s*(\S+)", re.MULTILINE)
+
+
+def calcular_gap(objetivo, cota):
+    """Brecha relativa |cota - objetivo| / |objetivo|, con la misma convención que HiGHS"""
+    if objetivo is None or cota is None:
+        return None
+    return abs(cota - objetivo) / max(abs(objetivo), 1e-10)
+
+def _sin_solucion(estado):
+    return {"estado": estado, "valores": None, "objetivo": None, "cota": None, "gap": None}
+
+def _leer_cota_cbc(ruta_registro):
+    """Extrae la cota final del registro de CBC, o None si no la informó"""
+    try:
+        with open(ruta_registro, encoding="utf-8", errors="replace") as f:
+            coincidencias = _PATRON_COTA_CBC.findall(f.read())
+    except OSError:
+        return None
+    try:
+        return float(coincidencias[-1]) if coincidencias else None
+    except ValueError:
+        return None
+
+def resolver_cbc(modelo, inicial=None, limite_tiempo=None, gap_relativo=None, hilos=None):
+    """Resuelve el modelo con PuLP y CBC (subproceso y archivo LP)"""
+    # Como scipy en resolver_highs, PuLP se importa al resolver: las páginas que solo construyen
+    # la interfaz no pagan su carga
+    tiempos = {}
+    with medir(tiempos, "importacion"):
+        import pulp
+
+    with medir(tiempos, "traduccion"):
+        problema = pulp.LpProblem(modelo.nombre, pulp.LpMaximize)
+        x = [pulp.LpVariable(f"x_{j}", lowBound=0, cat='Continuous') if j in modelo.continuas else pulp.LpVariable(f"x_{j}", cat='Binary')
+             for j in range(modelo.num_variables)]
+
+        if inicial is not None:
+            for variable, valor in zip(x, inicial):
+                variable.setInitialValue(valor)
+
+        problema += pulp.LpAffineExpression(zip(x, modelo.objetivo))
+        for columnas, coeficientes, igualdad, cota in zip(modelo.filas, modelo.coeficientes, modelo.igualdades, modelo.cotas):
+            expresion = pulp.LpAffineExpression([(x[j], 1) for j in columnas] if coeficientes is None else zip((x[j] for j in columnas), coeficientes))
+            problema += (expresion == cota) if igualdad else (expresion <= cota)
+
+    # PuLP no expone la cota de CBC, por lo que se lee del registro del resolutor
+    descriptor, ruta_registro = tempfile.mkstemp(suffix=".log", prefix="cbc_")
+    os.close(descriptor)
+    try:
+        solver = pulp.PULP_CBC_CMD(msg=False, warmStart=inicial is not None, timeLimit=limite_tiempo,
+                                   gapRel=gap_relativo, threads=hilos, logPath=ruta_registro)
+        # Incluye la escritura del archivo LP y la lectura de la solución de CBC por parte de PuLP
+        with medir(tiempos, "resolutor"):
+            problema.solve(solver)
+        cota = _leer_cota_cbc(ruta_registro)
+    finally:
+        os.remove(ruta_registro)
+
+    # sol_status distingue el óptimo probado de un incumbente obtenido antes del límite de tiempo
+    if problema.sol_status == pulp.LpSolutionOptimal:
+        estado = "optimo"
+    elif problema.sol_status == pulp.LpSolutionIntegerFeasible:
+        estado = "factible"
+    else:
+        estado = "infactible" if problema.status == pulp.LpStatusInfeasible else "sin_solucion"
+        return {**_sin_solucion(estado), "tiempos": tiempos}
+
+    with medir(tiempos, "lectura"):
+        valores = np.rint([variable.varValue or 0.0 for variable in x])
+        objetivo = float(np.asarray(modelo.objetivo, dtype=float) @ valores)
+    # Si CBC cerró la búsqueda sin informar cota (óptimo exacto), la cota es el propio objetivo
+    cota = objetivo if cota is None else max(cota, objetivo)
+    return {"estado": estado, "valores": valores, "objetivo": objetivo,
+            "cota": cota, "gap": calcular_gap(objetivo, cota), "tiempos": tiempos}
+
+def _milp_en_proceso(conexion, argumentos):
+    """Ejecuta scipy.optimize.milp y envía status, x y la cota dual (o la excepción) por la conexión"""
+    from scipy.optimize import milp
+    try:
+        resultado = milp(**argumentos)
+        conexion.send((resultado.status, resultado.x, getattr(resultado, "mip_dual_bound", None)))
+    except Exception as e:
+        conexion.send(e)
+    finally:
+        conexion.close()
+
+def _milp_con_plazo(argumentos, plazo):
+    """Ejecuta milp en un proceso aparte y lo termina si no responde en plazo segundos (None en ese caso)"""
+    # spawn, como el pool de trabajos, evita copiar con fork los hilos del proceso que resuelve
+    contexto = multiprocessing.get_context("spawn")
+    receptor, emisor = contexto.Pipe(duplex=False)
+    proceso = contexto.Process(target=_milp_en_proceso, args=(emisor, argumentos), daemon=True)
+    proceso.start()
+    emisor.close()
+    try:
+        respuesta = receptor.recv() if receptor.poll(plazo) else None
+    except EOFError:
+        # El proceso terminó sin responder (por ejemplo, sin memoria)
+        respuesta = None
+    finally:
+        receptor.close()
+        proceso.terminate()
+        proceso.join()
+    if isinstance(respuesta, Exception):
+        raise respuesta
+    return respuesta
+
+def resolver_highs(modelo, inicial=None, limite_tiempo=None, gap_relativo=None, hilos=None):
+    """Resuelve el modelo con scipy.optimize.milp (HiGHS) sobre la matriz CSR"""
+    # scipy.optimize.milp no admite una solución inicial ni fijar la cantidad de hilos,
+    # por lo que inicial e hilos se ignoran.
+    # HiGHS solo controla su time_limit entre etapas: el centro analítico que calcula en la raíz no se
+    # interrumpe ni se puede desactivar desde scipy, y puede demorar varias veces el límite. Con límite
+    # de tiempo, milp corre en un proceso aparte que se termina al vencer el límite más
+    # MARGEN_LIMITE_HIGHS; se pierde entonces el incumbente y resolver() recurre a la solución voraz
+    tiempos = {}
+    try:
+        with medir(tiempos, "importacion"):
+            from scipy.optimize import Bounds, LinearConstraint, milp
+            from scipy.sparse import csr_array
+    except ImportError as e:
+        raise ImportError("El resolutor HiGHS requiere scipy >= 1.9 (pip install scipy)") from e
+
+    with medir(tiempos, "traduccion"):
+        objetivo = np.asarray(modelo.objetivo, dtype=float)
+        restricciones = []
+        if modelo.num_filas:
+            matriz = csr_array(modelo.matriz_csr(), shape=(modelo.num_filas, modelo.num_variables))
+            restricciones.append(LinearConstraint(matriz, modelo.cotas_inferiores(), np.asarray(modelo.cotas, dtype=float)))
+
+        # Las variables continuas auxiliares no tienen cota superior ni requieren integralidad
+        enteras = np.ones(modelo.num_variables)
+        cotas_superiores = np.ones(modelo.num_variables)
+        continuas = list(modelo.continuas)
+        enteras[continuas] = 0
+        cotas_superiores[continuas] = np.inf
+
+    opciones = {}
+    if limite_tiempo is not None:
+        opciones["time_limit"] = limite_tiempo
+    if gap_relativo is not None:
+        opciones["mip_rel_gap"] = gap_relativo
+
+    # milp minimiza, por eso se cambia el signo del objetivo
+    argumentos = {"c": -objetivo, "integrality": enteras, "bounds": Bounds(0, cotas_superiores),
+                  "constraints": restricciones, "options": opciones}
+    with medir(tiempos, "resolutor"):
+        if limite_tiempo is None:
+            resultado = milp(**argumentos)
+            respuesta = (resultado.status, resultado.x, getattr(resultado, "mip_dual_bound", None))
+        else:
+            respuesta = _milp_con_plazo(argumentos, limite_tiempo + MARGEN_LIMITE_HIGHS)
+    if respuesta is None:
+        return {**_sin_solucion("sin_solucion"), "tiempos": tiempos}
+    status, x, cota_dual = respuesta
+
+    # status 1 indica límite de tiempo o de nodos; puede traer un incumbente en x
+    if status == 0:
+        estado = "optimo"
+    elif status == 1 and x is not None:
+        estado = "factible"
+    else:
+        return {**_sin_solucion("infactible" if status == 2 else "sin_solucion"), "tiempos": tiempos}
+
+    # Redondear para eliminar residuos de tolerancia en las variables binarias
+    with medir(tiempos, "lectura"):
+        valores = np.rint(x)
+        valor_objetivo = float(objetivo @ valores)
+    cota = valor_objetivo if cota_dual is None or not np.isfinite(cota_dual) else max(-cota_dual, valor_objetivo)
+    return {"estado": estado, "valores": valores, "objetivo": valor_objetivo,
+            "cota": cota, "gap": calcular_gap(valor_objetivo, cota), "tiempos": tiempos}
+
+RESOLUTORES = {
+    "cbc": resolver_cbc,
+    "highs": resolver_highs,
+}
+
+# Etiquetas para mostrar en la interfaz
+NOMBRES_RESOLUTORES = {
+    "cbc": "CBC (PuLP)",
+    "highs": "HiGHS (SciPy)",
+}
+
+# Resolutores que aprovechan una solución inicial
+ADMITEN_ARRANQUE_EN_CALIENTE = {"cbc"}
+
+
+def resolver(modelo, resolutor="cbc", arranque_voraz=True, limite_tiempo=None, gap_relativo=None, hilos=None):
+    """Resuelve un ModeloLineal con el resolutor indicado por nombre"""
+    if resolutor not in RESOLUTORES:
+        raise ValueError(f"Resolutor desconocido: {resolutor}")
+
+    # Un modelo sin variables tiene como única solución no asignar ningún turno
+    if modelo.num_variables == 0:
+        return {"estado": "optimo", "valores": np.zeros(0), "objetivo": 0.0, "cota": 0.0, "gap": 0.0, "tiempos": {}}
+
+    # Una solución voraz da a CBC un incumbente desde el inicio para podar por cota; con cualquier
+    # resolutor es además el piso del resultado si se detiene sin una solución mejor
+    tiempos = {}
+    inicial = None
+    if arranque_voraz and modelo.es_empaquetamiento:
+        with medir(tiempos, "arranque_voraz"):
+            inicial = modelo.solucion_voraz()
+
+    solucion = RESOLUTORES[resolutor](modelo, inicial=inicial if resolutor in ADMITEN_ARRANQUE_EN_CALIENTE else None,
+                                      limite_tiempo=limite_tiempo, gap_relativo=gap_relativo, hilos=hilos)
+    solucion["tiempos"] = {**tiempos, **solucion.get("tiempos", {})}
+
+    # El resultado nunca es peor que la solución voraz: CBC puede descartarla tras los cortes de la raíz
+    # y detenerse en el tiempo límite con un incumbente peor (o sin ninguno), HiGHS puede agotar el plazo
+    # sin responder y los valores leídos y redondeados pueden violar alguna restricción. En esos casos
+    # se devuelve la solución voraz
+    if inicial is not None:
+        objetivo_inicial = float(np.asarray(modelo.objetivo, dtype=float) @ inicial)
+        if (solucion["objetivo"] is None or objetivo_inicial > solucion["objetivo"] + 1e-9
+                or not modelo.es_factible(solucion["valores"])):
+            cota = solucion["cota"] if solucion["cota"] is not None else objetivo_inicial
+            solucion.update(estado="factible", valores=inicial, objetivo=objetivo_inicial, cota=max(cota, objetivo_inicial))
+
+    # Si el resolutor se detuvo antes de acotar (por ejemplo, sin terminar la relajación de la raíz)
+    # informa el propio incumbente como cota; se recurre entonces a la cota combinatoria del modelo
+    if solucion["estado"] == "factible":
+        with medir(solucion["tiempos"], "cota"):
+            cota = modelo.cota_superior()
+        if solucion["cota"] > solucion["objetivo"] + 1e-6:
+            cota = min(cota, solucion["cota"])
+        solucion["cota"], solucion["gap"] = cota, calcular_gap(solucion["objetivo"], cota)
+
+    return solucion
+
+def precalentar():
+    """Resuelve un modelo mínimo con cada resolutor para cargar sus módulos y binarios en el proceso"""
+    # El primer trabajo de un proceso no paga la importación de PuLP y SciPy ni la primera
+    # ejecución de CBC. Un resolutor que no está instalado se omite: fallará al usarlo, con su mensaje
+    modelo = ModeloLineal("Precalentamiento")
+    modelo.agregar_fila([modelo.agregar_variable("x", 1.0)])
+    for resolutor in RESOLUTORES:
+        try:
+            resolver(modelo, resolutor=resolutor)
+        except Exception:
+            pass
+
+def resumen_solucion(solucion):
+    """Datos de calidad de una solución para adjuntar al resultado (DataFrame.attrs)"""
+    return {clave: solucion[clave] for clave in ("estado", "objetivo", "cota", "gap")}
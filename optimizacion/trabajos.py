@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Cantidad máxima de optimizaciones simultáneas en todo el servidor; el pool es único por proceso,
+# por lo que todas las sesiones de Streamlit lo comparten y no se lanzan más procesos CBC que estos
+MAX_TRABAJOS = int(os.environ.get("SMARTSHIFTS_MAX_TRABAJOS", max(1, (os.cpu_count() or 2) // 2)))
+
+# Segundos que se conserva un trabajo terminado que ninguna sesión reclamó
+RETENCION_TRABAJOS = 3600
+
+_bloqueo = threading.Lock()
+_pool = None
+_trabajos = {}  # id -> {"futuro": Future, "enviado": instante de envío}
+_precalentado = False
+
+
+def _iniciar_proceso():
+    """Precalienta los modelos y resolutores en cada proceso nuevo del pool, antes de su primer trabajo"""
+    # Los modelos se importan aquí (y con ellos pandas) para que el primer trabajo no pague su carga
+    from optimizacion import modelo1, modelo3, multiservicio  # noqa: F401
+    from optimizacion.resolutores import precalentar
+    precalentar()
+
+def _obtener_pool():
+    """Crea el pool de procesos la primera vez que se necesita"""
+    global _pool
+    if _pool is None:
+        # spawn evita copiar con fork los hilos del servidor de Streamlit y funciona igual en Windows
+        _pool = ProcessPoolExecutor(max_workers=MAX_TRABAJOS, mp_context=multiprocessing.get_context("spawn"),
+                                    initializer=_iniciar_proceso)
+    return _pool
+
+def precalentar():
+    """Arranca en segundo plano los procesos del pool para que el primer trabajo no espere su inicio"""
+    # Se puede llamar en cada rerun: solo la primera llamada del proceso del servidor tiene efecto.
+    # Con spawn el pool crea un proceso por envío mientras no haya uno libre, por eso se envía
+    # una tarea vacía por proceso
+    global _precalentado
+    with _bloqueo:
+        if _precalentado:
+            return
+        _precalentado = True
+        pool = _obtener_pool()
+        for _ in range(MAX_TRABAJOS):
+            pool.submit(int)
+
+def _purgar():
+    """Descarta los trabajos terminados hace más de RETENCION_TRABAJOS segundos"""
+    limite = time.time() - RETENCION_TRABAJOS
+    for id_trabajo in [i for i, t in _trabajos.items() if t["futuro"].done() and t["enviado"] < limite]:
+        del _trabajos[id_trabajo]
+
+def enviar(funcion, *args, **kwargs):
+    """Encola funcion(*args, **kwargs) en el pool compartido y devuelve el id del trabajo"""
+    global _pool
+    with _bloqueo:
+        _purgar()
+        try:
+            futuro = _obtener_pool().submit(funcion, *args, **kwargs)
+        except BrokenProcessPool:
+            # Un proceso del pool terminó abruptamente (por ejemplo, sin memoria); se crea uno nuevo
+            _pool = None
+            futuro = _obtener_pool().submit(funcion, *args, **kwargs)
+
+        id_trabajo = uuid.uuid4().hex
+        _trabajos[id_trabajo] = {"futuro": futuro, "enviado": time.time()}
+        return id_trabajo
+
+def estado(id_trabajo):
+    """Devuelve "en_cola", "en_ejecucion", "terminado", "error", "cancelado" o "desconocido\""""
+    trabajo = _trabajos.get(id_trabajo)
+    if trabajo is None:
+        return "desconocido"
+
+    futuro = trabajo["futuro"]
+    if futuro.cancelled():
+        return "cancelado"
+    if futuro.done():
+        return "error" if futuro.exception() is not None else "terminado"
+    return "en_ejecucion" if futuro.running() else "en_cola"
+
+def posicion_en_cola(id_trabajo):
+    """Cantidad de trabajos en cola enviados antes que el indicado"""
+    with _bloqueo:
+        enviado = _trabajos[id_trabajo]["enviado"]
+        return sum(1 for t in _trabajos.values()
+                   if t["enviado"] < enviado and not t["futuro"].running() and not t["futuro"].done())
+
+def resultado(id_trabajo):
+    """Devuelve el resultado de un trabajo terminado y lo quita del registro (relanza sus excepciones)"""
+    with _bloqueo:
+        trabajo = _trabajos.pop(id_trabajo)
+    return trabajo["futuro"].result()
+
+def cancelar(id_trabajo):
+    """Cancela un trabajo en cola; uno en ejecución termina por su cuenta y su resultado se descarta"""
+    with _bloqueo:
+        trabajo = _trabajos.pop(id_trabajo, None)
+    if trabajo is not None:
+        trabajo["futuro"].cancel()
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from optimizacion.archivos import pacientes_multiservicio
+
+SERVICIOS = ["Cardiología", "Pediatría", "Traumatología"]
+
+
+def _tabla(**columnas):
+    """Dos pacientes válidos; cada argumento reemplaza una columna"""
+    datos = {
+        "nombre": ["Ana", "Luis"],
+        "servicios_requeridos": ["Cardiología; Pediatría", "Traumatología"],
+        "prioridad": ["Alta", " Baja "],
+        "distancia": [10, 3.0],
+    }
+    return pd.DataFrame({**datos, **columnas})
+
+
+@pytest.mark.parametrize("servicios_requeridos", [
+    ["Cardiología; Pediatría", "Traumatología"],        # CSV y Excel: texto separado por ";"
+    [["Cardiología", " Pediatría"], ["Traumatología"]],  # Parquet: listas
+])
+def test_pacientes_validos(servicios_requeridos):
+    pacientes, errores, avisos = pacientes_multiservicio(_tabla(servicios_requeridos=servicios_requeridos), SERVICIOS)
+
+    assert errores == [] and avisos == []
+    assert list(pacientes.columns) == ["id", "nombre", "servicios_requeridos", "prioridad", "distancia"]
+    assert pacientes["id"].tolist() == [0, 1]
+    assert pacientes["servicios_requeridos"].tolist() == [["Cardiología", "Pediatría"], ["Traumatología"]]
+    assert pacientes["prioridad"].tolist() == ["Alta", "Baja"]
+    # Las distancias enteras guardadas como reales vuelven a ser enteras
+    assert pacientes["distancia"].tolist() == [10, 3]
+    assert pacientes["distancia"].dtype.kind == "i"
+
+def test_servicios_que_no_se_ofrecen():
+    tabla = _tabla(servicios_requeridos=["Cardiología; Dermatología", "Nutrición"])
+    pacientes, errores, avisos = pacientes_multiservicio(tabla, SERVICIOS)
+
+    assert avisos == ["Se ignoran servicios que no se ofrecen: Dermatología, Nutrición"]
+    # Luis se queda sin servicios disponibles y se descarta
+    assert errores == ["1 filas sin servicios requeridos disponibles (filas 2)"]
+    assert pacientes["servicios_requeridos"].tolist() == [["Cardiología"]]
+
+@pytest.mark.parametrize("columna, valores, mensaje, validas", [
+    ("nombre", [" ", None], "2 filas sin nombre (filas 1, 2)", []),
+    ("prioridad", ["Alta", "Urgente"], "1 filas con prioridad distinta de Alta, Media o Baja (filas 2)", [0]),
+    ("distancia", ["-1", "lejos"], "2 filas con distancia vacía, negativa o no numérica (filas 1, 2)", []),
+    ("servicios_requeridos", [None, " ; "], "2 filas sin servicios requeridos disponibles (filas 1, 2)", []),
+    # Una columna vacía en todas las filas llega de Arrow con tipo null
+    ("servicios_requeridos", [None, None], "2 filas sin servicios requeridos disponibles (filas 1, 2)", []),
+])
+def test_filas_invalidas(columna, valores, mensaje, validas):
+    pacientes, errores, avisos = pacientes_multiservicio(_tabla(**{columna: valores}), SERVICIOS)
+
+    assert errores == [mensaje]
+    assert pacientes["id"].tolist() == validas
+
+def test_mensajes_abreviados():
+    tabla = pd.DataFrame({"nombre": [""] * 12, "servicios_requeridos": ["Pediatría"] * 12,
+                          "prioridad": ["Media"] * 12, "distancia": [1] * 12})
+    _, errores, _ = pacientes_multiservicio(tabla, SERVICIOS)
+
+    assert errores == ["12 filas sin nombre (filas 1, 2, 3, 4, 5, 6, 7, 8, 9, 10 y 2 más)"]
+
+def test_columnas_faltantes():
+    with pytest.raises(ValueError, match="Faltan columnas en pacientes: servicios_requeridos, distancia"):
+        pacientes_multiservicio(_tabla().drop(columns=["servicios_requeridos", "distancia"]))
+
+def test_servicios_requeridos_de_otro_tipo():
+    with pytest.raises(ValueError, match="servicios_requeridos debe ser una lista o texto"):
+        pacientes_multiservicio(_tabla(servicios_requeridos=[1, 2]))
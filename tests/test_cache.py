@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from optimizacion import modelo1, multiservicio
+from optimizacion.cache import CacheSoluciones, clave_optimizacion
+from optimizacion.catalogos import servicios_predefinidos
+from optimizacion.horarios import generar_horarios, horarios_de_servicios
+from optimizacion.instancias import generar_pacientes
+
+
+def _resultado_modelo1():
+    pacientes = generar_pacientes(20, servicios_predefinidos, 0)
+    return modelo1.optimizar_turnos(servicios_predefinidos, pacientes, generar_horarios(8, 16, 15), ruta_rapida=False)
+
+def _resultado_heuristico():
+    # attrs con la estimación de tamaños y el motivo del cambio de motor
+    pacientes = generar_pacientes(20, servicios_predefinidos, 0, servicios_por_paciente=(1, 3))
+    return multiservicio.optimizar_turnos(servicios_predefinidos, pacientes, horarios_de_servicios(servicios_predefinidos, 15),
+                                          limites={"columnas": 10, "no_ceros": 10, "memoria_mb": 1})
+
+RESULTADOS = {"modelo1": _resultado_modelo1, "heuristico": _resultado_heuristico}
+
+
+@pytest.mark.parametrize("resultado", list(RESULTADOS))
+def test_parquet_conserva_attrs(tmp_path, resultado):
+    resultado = RESULTADOS[resultado]()
+    CacheSoluciones(tmp_path).guardar("clave", resultado)
+
+    # Una instancia nueva no tiene la entrada en memoria y la lee del Parquet
+    cache = CacheSoluciones(tmp_path)
+    leido = cache.obtener("clave")
+
+    assert cache.estadisticas()["aciertos_disco"] == 1
+    assert leido.equals(resultado)
+    assert leido.attrs == resultado.attrs
+
+def test_resultado_vacio(tmp_path):
+    # optimizar_turnos devuelve un DataFrame sin columnas cuando no asigna ningún turno
+    vacio = pd.DataFrame()
+    vacio.attrs["solucion"] = {"estado": "optimo", "objetivo": 0.0, "cota": 0.0, "gap": 0.0}
+    cache = CacheSoluciones(tmp_path)
+    cache.guardar("vacio", vacio)
+
+    for leido in (cache.obtener("vacio"), CacheSoluciones(tmp_path).obtener("vacio")):
+        assert leido is not None
+        assert leido.empty
+        assert leido.attrs == vacio.attrs
+
+def test_clave_ausente(tmp_path):
+    cache = CacheSoluciones(tmp_path / "inexistente")
+
+    assert cache.obtener("clave") is None
+    assert cache.estadisticas()["fallos"] == 1
+
+def test_clave_independiente_del_orden():
+    pacientes = generar_pacientes(10, servicios_predefinidos, 0)
+    horarios = generar_horarios(8, 16, 15)
+    clave = clave_optimizacion(modelo1.optimizar_turnos, servicios_predefinidos, pacientes, horarios,
+                               resolutor="cbc", limite_tiempo=60)
+
+    # Claves de los diccionarios, columnas de la tabla y argumentos por nombre en otro orden
+    servicios = [dict(reversed(list(servicio.items()))) for servicio in servicios_predefinidos]
+    columnas = pacientes[list(reversed(pacientes.columns))]
+    assert clave == clave_optimizacion(modelo1.optimizar_turnos, servicios, columnas, horarios,
+                                       limite_tiempo=60, resolutor="cbc")
+    # Una distancia editada como 10.0 es la misma entrada que 10
+    assert clave == clave_optimizacion(modelo1.optimizar_turnos, servicios_predefinidos,
+                                       pacientes.astype({"distancia": float}), horarios,
+                                       resolutor="cbc", limite_tiempo=60)
+
+    # El orden de los pacientes sí cambia la clave: sus índices aparecen en el resultado
+    assert clave != clave_optimizacion(modelo1.optimizar_turnos, servicios_predefinidos, pacientes[::-1], horarios,
+                                       resolutor="cbc", limite_tiempo=60)
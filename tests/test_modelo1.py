@@ -0,0 +1,26 @@
+import pytest
+
+from optimizacion import modelo1
+from optimizacion.catalogos import servicios_predefinidos
+from optimizacion.horarios import PASOS_GRILLA, como_grilla, formulacion_recomendada, generar_horarios
+from optimizacion.instancias import generar_pacientes
+from optimizacion.resolutores import resolver
+
+# La ruta rápida por ordenamiento es exacta: en instancias simples alcanza el mismo objetivo que el MIP
+
+
+@pytest.mark.parametrize("paso", PASOS_GRILLA)
+@pytest.mark.parametrize("semilla", [0, 1, 2])
+def test_ruta_rapida_alcanza_el_optimo_del_mip(semilla, paso):
+    horarios = generar_horarios(8, 16, paso)
+    # Con 60 pacientes la demanda supera la capacidad de varios servicios y el orden por peso decide
+    pacientes = generar_pacientes(60, servicios_predefinidos, semilla)
+    assert modelo1.es_instancia_simple(servicios_predefinidos, pacientes)
+
+    rapido = modelo1.optimizar_por_orden(servicios_predefinidos, pacientes, horarios)
+    modelo = modelo1.construir_modelo(servicios_predefinidos, pacientes, horarios,
+                                      formulacion_recomendada(como_grilla(horarios)))
+    solucion = resolver(modelo, "cbc")
+
+    assert solucion["estado"] == "optimo"
+    assert rapido.attrs["solucion"]["objetivo"] == pytest.approx(solucion["objetivo"], abs=1e-6)
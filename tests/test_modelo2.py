@@ -0,0 +1,90 @@
+import copy
+import random
+
+import pytest
+
+from optimizacion.modelo2 import asignar_turnos, crear_consultorios
+
+# El motor por huecos libres (bisección sobre HuecosLibres) reproduce, asignación por asignación,
+# la búsqueda original minuto a minuto de views/modelo2.py
+
+
+def _generar_instancia(num_especialistas, num_pacientes, num_especialidades, semilla):
+    """Especialistas con jornadas parciales (y algunas reservas previas) y pacientes aleatorios"""
+    rng = random.Random(semilla)
+    especialidades = [f"Especialidad {i+1}" for i in range(num_especialidades)]
+    especialistas = []
+    for _ in range(num_especialistas):
+        inicio = rng.randrange(0, 240, 15)
+        fin = rng.randrange(inicio + 60, 481, 15)
+        reserva = rng.randrange(inicio, fin - 15, 5)
+        especialistas.append({
+            'especialidad': rng.choice(especialidades),
+            'disponibilidad': [(inicio, fin)],
+            'ocupado': [(reserva, reserva + 15)] if rng.random() < 0.3 else [],
+            'duracion': rng.choice([15, 20, 30, 45, 60]),
+        })
+    pacientes = [{
+        'prioridad': rng.randint(1, 3),
+        'distancia': rng.randint(0, 100),
+        'especialidad': rng.choice(especialidades),
+        'datos': f"Paciente {i+1}",
+    } for i in range(num_pacientes)]
+    return especialistas, pacientes
+
+def _superpuesto(inicio, fin, intervalos):
+    return any(not (fin <= s or inicio >= e) for s, e in intervalos)
+
+def _asignar_por_minuto(especialistas, pacientes, num_consultorios):
+    """Copia de referencia del bucle original de views/modelo2.py (sin modificar la entrada)"""
+    ocupado = [list(e['ocupado']) for e in especialistas]
+    consultorios = [[] for _ in range(num_consultorios)]
+    asignaciones = []
+    no_asignados = []
+    for paciente in sorted(pacientes, key=lambda x: (-x['prioridad'], x['distancia'])):
+        mejor = None
+        for e, especialista in enumerate(especialistas):
+            if especialista['especialidad'] != paciente['especialidad']:
+                continue
+            duracion = especialista['duracion']
+            for disp_inicio, disp_fin in especialista['disponibilidad']:
+                for hora_actual in range(disp_inicio, disp_fin - duracion + 1):
+                    fin = hora_actual + duracion
+                    if _superpuesto(hora_actual, fin, ocupado[e]):
+                        continue
+                    for c, consultorio in enumerate(consultorios):
+                        if not _superpuesto(hora_actual, fin, consultorio):
+                            mejor = (e, hora_actual, c, duracion)
+                            break
+                    if mejor is not None:
+                        break
+                if mejor is not None:
+                    break
+            if mejor is not None:
+                break
+
+        if mejor is None:
+            no_asignados.append(paciente)
+            continue
+        e, inicio, c, duracion = mejor
+        ocupado[e].append((inicio, inicio + duracion))
+        consultorios[c].append((inicio, inicio + duracion))
+        asignaciones.append({'paciente': paciente, 'especialista': e, 'consultorio': c,
+                             'inicio': inicio, 'fin': inicio + duracion})
+    return asignaciones, no_asignados
+
+
+# Con pocos consultorios estos son el recurso escaso; con muchos, los especialistas
+@pytest.mark.parametrize("num_consultorios", [1, 3, 20])
+@pytest.mark.parametrize("semilla", [0, 1, 2])
+def test_huecos_libres_igual_al_bucle_original(semilla, num_consultorios):
+    especialistas, pacientes = _generar_instancia(30, 200, 5, semilla)
+    originales = copy.deepcopy(especialistas)
+
+    asignaciones, no_asignados = asignar_turnos(especialistas, pacientes, crear_consultorios(num_consultorios))
+    esperadas, esperados_no_asignados = _asignar_por_minuto(especialistas, pacientes, num_consultorios)
+
+    assert asignaciones == esperadas
+    assert no_asignados == esperados_no_asignados
+    assert no_asignados  # la instancia no entra completa
+    assert especialistas == originales
@@ -0,0 +1,86 @@
+import time
+
+import numpy as np
+import pytest
+
+from optimizacion import modelo3, multiservicio, resolutores
+from optimizacion.catalogos import servicios_predefinidos
+from optimizacion.horarios import generar_horarios, horarios_de_servicios
+from optimizacion.instancias import especialistas_modelo3, generar_pacientes
+from optimizacion.modelo_lineal import ModeloLineal
+from optimizacion.resolutores import MARGEN_LIMITE_HIGHS, RESOLUTORES, resolver
+
+# Contrato de resolver() sobre instancias sintéticas reproducibles: la solución devuelta es factible,
+# nunca peor que la solución voraz del modelo y su brecha no es negativa
+
+
+def _modelo_multiservicio():
+    pacientes = generar_pacientes(15, servicios_predefinidos, 1, servicios_por_paciente=(1, 3))
+    return multiservicio.construir_modelo(servicios_predefinidos, pacientes, horarios_de_servicios(servicios_predefinidos, 15))
+
+def _modelo3():
+    horarios = generar_horarios(8, 16, 15)
+    pacientes = generar_pacientes(10, servicios_predefinidos, 1)
+    return modelo3.construir_modelo(especialistas_modelo3(servicios_predefinidos, horarios), pacientes, 2, horarios)
+
+MODELOS = {"multiservicio": _modelo_multiservicio, "modelo3": _modelo3}
+
+def _valor(modelo, valores):
+    return float(np.asarray(modelo.objetivo, dtype=float) @ valores)
+
+
+@pytest.mark.parametrize("resolutor", list(RESOLUTORES))
+@pytest.mark.parametrize("instancia", list(MODELOS))
+def test_no_peor_que_la_solucion_voraz(resolutor, instancia):
+    modelo = MODELOS[instancia]()
+    solucion = resolver(modelo, resolutor, limite_tiempo=60)
+
+    assert solucion["estado"] in ("optimo", "factible")
+    assert modelo.es_factible(solucion["valores"])
+    assert solucion["objetivo"] >= _valor(modelo, modelo.solucion_voraz()) - 1e-6
+    assert solucion["objetivo"] == pytest.approx(_valor(modelo, solucion["valores"]))
+    assert 0 <= solucion["gap"]
+    assert solucion["cota"] >= solucion["objetivo"] - 1e-6
+
+@pytest.mark.parametrize("resolutor", list(RESOLUTORES))
+def test_modelo_vacio(resolutor):
+    solucion = resolver(ModeloLineal(), resolutor)
+
+    assert solucion["estado"] == "optimo"
+    assert solucion["objetivo"] == 0
+    assert solucion["gap"] == 0
+
+@pytest.mark.parametrize("devuelto", ["ceros", "sin_solucion"])
+def test_recurre_a_la_solucion_voraz(monkeypatch, devuelto):
+    # CBC puede descartar el arranque en caliente y detenerse con objetivo 0 o sin incumbente
+    def resolutor_degradado(modelo, inicial=None, **opciones):
+        if devuelto == "sin_solucion":
+            return {"estado": "sin_solucion", "valores": None, "objetivo": None, "cota": None, "gap": None}
+        return {"estado": "factible", "valores": np.zeros(modelo.num_variables), "objetivo": 0.0,
+                "cota": 0.0, "gap": 0.0}
+
+    monkeypatch.setitem(resolutores.RESOLUTORES, "cbc", resolutor_degradado)
+    modelo = _modelo_multiservicio()
+    solucion = resolver(modelo, "cbc")
+
+    assert solucion["estado"] == "factible"
+    assert solucion["objetivo"] == pytest.approx(_valor(modelo, modelo.solucion_voraz()))
+    assert solucion["objetivo"] > 0
+    assert modelo.es_factible(solucion["valores"])
+    assert 0 <= solucion["gap"] < 1
+
+@pytest.mark.parametrize("resolutor", list(RESOLUTORES))
+def test_respeta_el_tiempo_limite(resolutor):
+    # Con 50 pacientes HiGHS calcula el centro analítico de la raíz durante varias veces el límite
+    horarios = generar_horarios(8, 16, 15)
+    modelo = modelo3.construir_modelo(especialistas_modelo3(servicios_predefinidos, horarios),
+                                      generar_pacientes(50, servicios_predefinidos, 0), 2, horarios)
+    limite = 3
+    inicio = time.perf_counter()
+    solucion = resolver(modelo, resolutor, limite_tiempo=limite)
+    transcurrido = time.perf_counter() - inicio
+
+    # Holgura para el arranque del proceso de HiGHS y la lectura de la solución de CBC
+    assert transcurrido < limite + MARGEN_LIMITE_HIGHS + 3
+    assert solucion["estado"] in ("optimo", "factible")
+    assert modelo.es_factible(solucion["valores"])
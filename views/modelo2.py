@@ -2,6 +2,10 @@ import streamlit as st
 import datetime
 import pandas as pd
 
+from optimizacion.modelo2 import NOMBRES_MOTORES, NUM_CONSULTORIOS, asignar_turnos
+from optimizacion.rendimiento import medir
+from interfaz.resultados import mostrar_rendimiento
+
 def time_to_minutes(t):
     return (t.hour - 8) * 60 + t.minute
 
@@ -10,17 +14,14 @@ def minutes_to_time(m):
     minutes = m % 60
     return f"{hours:02d}:{minutes:02d}"
 
-def is_overlapping(start, end, intervals):
-    for s, e in intervals:
-        if not (end <= s or start >= e):
-            return True
-    return False
-
 # Inicializar estado de sesión
 if 'specialists' not in st.session_state:
     st.session_state.specialists = []
 if 'patients' not in st.session_state:
     st.session_state.patients = []
+# Los especialistas se identifican por un número que no cambia al agregar otros
+if 'next_specialist_id' not in st.session_state:
+    st.session_state.next_specialist_id = len(st.session_state.specialists) + 1
 
 st.title("Optimización de Asignación de Turnos Médicos")
 
@@ -52,11 +53,13 @@ with st.form("add_specialist_form"):
             st.error("Error: Horario fuera de rango (8:00 - 16:00) o inicio mayor que fin")
         else:
             st.session_state.specialists.append({
+                'id': st.session_state.next_specialist_id,
                 'especialidad': specialty,
                 'disponibilidad': [(start_min, end_min)],
                 'ocupado': [],
                 'duracion': time_per_patient
             })
+            st.session_state.next_specialist_id += 1
             st.success("Especialista agregado!")
 
 # Agregar pacientes
@@ -90,84 +93,73 @@ with col2:
     st.write("**Pacientes:**")
     st.json(st.session_state.patients)
 
+# Configurar consultorios
+st.subheader("Consultorios")
+num_consultorios = st.number_input("Número de consultorios", min_value=1, max_value=20, value=NUM_CONSULTORIOS)
+consultorios = []
+with st.expander("Horario de atención de cada consultorio"):
+    for i in range(num_consultorios):
+        col1, col2 = st.columns(2)
+        with col1:
+            room_start = st.time_input(f"Consultorio {i+1}: inicio", value=datetime.time(8, 0), key=f"consultorio_inicio_{i}")
+        with col2:
+            room_end = st.time_input(f"Consultorio {i+1}: fin", value=datetime.time(16, 0), key=f"consultorio_fin_{i}")
+        consultorios.append({
+            'disponibilidad': [(time_to_minutes(room_start), time_to_minutes(room_end))],
+            'ocupado': []
+        })
+
 # Algoritmo de asignación
+motor = st.selectbox(
+    "Heurística de asignación", options=list(NOMBRES_MOTORES), format_func=NOMBRES_MOTORES.get,
+    help="El primer turno libre atiende a los pacientes estrictamente por prioridad y distancia. "
+         "La inserción por arrepentimiento, dentro de cada prioridad, atiende primero a las especialidades "
+         "que más pierden si se las posterga, y suele dejar menos pacientes sin turno."
+)
 if st.button("Generar Asignación Óptima"):
     if not st.session_state.specialists or not st.session_state.patients:
         st.error("Error: Faltan datos de especialistas o pacientes")
         st.stop()
+    for i, consultorio in enumerate(consultorios):
+        room_start_min, room_end_min = consultorio['disponibilidad'][0]
+        if room_start_min < 0 or room_end_min > 480 or room_start_min >= room_end_min:
+            st.error(f"Error: Horario del consultorio {i+1} fuera de rango (8:00 - 16:00) o inicio mayor que fin")
+            st.stop()
     
-    # Ordenar pacientes por prioridad y distancia
-    pacientes_ordenados = sorted(st.session_state.patients, 
-                                key=lambda x: (-x['prioridad'], x['distancia']))
-    
-    # Inicializar consultorios
-    consultorios = [{'ocupado': []}, {'ocupado': []}]
-    asignaciones = []
-    no_asignados = []
+    # Asignar turnos con la heurística elegida
+    tiempos = {}
+    with medir(tiempos, "asignacion"):
+        resultado, no_asignados = asignar_turnos(st.session_state.specialists, st.session_state.patients, consultorios, motor=motor)
+    asignaciones = [{
+        'Paciente': a['paciente']['datos'],
+        'Especialidad': a['paciente']['especialidad'],
+        'Especialista': f"Especialista {st.session_state.specialists[a['especialista']].get('id', a['especialista'] + 1)}",
+        'Consultorio': a['consultorio'] + 1,
+        'Inicio': minutes_to_time(a['inicio']),
+        'Fin': minutes_to_time(a['fin'])
+    } for a in resultado]
 
-    for paciente in pacientes_ordenados:
-        especialidad_pac = paciente['especialidad']
-        posibles_especialistas = [e for e in st.session_state.specialists 
-                                if e['especialidad'] == especialidad_pac]
-        
-        mejor_hora = None
-        mejor_especialista = None
-        mejor_consultorio = None
+    df = pd.DataFrame(asignaciones, columns=['Paciente', 'Especialidad', 'Especialista', 'Consultorio', 'Inicio', 'Fin'])
+    df.attrs["tiempos"] = tiempos
 
-        for especialista in posibles_especialistas:
-            duracion = especialista['duracion']
-            
-            for disp_inicio, disp_fin in especialista['disponibilidad']:
-                # Buscar en intervalos de 1 minuto
-                for hora_actual in range(disp_inicio, disp_fin - duracion + 1):
-                    fin = hora_actual + duracion
-                    
-                    # Verificar disponibilidad del especialista
-                    if is_overlapping(hora_actual, fin, especialista['ocupado']):
-                        continue
-                    
-                    # Verificar disponibilidad de consultorios
-                    for c_idx, consultorio in enumerate(consultorios):
-                        if not is_overlapping(hora_actual, fin, consultorio['ocupado']):
-                            if mejor_hora is None or hora_actual < mejor_hora:
-                                mejor_hora = hora_actual
-                                mejor_especialista = especialista
-                                mejor_consultorio = c_idx
-                            break
-                    
-                    if mejor_hora is not None:
-                        break
-                if mejor_hora is not None:
-                    break
-            if mejor_hora is not None:
-                break
+    # El resultado queda en el estado de sesión: los reruns posteriores lo muestran sin volver a asignar.
+    # Tiene la forma del registro de trabajo de las otras páginas para compartir el panel de rendimiento
+    st.session_state.resultado_modelo2 = {'clave': 'modelo2', 'resolutor': motor, 'resultado': df, 'no_asignados': no_asignados}
 
-        if mejor_hora is not None:
-            # Registrar asignación
-            especialista['ocupado'].append((mejor_hora, mejor_hora + duracion))
-            consultorios[mejor_consultorio]['ocupado'].append((mejor_hora, mejor_hora + duracion))
-            
-            asignaciones.append({
-                'Paciente': paciente['datos'],
-                'Especialidad': especialidad_pac,
-                'Especialista': f"Especialista {st.session_state.specialists.index(mejor_especialista) + 1}",
-                'Consultorio': mejor_consultorio + 1,
-                'Inicio': minutes_to_time(mejor_hora),
-                'Fin': minutes_to_time(mejor_hora + duracion)
-            })
-        else:
-            no_asignados.append(paciente)
-
-    # Mostrar resultados
+# Mostrar resultados
+if 'resultado_modelo2' in st.session_state:
+    trabajo = st.session_state.resultado_modelo2
     st.subheader("Resultados de la Asignación")
     
-    if asignaciones:
-        df = pd.DataFrame(asignaciones)
-        st.dataframe(df[['Paciente', 'Especialidad', 'Consultorio', 'Inicio', 'Fin']])
+    if not trabajo['resultado'].empty:
+        st.dataframe(trabajo['resultado'])
     else:
         st.warning("No se pudieron realizar asignaciones")
     
-    if no_asignados:
+    if trabajo['no_asignados']:
         st.subheader("Pacientes no asignados")
-        for p in no_asignados:
-            st.error(p['datos'])
\ No newline at end of file
+        for p in trabajo['no_asignados']:
+            st.error(p['datos'])
+    
+    # Tiempo de la heurística
+    mostrar_rendimiento(trabajo)
\ No newline at end of file